@@ -0,0 +1,209 @@
+"""
+Análisis de posiciones en lote: lee posiciones de un archivo o de la entrada
+estándar, evalúa cada una con una configuración de `AI_Player` en un grupo
+de procesos y escribe los resultados, en el mismo orden, como líneas JSON.
+Solo hay a la vez `window` posiciones en proceso, así que la memoria no
+depende del tamaño de la entrada.
+
+Cada línea de entrada es un objeto JSON con "size" y la posición como en el
+servicio de motor ("moves" o "cells"); "to_move" es opcional (por defecto
+se deduce de la cantidad de fichas) y "id" se copia al resultado. Con
+`--records` se analizan todas las posiciones sin ganador de un archivo de
+partidas (records.py).
+
+Por posición se escribe la jugada escogida, la heurística desde el jugador
+por mover, la distancia mínima (`shortest_path`) de cada jugador y, si
+quedan pocas casillas vacías, el resultado del solucionador de finales.
+
+La configuración por defecto (`DEFAULT_ENGINE`) busca a profundidad y
+cantidad de simulaciones fijas, así que los resultados no dependen de la
+máquina, de la carga ni de la cantidad de procesos. Con `time_limit` o
+`scheduler=cost` la jugada depende de cuánto se alcanza a buscar.
+
+Ejemplos:
+    python analyze.py posiciones.jsonl --workers 8
+    python analyze.py posiciones.jsonl --engine rapido:time_limit=0.5
+    cat posiciones.jsonl | python analyze.py - --output etiquetas.jsonl
+    python analyze.py --records partidas.hexr --solver-cells 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from numpy import random
+from board import HexBoard
+from player import AI_Player
+from solver import ProofNumberSolver, WIN, LOSS
+from records import GameReader
+from service import ServiceError, player_number, position_cells
+from benchmark import parse_engine
+
+SOLVED = {WIN: "win", LOSS: "loss"}  # Resultado del solucionador para el jugador por mover
+# Umbrales fijos por fase y sin límite de tiempo: resultados reproducibles
+DEFAULT_ENGINE = "default:scheduler=phase"
+
+
+def read_positions(source) -> iter:
+    """Líneas no vacías de un archivo de líneas JSON (se decodifican en los trabajadores)"""
+
+    for line in source:
+        if line.strip():
+            yield line
+
+
+def record_positions(path: str) -> iter:
+    """Cada posición sin ganador de las partidas de un archivo de partidas"""
+
+    with GameReader(path) as reader:
+        for game, record in enumerate(reader):
+            board = HexBoard(record.size)
+            for ply, (row, col, player_id) in enumerate(record.moves()):
+                if board.check_connection(1) or board.check_connection(2):
+                    break
+                yield {
+                    "id": [game, ply], "size": record.size,
+                    "cells": [value for board_row in board.board for value in board_row],
+                    "to_move": player_id,
+                }
+                board.push((row, col), player_id)
+
+
+def _score(value: float) -> float:
+    """Valor de la heurística apto para JSON (una conexión vale ±1000, como en Minimax)"""
+
+    return max(-1000, min(1000, value))
+
+
+def analyze_position(
+    index: int, position: dict | str, config: dict, solver_cells: int, solver_nodes: int,
+    seed: int
+    ) -> dict:
+    """
+    Analiza una posición (diccionario o línea JSON) con un `AI_Player` nuevo,
+    para que el resultado no dependa del orden ni del reparto entre procesos
+    """
+
+    result = {"index": index}
+    try:
+        if isinstance(position, str):
+            position = json.loads(position)
+        if not isinstance(position, dict):
+            raise ServiceError("Cada posición debe ser un objeto JSON")
+        if "id" in position:
+            result["id"] = position["id"]
+        size = position.get("size")
+        if type(size) is not int or size < 1:
+            raise ServiceError(f"Tamaño inválido: {size!r} (se espera \"size\" entero positivo)")
+        cells = position_cells(size, position)
+        board = HexBoard(size)
+        for node, player_id in enumerate(cells):
+            if player_id:
+                board.push(divmod(node, size), player_id)
+        stones = len(board.player_positions[1]), len(board.player_positions[2])
+        to_move = player_number(position.get("to_move", 1 if stones[0] == stones[1] else 2))
+
+        # Un solo proceso por posición: el paralelismo está entre posiciones
+        player = AI_Player(to_move, **dict(config, workers=1, ponder=False))
+        result.update(
+            size=size, to_move=to_move,
+            heuristic=_score(player.heuristic(board)),
+            distances={
+                str(player_id): AI_Player.shortest_path(board, player_id) for player_id in (1, 2)
+            },
+        )
+        winner = next((player_id for player_id in (1, 2) if board.check_connection(player_id)), 0)
+        if winner:
+            result.update(winner=winner, move=None, solved=None)
+            return result
+
+        solved = None
+        if board.empty_count() <= solver_cells:
+            outcome, _ = ProofNumberSolver(1).solve(board, to_move, max_nodes=solver_nodes)
+            solved = SOLVED.get(outcome)
+        random.seed(seed + index)
+        start = time.perf_counter()
+        move = player.play(board)
+        result.update(move=list(move), solved=solved, time=round(time.perf_counter() - start, 4))
+    except ServiceError as error:
+        result["error"] = str(error)
+    except (KeyError, ValueError, TypeError, AttributeError) as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def analyze(
+    positions, config: dict, workers: int = None, window: int = None,
+    solver_cells: int = 16, solver_nodes: int = 20_000, seed: int = 0
+    ) -> iter:
+    """
+    Resultados de `positions` en orden. Con `workers` > 1 se reparten entre
+    procesos con a lo sumo `window` posiciones enviadas y sin escribir
+    """
+
+    arguments = (config, solver_cells, solver_nodes, seed)
+    if workers is not None and workers <= 1:
+        for index, position in enumerate(positions):
+            yield analyze_position(index, position, *arguments)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = window or 4 * workers
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for index, position in enumerate(positions):
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(executor.submit(analyze_position, index, position, *arguments))
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis de posiciones de Hex en lote")
+    parser.add_argument("input", nargs="?", default="-", help="Archivo de líneas JSON ('-': entrada estándar)")
+    parser.add_argument("--records", help="Analizar las posiciones de un archivo de partidas (records.py)")
+    parser.add_argument(
+        "--engine", default=DEFAULT_ENGINE,
+        help="Configuración 'nombre:clave=valor,...' de AI_Player (por defecto, profundidad fija)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--window", type=int, default=None, help="Posiciones en proceso a la vez (por defecto 4 por trabajador)")
+    parser.add_argument("--solver-cells", type=int, default=16, help="Resolver las posiciones con a lo sumo estas casillas vacías")
+    parser.add_argument("--solver-nodes", type=int, default=20_000, help="Nodos máximos del solucionador por posición")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Archivo de resultados (por defecto, la salida estándar)")
+    args = parser.parse_args()
+
+    _, config = parse_engine(args.engine)
+    source = None
+    if args.records:
+        positions = record_positions(args.records)
+    elif args.input == "-":
+        positions = read_positions(sys.stdin)
+    else:
+        source = open(args.input, encoding="utf-8")
+        positions = read_positions(source)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        results = analyze(
+            positions, config, args.workers, args.window,
+            args.solver_cells, args.solver_nodes, args.seed
+        )
+        for result in results:
+            output.write(json.dumps(result, separators=(",", ":")) + "\n")
+            output.flush()
+    except BrokenPipeError:
+        pass  # La salida se cerró antes (por ejemplo, `| head`)
+    finally:
+        if source is not None:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import time
+import numpy as np
+from numpy import random
+from board import HexBoard, DIRECTIONS
+
+BATCH_SIZE = 8192  # Tableros simulados por lote
+
+
+def board_cells(board: HexBoard) -> np.ndarray:
+    """Casillas del tablero como arreglo plano de NumPy (fila a fila)"""
+
+    return np.array([value for row in board.board for value in row], dtype=np.uint8)
+
+
+def fill_boards(
+    boards: np.ndarray, to_move: int, rng: np.random.Generator,
+    reserved: np.ndarray = None
+    ) -> np.ndarray:
+    """
+    Llena al azar las casillas vacías de un lote de tableros (B x N*N) que 
+    comparten las mismas casillas vacías. Alternar turnos en un orden aleatorio
+    equivale a darle a `to_move` la mitad (redondeada hacia arriba) de las 
+    casillas escogidas al azar. `reserved` indica, por tablero, la posición 
+    (dentro de las vacías) de una casilla que queda para el otro jugador
+    """
+
+    empty = np.flatnonzero(boards[0] == 0)
+    if not len(empty):
+        return boards
+    keys = rng.random((boards.shape[0], len(empty)), dtype=np.float32)
+    free = len(empty)
+    if reserved is not None:
+        keys[np.arange(len(keys)), reserved] = 2.0  # Siempre la última en el orden
+        free -= 1
+    
+    order = keys.argsort(axis=1)
+    owners = np.empty(keys.shape, dtype=np.uint8)
+    mover_cells = (free + 1) // 2
+    np.put_along_axis(owners, order[:, :mover_cells], to_move, axis=1)
+    np.put_along_axis(owners, order[:, mover_cells:], 3 - to_move, axis=1)
+    boards[:, empty] = owners
+    return boards
+
+
+def winners(boards: np.ndarray, size: int) -> np.ndarray:
+    """
+    Ganador de cada tablero lleno del lote: se expande en paralelo la región 
+    del jugador 1 alcanzable desde su borde izquierdo. Los tableros que ya 
+    llegaron al borde derecho o dejaron de crecer salen del lote activo
+    """
+
+    stones = boards.reshape(-1, size, size) == 1
+    result = np.full(len(stones), 2, dtype=np.uint8)
+    active = np.arange(len(stones))
+    reach = np.zeros_like(stones)
+    reach[:, :, 0] = stones[:, :, 0]
+    while len(active):
+        grown = reach.copy()
+        for dx, dy in DIRECTIONS:
+            grown[
+                :, max(0, -dx):size - max(0, dx), max(0, -dy):size - max(0, dy)
+            ] |= reach[
+                :, max(0, dx):size + min(0, dx), max(0, dy):size + min(0, dy)
+            ]
+        grown &= stones
+        
+        won = grown[:, :, size - 1].any(axis=1)
+        result[active[won]] = 1
+        pending = ~won & (grown != reach).any(axis=(1, 2))
+        active, reach, stones = active[pending], grown[pending], stones[pending]
+    return result
+
+
+def batch_playouts(
+    cells: np.ndarray, size: int, to_move: int, count: int,
+    rng: np.random.Generator
+    ) -> np.ndarray:
+    """Juega `count` partidas aleatorias desde una posición y devuelve sus ganadores"""
+
+    boards = np.tile(cells, (count, 1))
+    return winners(fill_boards(boards, to_move, rng), size)
+
+
+def evaluate_moves(
+    board: HexBoard, player_id: int, playouts_per_move: int = 2000,
+    batch_size: int = BATCH_SIZE, deadline: float = None, rng: np.random.Generator = None,
+    moves: list[tuple[int, int]] = None, counts: dict = None
+    ) -> dict[tuple[int, int], float]:
+    """
+    Proporción de victorias de `player_id` al jugar cada casilla vacía (o 
+    cada una de `moves`), simulando las partidas de todas las jugadas en 
+    lotes de `batch_size` tableros. Si el siguiente lote no alcanza a 
+    terminar antes de `deadline` se devuelven las proporciones acumuladas. 
+    Si se da `counts`, se guarda en `counts["playouts"]` el total de 
+    partidas simuladas
+    """
+
+    if rng is None:
+        rng = np.random.default_rng(random.randint(2 ** 32))
+    size = board.size
+    cells = board_cells(board)
+    empty = np.flatnonzero(cells == 0)
+    if moves is None:
+        moves = empty
+    else:
+        moves = np.array([row * size + col for row, col in moves])
+    positions = np.searchsorted(empty, moves)  # Posición de cada jugada entre las vacías
+    per_batch = max(1, min(playouts_per_move, batch_size // len(moves)))
+
+    wins = np.zeros(len(moves))
+    played = 0
+    batch_time = 0.0  # Duración del último lote
+    while played < playouts_per_move:
+        start = time.perf_counter()
+        if deadline is not None and played and start + batch_time > deadline:
+            break
+        count = min(per_batch, playouts_per_move - played)
+        boards = np.tile(cells, (len(moves) * count, 1))
+        candidates = np.repeat(positions, count)
+        fill_boards(boards, 3 - player_id, rng, reserved=candidates)
+        results = winners(boards, size).reshape(len(moves), count)
+        wins += (results == player_id).sum(axis=1)
+        played += count
+        batch_time = time.perf_counter() - start
+
+    if counts is not None:
+        counts["playouts"] = played * len(moves)
+    return {
+        divmod(int(move), size): wins[index] / played
+        for index, move in enumerate(moves)
+    }
+
+
+def best_move(
+    board: HexBoard, player_id: int, playouts_per_move: int = 2000,
+    deadline: float = None, moves: list[tuple[int, int]] = None, counts: dict = None,
+    batch_size: int = None
+    ) -> tuple[int, int]:
+    """Jugada con mayor proporción de victorias según las simulaciones en lote"""
+
+    rates = evaluate_moves(
+        board, player_id, playouts_per_move, batch_size=batch_size or BATCH_SIZE,
+        deadline=deadline, moves=moves, counts=counts
+    )
+    return max(rates, key=rates.get)
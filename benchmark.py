@@ -0,0 +1,271 @@
+"""
+Benchmarks reproducibles del motor: primitivas del tablero, nodos por
+segundo de Minimax, simulaciones por segundo de Monte Carlo, latencia por
+jugada (percentiles) y memoria pico, sobre un corpus fijo de posiciones.
+
+Ejemplos:
+    python benchmark.py --sizes 5 7 9 11
+    python benchmark.py --engine base:time_limit=0.5 --engine td:time_limit=0.5,evaluator=two_distance
+    python benchmark.py --sizes 7 --engine a:time_limit=0.2 --engine b:mc_engine=batch,time_limit=0.2 --games 10
+"""
+import argparse
+import ast
+import json
+import random as py_random
+import statistics
+import time
+import timeit
+import tracemalloc
+from numpy import random
+from board import HexBoard
+from player import AI_Player, SearchTimeout
+from mcts import MCTS
+
+# Proporción de casillas ocupadas en cada fase de las posiciones del corpus
+PHASES = {"opening": 0.10, "middle": 0.35, "end": 0.60}
+
+
+def build_corpus(sizes: list[int], positions: int, seed: int) -> dict[tuple[int, str], list[HexBoard]]:
+    """
+    Genera para cada tamaño y fase `positions` tableros con jugadas al azar
+    (sin ganador todavía), siempre iguales para la misma semilla
+    """
+
+    rng = py_random.Random(seed)
+    corpus = {}
+    for size in sizes:
+        for phase, fill in PHASES.items():
+            boards = []
+            while len(boards) < positions:
+                board = HexBoard(size)
+                player_id = 1
+                for _ in range(int(fill * size * size)):
+                    board.push(board.random_move(rng.randrange), player_id)
+                    player_id = 3 - player_id
+                if not (board.check_connection(1) or board.check_connection(2)):
+                    boards.append(board)
+            corpus[(size, phase)] = boards
+    return corpus
+
+
+def to_move(board: HexBoard) -> int:
+    """Jugador al que le toca en una posición que empezó el jugador 1"""
+
+    return 1 if len(board.player_positions[1]) == len(board.player_positions[2]) else 2
+
+
+def time_per_call(function, min_time: float = 0.05) -> float:
+    """Microsegundos por llamada, repitiendo hasta acumular `min_time` segundos"""
+
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    return elapsed / number * 1e6
+
+
+def bench_primitives(board: HexBoard) -> dict[str, float]:
+    """Costo en microsegundos de las operaciones básicas del tablero"""
+
+    move = board.get_possible_moves()[0]
+
+    def push_pop():
+        board.push(move, 1)
+        board.pop()
+
+    return {
+        "check_connection_us": time_per_call(lambda: AI_Player.check_connection(board, 1)),
+        "shortest_path_us": time_per_call(lambda: AI_Player.shortest_path(board, 1)),
+        "get_possible_moves_us": time_per_call(board.get_possible_moves),
+        "clone_us": time_per_call(board.clone),
+        "push_pop_us": time_per_call(push_pop),
+    }
+
+
+def bench_minimax(board: HexBoard, config: dict, budget: float) -> float:
+    """Nodos por segundo de Minimax durante `budget` segundos"""
+
+    with AI_Player(to_move(board), **config) as player:
+        player.deadline = time.perf_counter() + budget
+        start = time.perf_counter()
+        try:
+            depth = 1
+            while depth <= board.empty_count():
+                player.minimax(board.clone(), depth)
+                depth += 1
+        except SearchTimeout:
+            pass
+        return player.nodes / (time.perf_counter() - start)
+
+
+def bench_playouts(board: HexBoard, budget: float) -> float:
+    """Simulaciones por segundo del motor MCTS durante `budget` segundos"""
+
+    engine = MCTS(to_move(board))
+    start = time.perf_counter()
+    engine.search(board, float('inf'), start + budget)
+    return engine.playouts / (time.perf_counter() - start)
+
+
+def bench_latency(boards: list[HexBoard], config: dict, memory: bool) -> dict[str, float]:
+    """Percentiles de latencia de `play` y memoria pico (si se pide) sobre las posiciones"""
+
+    latencies = []
+    peak = 0
+    for board in boards:
+        with AI_Player(to_move(board), **config) as player:
+            if memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            player.play(board.clone())
+            latencies.append(time.perf_counter() - start)
+            if memory:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+    latencies.sort()
+    result = {
+        "p50_s": percentile(latencies, 50),
+        "p90_s": percentile(latencies, 90),
+        "p99_s": percentile(latencies, 99),
+        "max_s": latencies[-1],
+    }
+    if memory:
+        result["peak_memory_kb"] = peak / 1024
+    return result
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Percentil por interpolación lineal de una lista ordenada"""
+
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percent) - 1]
+
+
+def head_to_head(size: int, first: dict, second: dict, games: int, seed: int) -> dict[str, int]:
+    """
+    Partidas entre dos configuraciones alternando quién empieza. Una jugada
+    ilegal pierde la partida y se cuenta en `forfeits`
+    """
+
+    wins = {"a": 0, "b": 0, "a_as_1": 0, "b_as_1": 0, "forfeits": 0}
+    for game in range(games):
+        random.seed(seed + game)
+        names = ("a", "b") if game % 2 == 0 else ("b", "a")
+        configs = {"a": first, "b": second}
+        players = {
+            1: AI_Player(1, **configs[names[0]]),
+            2: AI_Player(2, **configs[names[1]])
+        }
+        board = HexBoard(size)
+        current = 1
+        winner_id = None
+        try:
+            while winner_id is None:
+                row, col = players[current].play(board)
+                if not (0 <= row < size and 0 <= col < size and board.place_piece(row, col, current)):
+                    winner_id = 3 - current
+                    wins["forfeits"] += 1
+                elif board.check_connection(current):
+                    winner_id = current
+                current = 3 - current
+        finally:
+            for player in players.values():
+                player.close()
+        winner = names[winner_id - 1]
+        wins[winner] += 1
+        if winner == names[0]:
+            wins[f"{winner}_as_1"] += 1
+    return wins
+
+
+def parse_engine(spec: str) -> tuple[str, dict]:
+    """Convierte 'nombre:clave=valor,clave=valor' en (nombre, argumentos de AI_Player)"""
+
+    name, _, options = spec.partition(":")
+    config = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        try:
+            config[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            config[key] = value
+    return name, config
+
+
+def run(args: argparse.Namespace) -> dict:
+    random.seed(args.seed)
+    py_random.seed(args.seed)
+    engines = dict(parse_engine(spec) for spec in args.engine or ["default:time_limit=1.0"])
+    corpus = build_corpus(args.sizes, args.positions, args.seed)
+
+    results = {"seed": args.seed, "engines": engines, "positions": []}
+    for (size, phase), boards in corpus.items():
+        entry = {"size": size, "phase": phase, "primitives": bench_primitives(boards[0])}
+        entry["playouts_per_s"] = bench_playouts(boards[0], args.budget)
+        for name, config in engines.items():
+            random.seed(args.seed)
+            entry[name] = {
+                "nodes_per_s": bench_minimax(boards[0], config, args.budget),
+                **bench_latency(boards, config, args.memory)
+            }
+        results["positions"].append(entry)
+        report(entry, engines)
+
+    if args.games and len(engines) >= 2:
+        (name_a, config_a), (name_b, config_b) = list(engines.items())[:2]
+        results["head_to_head"] = {}
+        for size in args.sizes:
+            wins = head_to_head(size, config_a, config_b, args.games, args.seed)
+            results["head_to_head"][size] = wins
+            print(
+                f"{size}x{size} {name_a} vs {name_b}: {wins['a']}-{wins['b']} "
+                f"(como jugador 1: {wins['a_as_1']} / {wins['b_as_1']}"
+                + (f", {wins['forfeits']} por jugada ilegal)" if wins["forfeits"] else ")")
+            )
+    return results
+
+
+def report(entry: dict, engines: dict):
+    primitives = " ".join(
+        f"{key[:-3]}={value:.1f}us" for key, value in entry["primitives"].items()
+    )
+    print(f"{entry['size']:>2}x{entry['size']:<2} {entry['phase']:<8} {primitives}")
+    print(f"      mcts {entry['playouts_per_s']:.0f} simulaciones/s")
+    for name in engines:
+        stats = entry[name]
+        line = (
+            f"      {name}: {stats['nodes_per_s']:.0f} nodos/s, latencia "
+            f"p50={stats['p50_s']:.3f}s p90={stats['p90_s']:.3f}s "
+            f"p99={stats['p99_s']:.3f}s max={stats['max_s']:.3f}s"
+        )
+        if "peak_memory_kb" in stats:
+            line += f", memoria pico {stats['peak_memory_kb']:.0f} KB"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del jugador de Hex")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 7, 9, 11, 13, 15, 17, 19])
+    parser.add_argument("--positions", type=int, default=5, help="Posiciones por tamaño y fase")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=0.5, help="Segundos para medir nodos/s y simulaciones/s")
+    parser.add_argument(
+        "--engine", action="append",
+        help="Configuración 'nombre:clave=valor,...' de AI_Player (se puede repetir)"
+    )
+    parser.add_argument("--games", type=int, default=0, help="Partidas entre las dos primeras configuraciones")
+    parser.add_argument("--memory", action="store_true", help="Medir memoria pico con tracemalloc")
+    parser.add_argument("--json", help="Archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
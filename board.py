@@ -1,46 +1,286 @@
-import copy
+import random
+from array import array
+from functools import lru_cache
+
+# Direcciones de las 6 casillas adyacentes en el tablero
+DIRECTIONS = [(0, 1), (0, -1), (1, -1), (1, 0), (-1, 1), (-1, 0)]
+
+@lru_cache(maxsize=None)
+def neighbor_table(size: int) -> tuple[tuple[int, ...], ...]:
+    """Índices planos (fila * N + columna) de las casillas adyacentes a cada casilla"""
+    
+    return tuple(
+        tuple(
+            (row + dx) * size + col + dy for dx, dy in DIRECTIONS 
+            if 0 <= row + dx < size and 0 <= col + dy < size
+        )
+        for row in range(size) for col in range(size)
+    )
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> dict[int, list[int]]:
+    """
+    Claves aleatorias de 64 bits por jugador y casilla para el hash de Zobrist. 
+    Se generan con una semilla fija para que el hash sea el mismo entre procesos
+    """
+    
+    rng = random.Random(size)
+    return {
+        player_id: [rng.getrandbits(64) for _ in range(size * size)] 
+        for player_id in (1, 2)
+    }
+
+@lru_cache(maxsize=None)
+def neighbor_pairs(size: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """Casillas adyacentes a cada casilla como tuplas (fila, columna), por índice plano"""
+    
+    return tuple(
+        tuple(divmod(neighbor, size) for neighbor in neighbors) 
+        for neighbors in neighbor_table(size)
+    )
 
 class HexBoard:
     def __init__(self, size: int):
         self.size = size  # Tamaño N del tablero (NxN)
         self.board = [[0] * size for _ in range(size)]  # Matriz NxN (0=vacío, 1=Jugador1, 2=Jugador2)
         self.player_positions = {1: set(), 2: set()}  # Registro de fichas por jugador
+        
+        # Conjuntos disjuntos por jugador: un nodo por casilla más dos nodos 
+        # virtuales por jugador para sus bordes (inicio y fin)
+        self.start_node = size * size
+        self.end_node = size * size + 1
+        self.parent = {
+            1: list(range(size * size + 2)), 
+            2: list(range(size * size + 2))
+        }
+        self.rank = {1: [0] * (size * size + 2), 2: [0] * (size * size + 2)}
+        self.history = []  # Pila de jugadas (fila, columna, jugador, uniones realizadas)
+        
+        # Conjunto indexado de casillas vacías (índices planos) y la posición 
+        # de cada casilla dentro de él, para quitar y escoger en O(1)
+        self.empty = list(range(size * size))
+        self.empty_index = list(range(size * size))
+        
+        self.zobrist = zobrist_keys(size)
+        self.hash = 0  # Hash de Zobrist de las fichas en el tablero
 
 
     def clone(self) -> "HexBoard":
         """Devuelve una copia del tablero actual"""
         
         cloned = self.__class__(self.size) 
-        cloned.board = copy.deepcopy(self.board)
+        cloned.board = [row[:] for row in self.board]
         cloned.player_positions = {
-            1: copy.deepcopy(self.player_positions[1]),
-            2: copy.deepcopy(self.player_positions[2])
+            1: self.player_positions[1].copy(),
+            2: self.player_positions[2].copy()
         }
+        cloned.parent = {1: self.parent[1][:], 2: self.parent[2][:]}
+        cloned.rank = {1: self.rank[1][:], 2: self.rank[2][:]}
+        cloned.history = self.history[:]
+        cloned.empty = self.empty[:]
+        cloned.empty_index = self.empty_index[:]
+        cloned.hash = self.hash
         return cloned    
 
     def place_piece(self, row: int, col: int, player_id: int) -> bool:
         """Coloca una ficha si la casilla está vacía."""
         
+        return self.push((row, col), player_id)
+    
+    def remove_piece(self, row: int, col: int) -> bool:
+        """
+        Remueve una ficha del tablero. Si es la última jugada se deshace 
+        con `pop`, en otro caso se reconstruyen los conjuntos disjuntos
+        """
+        
+        player_id = self.board[row][col]
+        if player_id == 0:
+            return False
+        if self.history and self.history[-1][:2] == (row, col):
+            self.pop()
+            return True
+        
+        self.board[row][col] = 0
+        self._release_empty(row * self.size + col)
+        self.player_positions[player_id].discard((row, col))
+        self._rebuild_connections()
+        return True
+    
+    def push(self, move: tuple[int, int], player_id: int) -> bool:
+        """Juega una ficha en la casilla si está vacía y la apila en el historial"""
+        
+        row, col = move
         if self.board[row][col] != 0:
             return False
         self.board[row][col] = player_id
-        self.player_positions[player_id].add((row,col))
+        self._take_empty(row * self.size + col)
+        self.hash ^= self.zobrist[player_id][row * self.size + col]
+        self.player_positions[player_id].add(move)
+        self.history.append((row, col, player_id, self._connect(row, col, player_id)))
         return True
+    
+    def pop(self) -> tuple[int, int]:
+        """Deshace la última jugada del historial y devuelve su casilla"""
+        
+        row, col, player_id, unions = self.history.pop()
+        self.board[row][col] = 0
+        self._release_empty(row * self.size + col)
+        self.hash ^= self.zobrist[player_id][row * self.size + col]
+        self.player_positions[player_id].discard((row, col))
+        self._undo_unions(player_id, unions)
+        return row, col
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serializa el tablero de forma compacta: el tamaño y cada jugada del 
+        historial en orden como un entero de 16 bits (índice plano, con el 
+        bit más alto indicando el jugador 2)
+        """
+        
+        data = array("H", [self.size])
+        data.extend(
+            (row * self.size + col) | ((player_id - 1) << 15) 
+            for row, col, player_id, _ in self.history
+        )
+        return data.tobytes()
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HexBoard":
+        """Reconstruye un tablero serializado con `to_bytes`"""
+        
+        values = array("H")
+        values.frombytes(data)
+        board = cls(values[0])
+        for value in values[1:]:
+            board.push(divmod(value & 0x7FFF, board.size), (value >> 15) + 1)
+        return board
+    
+    @property
+    def move_count(self) -> int:
+        """Cantidad de fichas jugadas"""
+        
+        return len(self.history)
+    
+    def empty_count(self) -> int:
+        """Cantidad de casillas vacías"""
+        
+        return len(self.empty)
 
     def get_possible_moves(self) -> list:
         """Devuelve todas las casillas vacías como tuplas (fila, columna)."""
         
-        result = []
-        for i in range(self.size):
-            for j in range(self.size):
-                if(self.board[i][j] == 0):
-                    result.append((i,j))
-        return result            
+        size = self.size
+        return [divmod(node, size) for node in self.empty]
+    
+    def random_move(self, randint=random.randrange) -> tuple[int, int]:
+        """
+        Devuelve una casilla vacía al azar en O(1). `randint(n)` debe dar 
+        un entero en [0, n), como `random.randrange` o `numpy.random.randint`
+        """
+        
+        return divmod(self.empty[randint(len(self.empty))], self.size)
+    
+    def _take_empty(self, node: int):
+        """Quita una casilla del conjunto de vacías intercambiándola con la última"""
+        
+        index = self.empty_index[node]
+        last = self.empty[-1]
+        self.empty[index] = last
+        self.empty_index[last] = index
+        self.empty.pop()
+        self.empty_index[node] = -1
+    
+    def _release_empty(self, node: int):
+        """Devuelve una casilla al conjunto de vacías"""
+        
+        self.empty_index[node] = len(self.empty)
+        self.empty.append(node)
     
     def check_connection(self, player_id: int) -> bool:
         """Verifica si el jugador ha conectado sus dos lados"""
-        # return dfs(self.player_positions[player_id],player_id,self.size)
-        pass
+        
+        return self.find(player_id, self.start_node) == self.find(player_id, self.end_node)
+    
+    def find(self, player_id: int, node: int) -> int:
+        """Devuelve la raíz del conjunto de un nodo (sin compresión para poder deshacer)"""
+        
+        parent = self.parent[player_id]
+        while parent[node] != node:
+            node = parent[node]
+        return node
+    
+    def _union(self, player_id: int, u: int, v: int) -> tuple[int, int, bool] | None:
+        """Une dos conjuntos por rango y devuelve el cambio realizado"""
+        
+        u, v = self.find(player_id, u), self.find(player_id, v)
+        if u == v:
+            return None
+        rank = self.rank[player_id]
+        if rank[u] > rank[v]:
+            u, v = v, u
+        self.parent[player_id][u] = v
+        if rank[u] == rank[v]:
+            rank[v] += 1
+            return u, v, True
+        return u, v, False
+    
+    def _undo_unions(self, player_id: int, unions: tuple):
+        """Deshace en orden inverso las uniones registradas por una jugada"""
+        
+        parent, rank = self.parent[player_id], self.rank[player_id]
+        for child, root, rank_increased in reversed(unions):
+            parent[child] = child
+            if rank_increased:
+                rank[root] -= 1
+    
+    def _connect(self, row: int, col: int, player_id: int) -> tuple:
+        """Une una ficha recién colocada con sus vecinas y bordes"""
+        
+        size = self.size
+        node = row * size + col
+        changes = []
+        if (col if player_id == 1 else row) == 0:
+            changes.append(self._union(player_id, node, self.start_node))
+        if (col if player_id == 1 else row) == size - 1:
+            changes.append(self._union(player_id, node, self.end_node))
+        for nx, ny in neighbor_pairs(size)[node]:
+            if self.board[nx][ny] == player_id:
+                changes.append(self._union(player_id, node, nx * size + ny))
+        return tuple(change for change in changes if change)
+    
+    def _rebuild_connections(self):
+        """
+        Reconstruye los conjuntos disjuntos a partir de las fichas del tablero,
+        repitiendo el historial en su orden y omitiendo las fichas que ya no 
+        están (las que no estén en el historial van al final)
+        """
+        
+        nodes = self.size * self.size + 2
+        previous = self.history
+        self.parent = {1: list(range(nodes)), 2: list(range(nodes))}
+        self.rank = {1: [0] * nodes, 2: [0] * nodes}
+        self.history = []
+        self.hash = 0
+        
+        on_board = {
+            (row, col): value for row, values in enumerate(self.board) 
+            for col, value in enumerate(values) if value
+        }
+        stones = [
+            (row, col, player_id) for row, col, player_id, _ in previous 
+            if on_board.get((row, col)) == player_id
+        ]
+        replayed = {(row, col) for row, col, _ in stones}
+        stones += [
+            (row, col, value) for (row, col), value in on_board.items() 
+            if (row, col) not in replayed
+        ]
+        for row, col, _ in stones:
+            self.board[row][col] = 0
+        for row, col, player_id in stones:
+            self.board[row][col] = player_id
+            self.hash ^= self.zobrist[player_id][row * self.size + col]
+            self.history.append((row, col, player_id, self._connect(row, col, player_id)))
 
     def print_board(self):
         space = ""
@@ -65,4 +305,111 @@ class HexBoard:
         print(space,end="    ")
         for i in range(self.size):
             print(f"\033[31m{i}  \033[0m", end=" ")
-            
\ No newline at end of file
+
+
+class CompactHexBoard(HexBoard):
+    """
+    Tablero respaldado por un único `bytearray` de N*N casillas. `board` 
+    expone cada fila como una vista sobre ese buffer, por lo que se puede 
+    indexar igual que la matriz de `HexBoard`, y clonar es copiar el buffer
+    """
+    
+    def __init__(self, size: int):
+        super().__init__(size)
+        self.cells = bytearray(size * size)  # Casillas en orden fila a fila
+        self.board = self._rows()
+    
+    @classmethod
+    def from_board(cls, board: HexBoard) -> "CompactHexBoard":
+        """Construye un tablero compacto con las fichas de otro tablero"""
+        
+        compact = cls(board.size)
+        for row, values in enumerate(board.board):
+            for col, player_id in enumerate(values):
+                if player_id:
+                    compact.place_piece(row, col, player_id)
+        return compact
+    
+    def _rows(self) -> list[memoryview]:
+        """Vistas de cada fila sobre el buffer de casillas"""
+        
+        view = memoryview(self.cells)
+        return [view[i * self.size:(i + 1) * self.size] for i in range(self.size)]
+    
+    def clone(self) -> "CompactHexBoard":
+        """Devuelve una copia del tablero actual"""
+        
+        # Se copian solo los campos del tablero (no `__dict__` entero): los
+        # métodos reemplazados en esta instancia no deben pasar a la copia
+        cloned = self.__class__.__new__(self.__class__)
+        cloned.size = self.size
+        cloned.start_node = self.start_node
+        cloned.end_node = self.end_node
+        cloned.zobrist = self.zobrist
+        cloned.hash = self.hash
+        cloned.cells = self.cells[:]
+        cloned.board = cloned._rows()
+        cloned.player_positions = {
+            1: self.player_positions[1].copy(),
+            2: self.player_positions[2].copy()
+        }
+        cloned.parent = {1: self.parent[1][:], 2: self.parent[2][:]}
+        cloned.rank = {1: self.rank[1][:], 2: self.rank[2][:]}
+        cloned.history = self.history[:]
+        cloned.empty = self.empty[:]
+        cloned.empty_index = self.empty_index[:]
+        return cloned
+    
+    def push(self, move: tuple[int, int], player_id: int) -> bool:
+        """Juega una ficha en la casilla si está vacía y la apila en el historial"""
+        
+        row, col = move
+        node = row * self.size + col
+        if self.cells[node]:
+            return False
+        self.cells[node] = player_id
+        self._take_empty(node)
+        self.hash ^= self.zobrist[player_id][node]
+        self.player_positions[player_id].add(move)
+        self.history.append((row, col, player_id, self._connect(row, col, player_id)))
+        return True
+    
+    def pop(self) -> tuple[int, int]:
+        """Deshace la última jugada del historial y devuelve su casilla"""
+        
+        row, col, player_id, unions = self.history.pop()
+        node = row * self.size + col
+        self.cells[node] = 0
+        self._release_empty(node)
+        self.hash ^= self.zobrist[player_id][node]
+        self.player_positions[player_id].discard((row, col))
+        self._undo_unions(player_id, unions)
+        return row, col
+    
+    def _connect(self, row: int, col: int, player_id: int) -> tuple:
+        """Une una ficha recién colocada con sus vecinas y bordes"""
+        
+        size, cells = self.size, self.cells
+        node = row * size + col
+        changes = []
+        if (col if player_id == 1 else row) == 0:
+            changes.append(self._union(player_id, node, self.start_node))
+        if (col if player_id == 1 else row) == size - 1:
+            changes.append(self._union(player_id, node, self.end_node))
+        for neighbor in neighbor_table(size)[node]:
+            if cells[neighbor] == player_id:
+                changes.append(self._union(player_id, node, neighbor))
+        return tuple(change for change in changes if change)
+    
+    def __getstate__(self) -> dict:
+        # Las vistas de memoria no se pueden serializar, se reconstruyen al cargar
+        # Las claves de Zobrist se recuperan de la caché por tamaño
+        state = self.__dict__.copy()
+        del state["board"]
+        del state["zobrist"]
+        return state
+    
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.board = self._rows()
+        self.zobrist = zobrist_keys(self.size)
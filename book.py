@@ -0,0 +1,201 @@
+"""
+Libro de aperturas: se genera sin conexión con búsquedas MCTS largas (y,
+opcionalmente, las posiciones más frecuentes de partidas registradas) y se
+guarda como una tabla hash de direccionamiento abierto en disco, que se
+consulta mapeada en memoria en O(1).
+
+Las posiciones se guardan en forma canónica respecto a la rotación de 180°
+(la casilla i pasa a n*n - 1 - i, cada jugador conserva sus bordes): una
+entrada sirve para la posición y su rotada.
+
+Ejemplo:
+    python book.py --sizes 5 7 9 11 --plies 4 --width 3 --time 2.0
+"""
+import argparse
+import mmap
+import os
+import struct
+import time
+from collections import Counter
+from board import HexBoard, zobrist_keys
+from mcts import MCTS
+from transposition import SIDE_TO_MOVE_KEY
+
+MAGIC = b"HEXB\x01"
+HEADER = struct.Struct("<I")  # Cantidad de casillas de la tabla (potencia de 2)
+SLOT = struct.Struct("<QH")  # Clave de la posición (0: vacía) y jugada como índice plano
+MASK = (1 << 64) - 1
+SIZE_KEY = 0xD6E8FEB86659FD93  # Multiplicador para distinguir tamaños con el mismo hash
+
+
+def book_key(board: HexBoard, player_id: int) -> tuple[int, bool]:
+    """
+    Clave canónica de la posición con `player_id` por jugar y si la forma
+    canónica es la rotada (en ese caso las jugadas del libro también lo están)
+    """
+
+    size = board.size
+    last = size * size - 1
+    zobrist = zobrist_keys(size)
+    rotated = 0
+    for pid in (1, 2):
+        for row, col in board.player_positions[pid]:
+            rotated ^= zobrist[pid][last - (row * size + col)]
+
+    is_rotated = rotated < board.hash
+    key = min(rotated, board.hash) ^ ((size * SIZE_KEY) & MASK)
+    if player_id == 2:
+        key ^= SIDE_TO_MOVE_KEY
+    return key or 1, is_rotated
+
+
+class OpeningBook:
+    """Libro de aperturas en disco, mapeado en memoria"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            self.data.close()
+            raise ValueError(f"{path} no es un libro de aperturas")
+        self.slots = HEADER.unpack_from(self.data, len(MAGIC))[0]
+        self.offset = len(MAGIC) + HEADER.size
+
+    def __len__(self) -> int:
+        return sum(
+            1 for index in range(self.slots)
+            if SLOT.unpack_from(self.data, self.offset + index * SLOT.size)[0]
+        )
+
+    def lookup(self, board: HexBoard, player_id: int) -> tuple[int, int] | None:
+        """Jugada del libro para la posición, o None si no está"""
+
+        key, is_rotated = book_key(board, player_id)
+        mask = self.slots - 1
+        index = key & mask
+        while True:
+            stored, move = SLOT.unpack_from(self.data, self.offset + index * SLOT.size)
+            if not stored:
+                return None
+            if stored == key:
+                if is_rotated:
+                    move = board.size * board.size - 1 - move
+                return divmod(move, board.size)
+            index = (index + 1) & mask
+
+    def close(self):
+        self.data.close()
+
+
+def write_book(path: str, entries: dict[int, int]):
+    """Guarda las entradas (clave canónica -> jugada) en una tabla con carga de a lo sumo 1/2"""
+
+    slots = 1
+    while slots < 2 * len(entries) or slots < 2:
+        slots *= 2
+    table = [(0, 0)] * slots
+    for key, move in entries.items():
+        index = key & (slots - 1)
+        while table[index][0]:
+            index = (index + 1) & (slots - 1)
+        table[index] = (key, move)
+
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(HEADER.pack(slots))
+        for key, move in table:
+            file.write(SLOT.pack(key, move))
+
+
+def search_position(board: HexBoard, player_id: int, seconds: float) -> list[int]:
+    """Jugadas de la posición (índices planos) ordenadas por visitas de una búsqueda MCTS"""
+
+    engine = MCTS(player_id)
+    engine.search(board, float('inf'), time.perf_counter() + seconds)
+    statistics = engine.root_statistics()
+    return sorted(statistics, key=lambda move: -statistics[move][0])
+
+
+def frequent_positions(records: str, size: int, plies: int, min_count: int) -> list[list[int]]:
+    """
+    Secuencias de jugadas (índices planos) de las posiciones que aparecen al
+    menos `min_count` veces en las primeras `plies` jugadas de las partidas
+    """
+
+    from records import GameReader
+
+    counts = Counter()
+    with GameReader(records) as reader:
+        for record in reader:
+            if record.size != size:
+                continue
+            moves = [row * size + col for row, col, _ in record.moves()[:plies]]
+            for ply in range(1, len(moves)):
+                counts[tuple(moves[:ply])] += 1
+    return [list(moves) for moves, count in counts.items() if count >= min_count]
+
+
+def build_book(
+    sizes: list[int], plies: int = 4, width: int = 3, seconds: float = 2.0,
+    records: str = None, min_count: int = 10, verbose: bool = True
+    ) -> dict[int, int]:
+    """
+    Genera las entradas del libro: desde el tablero vacío se guarda la mejor
+    jugada de cada posición y se expanden las `width` jugadas más visitadas
+    hasta `plies` jugadas. Si se dan partidas registradas, se agregan sus
+    posiciones frecuentes. Las posiciones equivalentes por rotación se
+    buscan una sola vez
+    """
+
+    entries = {}
+    for size in sizes:
+        pending = [[]]
+        if records:
+            pending.extend(frequent_positions(records, size, plies, min_count))
+        while pending:
+            moves = pending.pop()
+            board = HexBoard(size)
+            for turn, move in enumerate(moves):
+                board.push(divmod(move, size), 1 + turn % 2)
+            player_id = 1 + len(moves) % 2
+            key, is_rotated = book_key(board, player_id)
+            if key in entries:
+                continue
+
+            ranked = search_position(board, player_id, seconds)
+            best = ranked[0]
+            entries[key] = size * size - 1 - best if is_rotated else best
+            if verbose:
+                print(f"{size}x{size} {moves} -> {divmod(best, size)}")
+            if len(moves) + 1 < plies:
+                pending.extend(moves + [move] for move in ranked[:width])
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el libro de aperturas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 7, 9, 11])
+    parser.add_argument("--plies", type=int, default=4, help="Jugadas cubiertas por el libro")
+    parser.add_argument("--width", type=int, default=3, help="Respuestas expandidas por posición")
+    parser.add_argument("--time", type=float, default=2.0, help="Segundos de búsqueda por posición")
+    parser.add_argument("--records", help="Partidas registradas (records.py) de las que tomar posiciones")
+    parser.add_argument("--min-count", type=int, default=10)
+    parser.add_argument("--output", default="opening_book.bin")
+    args = parser.parse_args()
+
+    entries = build_book(args.sizes, args.plies, args.width, args.time, args.records, args.min_count)
+    if os.path.exists(args.output):
+        # Conserva las entradas de otros tamaños ya generadas
+        book = OpeningBook(args.output)
+        for index in range(book.slots):
+            key, move = SLOT.unpack_from(book.data, book.offset + index * SLOT.size)
+            if key:
+                entries.setdefault(key, move)
+        book.close()
+    write_book(args.output, entries)
+    print(f"{len(entries)} posiciones en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+import heapq
+from collections import deque
+from board import HexBoard, neighbor_table, zobrist_keys
+
+INF = float('inf')
+REPLAY_DEPTH = 8  # Jugadas que DistanceMaps vuelve a aplicar de forma incremental al reiniciar
+
+
+def edge_cells(size: int, player_id: int) -> tuple[list[int], list[int]]:
+    """Índices planos de las casillas del borde inicial y final de un jugador"""
+
+    if player_id == 1:
+        return [row * size for row in range(size)], [row * size + size - 1 for row in range(size)]
+    return list(range(size)), [(size - 1) * size + col for col in range(size)]
+
+
+def distance_map(cells: bytearray, size: int, player_id: int) -> list[float]:
+    """
+    Menor cantidad de fichas que le faltan al jugador para llegar a cada
+    casilla desde su borde inicial (0-1 BFS: casilla propia 0, vacía 1)
+    """
+
+    neighbors = neighbor_table(size)
+    opponent = 3 - player_id
+    distance = [INF] * (size * size)
+    dq = deque()
+    for node in edge_cells(size, player_id)[0]:
+        if cells[node] == player_id:
+            distance[node] = 0
+            dq.appendleft(node)
+        elif cells[node] == 0:
+            distance[node] = 1
+            dq.append(node)
+
+    while dq:
+        node = dq.popleft()
+        current = distance[node]
+        for neighbor in neighbors[node]:
+            value = cells[neighbor]
+            if value == opponent:
+                continue
+            new_dist = current if value == player_id else current + 1
+            if new_dist < distance[neighbor]:
+                distance[neighbor] = new_dist
+                if new_dist == current:
+                    dq.appendleft(neighbor)
+                else:
+                    dq.append(neighbor)
+    return distance
+
+
+class DistanceMaps:
+    """
+    Mapas de distancia de ambos jugadores que se mantienen sincronizados con
+    la pila de jugadas del tablero. Al jugar una ficha solo se reparan las
+    casillas afectadas, anotando sus valores anteriores, y al deshacerla se
+    restauran esas casillas, así evaluar hojas consecutivas de la búsqueda
+    no recalcula (ni copia) todo el tablero
+    """
+
+    def __init__(self):
+        self.size = None
+        self.cells = None
+        self.maps = {}  # Jugador -> distancias por índice plano
+        self.base = 0  # Jugadas del historial incluidas en el estado inicial
+        self.moves = []  # Jugadas (fila, columna, jugador) aplicadas sobre el estado inicial
+        # Valores anteriores (jugador, casilla, distancia) de las casillas que
+        # cambiaron las jugadas aplicadas, y dónde empieza el de cada jugada
+        self.changes = []
+        self.marks = []
+        self.hash = 0
+
+    def distance(self, board: HexBoard, player_id: int) -> float:
+        """Menor cantidad de fichas que le faltan al jugador para conectar sus bordes"""
+
+        self.sync(board)
+        distance = self.maps[player_id]
+        return min(distance[node] for node in self.ends[player_id])
+
+    def sync(self, board: HexBoard):
+        """Deshace y aplica jugadas hasta coincidir con el historial del tablero"""
+
+        history = board.history
+        if board.size != self.size or len(history) < self.base:
+            self.reset(board)
+            return
+
+        while self.moves and (
+            self.base + len(self.moves) > len(history)
+            or history[self.base + len(self.moves) - 1][:3] != self.moves[-1]
+        ):
+            self._pop()
+        for row, col, player_id, _ in history[self.base + len(self.moves):]:
+            self._push(row, col, player_id)
+
+        if self.hash != board.hash:
+            self.reset(board)
+
+    def reset(self, board: HexBoard):
+        """
+        Recalcula ambos mapas desde cero con la posición del tablero sin sus
+        últimas `REPLAY_DEPTH` jugadas y las vuelve a aplicar, así las hojas
+        hermanas de la búsqueda comparten el estado inicial
+        """
+
+        self.size = size = board.size
+        self.cells = bytearray(value for row in board.board for value in row)
+        self.zobrist = zobrist_keys(size)
+        self.hash = board.hash
+        replay = board.history[max(0, len(board.history) - REPLAY_DEPTH):]
+        for row, col, player_id, _ in replay:
+            self.cells[row * size + col] = 0
+            self.hash ^= self.zobrist[player_id][row * size + col]
+
+        self.maps = {player_id: distance_map(self.cells, size, player_id) for player_id in (1, 2)}
+        self.starts = {player_id: edge_cells(size, player_id)[0] for player_id in (1, 2)}
+        self.ends = {player_id: edge_cells(size, player_id)[1] for player_id in (1, 2)}
+        self.start_sets = {player_id: set(self.starts[player_id]) for player_id in (1, 2)}
+        self.base = len(board.history) - len(replay)
+        self.moves = []
+        self.changes = []
+        self.marks = []
+        for row, col, player_id, _ in replay:
+            self._push(row, col, player_id)
+
+    def _push(self, row: int, col: int, player_id: int):
+        node = row * self.size + col
+        self.marks.append(len(self.changes))
+        self.moves.append((row, col, player_id))
+        self.cells[node] = player_id
+        self.hash ^= self.zobrist[player_id][node]
+        self._decrease(node, player_id)
+        self._block(node, 3 - player_id)
+
+    def _pop(self):
+        row, col, player_id = self.moves.pop()
+        node = row * self.size + col
+        mark = self.marks.pop()
+        changes, maps = self.changes, self.maps
+        while len(changes) > mark:
+            player, changed, value = changes.pop()
+            maps[player][changed] = value
+        self.cells[node] = 0
+        self.hash ^= self.zobrist[player_id][node]
+
+    def _decrease(self, node: int, player_id: int):
+        """La casilla pasó de costar 1 a costar 0: las distancias solo pueden bajar"""
+
+        distance = self.maps[player_id]
+        if distance[node] == INF:
+            return
+        self.changes.append((player_id, node, distance[node]))
+        distance[node] -= 1
+        self._relax(deque([node]), player_id)
+
+    def _relax(self, dq: deque, player_id: int):
+        """Propaga con 0-1 BFS las distancias que bajaron en las casillas de la cola"""
+
+        cells, distance = self.cells, self.maps[player_id]
+        changes = self.changes
+        neighbors = neighbor_table(self.size)
+        opponent = 3 - player_id
+        while dq:
+            node = dq.popleft()
+            current = distance[node]
+            for neighbor in neighbors[node]:
+                value = cells[neighbor]
+                if value == opponent:
+                    continue
+                new_dist = current if value == player_id else current + 1
+                if new_dist < distance[neighbor]:
+                    changes.append((player_id, neighbor, distance[neighbor]))
+                    distance[neighbor] = new_dist
+                    if new_dist == current:
+                        dq.appendleft(neighbor)
+                    else:
+                        dq.append(neighbor)
+
+    def _block(self, node: int, player_id: int):
+        """
+        La casilla quedó bloqueada para el jugador: solo pueden empeorar las
+        casillas cuyo camino mínimo pasaba por ella (sus descendientes en el
+        grafo de caminos mínimos). Esas se reinician y se recalculan desde
+        sus vecinas no afectadas
+        """
+
+        distance = self.maps[player_id]
+        if distance[node] == INF:
+            return
+        cells = self.cells
+        neighbors = neighbor_table(self.size)
+        opponent = 3 - player_id
+
+        affected = {node}
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for neighbor in neighbors[current]:
+                value = cells[neighbor]
+                if value == opponent or neighbor in affected:
+                    continue
+                cost = 0 if value == player_id else 1
+                if distance[neighbor] == distance[current] + cost:
+                    affected.add(neighbor)
+                    stack.append(neighbor)
+
+        # Solo cambian las casillas afectadas: basta anotar su valor anterior aquí
+        changes = self.changes
+        for current in affected:
+            changes.append((player_id, current, distance[current]))
+            distance[current] = INF
+        heap = []
+        starts = self.start_sets[player_id]
+        for current in affected:
+            if cells[current] == opponent:
+                continue
+            cost = 0 if cells[current] == player_id else 1
+            best = cost if current in starts else INF
+            for neighbor in neighbors[current]:
+                if neighbor not in affected and cells[neighbor] != opponent:
+                    best = min(best, distance[neighbor] + cost)
+            if best < INF:
+                distance[current] = best
+                heap.append((best, current))
+
+        heapq.heapify(heap)
+        while heap:
+            current_dist, current = heapq.heappop(heap)
+            if current_dist > distance[current]:
+                continue
+            for neighbor in neighbors[current]:
+                if neighbor not in affected or cells[neighbor] == opponent:
+                    continue
+                new_dist = current_dist + (0 if cells[neighbor] == player_id else 1)
+                if new_dist < distance[neighbor]:
+                    distance[neighbor] = new_dist
+                    heapq.heappush(heap, (new_dist, neighbor))
+
+
+def two_distance(board: HexBoard, player_id: int) -> float:
+    """
+    Potencial de dos distancias del jugador: para cada casilla vacía se suma
+    su dos-distancia a cada borde (una casilla está a distancia k+1 si tiene
+    al menos dos vecinas a distancia k o menos, porque el oponente puede
+    bloquear una). Las fichas propias conectadas se tratan como un solo
+    nodo y el borde cuenta como dos vecinas. Devuelve el menor potencial
+    """
+
+    size = board.size
+    neighbors = neighbor_table(size)
+    cells = bytearray(value for row in board.board for value in row)
+    start, end = board.find(player_id, board.start_node), board.find(player_id, board.end_node)
+    if start == end:
+        return 0
+
+    # Casillas vacías adyacentes a cada grupo de fichas propias (por raíz)
+    group_empty = {}
+    for row, col in board.player_positions[player_id]:
+        node = row * size + col
+        root = board.find(player_id, node)
+        group_empty.setdefault(root, set()).update(
+            neighbor for neighbor in neighbors[node] if not cells[neighbor]
+        )
+    start_cells, end_cells = edge_cells(size, player_id)
+    sources = {
+        start: group_empty.get(start, set()) | {node for node in start_cells if not cells[node]},
+        end: group_empty.get(end, set()) | {node for node in end_cells if not cells[node]}
+    }
+
+    # Vecinas extra de las casillas vacías que tocan un grupo propio: las demás 
+    # casillas vacías que tocan ese grupo
+    extra = {}
+    for root, empties in group_empty.items():
+        for node in empties:
+            extra.setdefault(node, set()).update(empties)
+    for node, linked in extra.items():
+        linked.discard(node)
+        linked.difference_update(neighbors[node])
+
+    distances = []
+    for edge in (start, end):
+        distance = [INF] * (size * size)
+        counts = bytearray(size * size)
+        layer = list(sources[edge])
+        for node in layer:
+            distance[node] = 1
+        level = 1
+        while layer:
+            level += 1
+            next_layer = []
+            for node in layer:
+                for neighbor in neighbors[node]:
+                    if cells[neighbor] or distance[neighbor] != INF:
+                        continue
+                    if counts[neighbor]:
+                        distance[neighbor] = level
+                        next_layer.append(neighbor)
+                    else:
+                        counts[neighbor] = 1
+                for neighbor in extra.get(node, ()):
+                    if distance[neighbor] != INF:
+                        continue
+                    if counts[neighbor]:
+                        distance[neighbor] = level
+                        next_layer.append(neighbor)
+                    else:
+                        counts[neighbor] = 1
+            layer = next_layer
+        distances.append(distance)
+
+    return min(to_start + to_end for to_start, to_end in zip(*distances))
@@ -0,0 +1,194 @@
+"""
+Casillas inferiores para la generación de jugadas. Se analiza el anillo de
+las 6 vecinas de cada casilla vacía (en orden circular, los bordes fuera
+del tablero cuentan como fichas de su dueño):
+
+- Inútil para un jugador: cualquier camino suyo que pase por la casilla se
+  puede desviar por el anillo usando solo fichas que ya tiene.
+- Muerta: inútil para ambos, su color no cambia al ganador.
+- Capturada por un jugador: dos casillas vacías vecinas tales que jugar en
+  una mata a la otra; si el oponente juega en una, se responde en la otra.
+- Dominada: si jugar en c mata a la vecina d, jugar c es al menos tan bueno
+  como jugar d.
+"""
+from functools import lru_cache
+from board import HexBoard
+from heuristics import distance_map, INF
+
+# Vecinas en orden circular: cada una es adyacente a la siguiente
+RING = ((0, 1), (1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1))
+POWERS = tuple(3 ** index for index in range(6))
+EMPTY, OWN, BLOCKED = 0, 1, 2
+
+
+@lru_cache(maxsize=None)
+def ring_table(size: int) -> tuple[tuple[tuple[int, ...], int], ...]:
+    """
+    Anillo de cada casilla: índices planos de las vecinas (-1 fuera del
+    tablero) y el código fijo de las posiciones fuera del tablero, que
+    cuentan como fichas del dueño de ese borde (por columna el jugador 1,
+    por fila el jugador 2)
+    """
+
+    table = []
+    for row in range(size):
+        for col in range(size):
+            ring, base = [], 0
+            for power, (dx, dy) in zip(POWERS, RING):
+                r, c = row + dx, col + dy
+                if not 0 <= c < size:
+                    ring.append(-1)
+                    base += 1 * power
+                elif not 0 <= r < size:
+                    ring.append(-1)
+                    base += 2 * power
+                else:
+                    ring.append(r * size + c)
+            table.append((tuple(ring), base))
+    return tuple(table)
+
+
+def _useless(states: list[int]) -> bool:
+    """Si el anillo conecta por fichas propias cada par de vecinas utilizables"""
+
+    usable = [index for index in range(6) if states[index] != BLOCKED]
+    for first_index, first in enumerate(usable):
+        for second in usable[first_index + 1:]:
+            reached, stack = {first}, [first]
+            while stack:
+                current = stack.pop()
+                for neighbor in ((current + 1) % 6, (current - 1) % 6):
+                    if neighbor in reached:
+                        continue
+                    if neighbor == second or states[neighbor] == OWN:
+                        reached.add(neighbor)
+                        stack.append(neighbor)
+            if second not in reached:
+                return False
+    return True
+
+
+def _dead(code: int) -> bool:
+    """Si el anillo (código en base 3 con los valores de las casillas) es inútil para ambos"""
+
+    values = [(code // power) % 3 for power in POWERS]
+    return all(
+        _useless([EMPTY if not value else OWN if value == player_id else BLOCKED for value in values])
+        for player_id in (1, 2)
+    )
+
+
+DEAD = tuple(_dead(code) for code in range(3 ** 6))
+
+
+def board_cells(board: HexBoard) -> bytearray:
+    return bytearray(value for row in board.board for value in row)
+
+
+def ring_codes(cells: bytearray, size: int, nodes: list[int]) -> dict[int, int]:
+    """Código del anillo de cada casilla"""
+
+    rings = ring_table(size)
+    codes = {}
+    for node in nodes:
+        ring, code = rings[node]
+        for power, neighbor in zip(POWERS, ring):
+            if neighbor >= 0:
+                code += cells[neighbor] * power
+        codes[node] = code
+    return codes
+
+
+def inferior_cells(
+    board: HexBoard, player_id: int, cells: bytearray = None
+    ) -> tuple[set[int], set[int], set[int]]:
+    """
+    Casillas muertas, capturadas (por cualquiera de los dos) y dominadas para
+    `player_id` como jugador por mover, como índices planos
+    """
+
+    size = board.size
+    rings = ring_table(size)
+    if cells is None:
+        cells = board_cells(board)
+    empty = [row * size + col for row, col in board.get_possible_moves()]
+    codes = ring_codes(cells, size, empty)
+    dead = {node for node in empty if DEAD[codes[node]]}
+
+    # kills[(pid, c)]: vecinas vacías que mueren si pid juega en c. La casilla
+    # c ocupa en el anillo de su vecina la posición opuesta (índice + 3)
+    kills = {}
+    for node in empty:
+        if node in dead:
+            continue
+        for index, neighbor in enumerate(rings[node][0]):
+            if neighbor < 0 or neighbor not in codes or neighbor in dead:
+                continue
+            power = POWERS[(index + 3) % 6]
+            for pid in (1, 2):
+                if DEAD[codes[neighbor] + pid * power]:
+                    kills.setdefault((pid, node), []).append(neighbor)
+
+    # Pares capturados disjuntos: jugar en cualquiera de los dos mata al otro
+    captured = set()
+    for (pid, node), killed in kills.items():
+        for neighbor in killed:
+            if node in kills.get((pid, neighbor), ()) and not captured & {node, neighbor}:
+                captured.update((node, neighbor))
+
+    dominated = set()
+    for node in empty:
+        if node in dead or node in captured or node in dominated:
+            continue
+        for neighbor in kills.get((player_id, node), ()):
+            if neighbor not in captured:
+                dominated.add(neighbor)
+    return dead, captured, dominated
+
+
+def relevant_zone(board: HexBoard, slack: int = 1, cells: bytearray = None) -> set[int]:
+    """
+    Casillas vacías en algún camino de cualquiera de los dos jugadores que
+    use a lo sumo `slack` fichas más que su camino mínimo
+    """
+
+    size = board.size
+    if cells is None:
+        cells = board_cells(board)
+    last = size * size - 1
+    zone = set()
+    for player_id in (1, 2):
+        forward = distance_map(cells, size, player_id)
+        # El mapa desde el borde final es el del tablero rotado 180°
+        backward = distance_map(cells[::-1], size, player_id)[::-1]
+        best = min(
+            forward[node] + backward[node] - (0 if cells[node] else 1)
+            for node in range(size * size) if cells[node] != 3 - player_id
+        )
+        if best == INF:
+            continue
+        for node in range(last + 1):
+            if not cells[node] and forward[node] + backward[node] - 1 <= best + slack:
+                zone.add(node)
+    return zone
+
+
+def candidate_moves(
+    board: HexBoard, player_id: int, zone_slack: int = None
+    ) -> list[tuple[int, int]]:
+    """
+    Casillas vacías sin las muertas, capturadas ni dominadas para el jugador
+    por mover y, si se da `zone_slack`, solo las de la zona relevante. Si se
+    descartaran todas se devuelven todas (su color ya no importa)
+    """
+
+    moves = board.get_possible_moves()
+    cells = board_cells(board)
+    dead, captured, dominated = inferior_cells(board, player_id, cells)
+    size = board.size
+    pruned = dead | captured | dominated
+    candidates = [move for move in moves if move[0] * size + move[1] not in pruned]
+    if zone_slack is not None:
+        zone = relevant_zone(board, zone_slack, cells)
+        candidates = [move for move in candidates if move[0] * size + move[1] in zone] or candidates
+    return candidates or moves
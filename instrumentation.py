@@ -0,0 +1,283 @@
+"""
+Instrumentación opcional de `AI_Player`. `Instrumentation(player)` reemplaza
+en esa instancia (no en la clase) los métodos de la búsqueda por versiones
+que cuentan y miden, así que un jugador sin instrumentar no paga nada. Por
+cada llamada a `play` queda un `PlayStats` con la rama escogida, nodos,
+cortes, evaluaciones, comprobaciones de conexión, simulaciones, profundidad
+alcanzada y tiempo de cada etapa.
+
+Los nodos de la búsqueda paralela (`workers > 1`) ocurren en otros procesos
+y no se cuentan; sí la profundidad y los tiempos.
+"""
+import json
+import time
+from collections import deque
+
+# Etapas medidas de `select_move`
+STAGES = ("book", "threats", "solver", "monte_carlo", "minimax")
+
+
+class PlayStats:
+    """Estadísticas de una llamada a `play`"""
+
+    __slots__ = (
+        "move", "branch", "nodes", "cutoffs", "heuristic_calls",
+        "connection_checks", "playouts", "depth", "stage_times", "total_time"
+    )
+
+    def __init__(self):
+        self.move = None
+        # "book", "center", "win", "block", "solver", "monte_carlo" o "minimax"
+        self.branch = None
+        self.nodes = 0  # Nodos visitados por Minimax y por el solucionador de finales
+        self.cutoffs = 0  # Cortes alfa-beta
+        self.heuristic_calls = 0
+        self.connection_checks = 0  # Llamadas a `check_connection` del tablero
+        self.playouts = 0  # Simulaciones de Monte Carlo
+        self.depth = 0  # Mayor profundidad de Minimax terminada desde la raíz
+        self.stage_times = dict.fromkeys(STAGES, 0.0)  # Segundos por etapa
+        self.total_time = 0.0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"PlayStats({self.as_dict()})"
+
+
+class Instrumentation:
+    """
+    Mide las jugadas de un `AI_Player`. `last` es el `PlayStats` de la última
+    jugada y `recent` guarda las últimas `keep`. Si se da `export` (una
+    función que recibe un diccionario o la ruta de un archivo JSON lines),
+    cada `interval` segundos se le envían las métricas acumuladas
+    """
+
+    def __init__(self, player, export=None, interval: float = 60.0, keep: int = 1000):
+        self.player = player
+        self.export = export
+        self.interval = interval
+        self.recent = deque(maxlen=keep)
+        self.last = None
+        self.current = None  # Estadísticas de la jugada en curso
+        self.book_move = None  # Respuesta del libro en la jugada en curso
+        self.totals = {}  # Métricas acumuladas desde la última exportación
+        self.last_export = time.perf_counter()
+        self.attach()
+
+    def attach(self):
+        """Instala las versiones medidas de los métodos en la instancia"""
+
+        player = self.player
+        select_move = player.select_move
+        minimax = player.minimax
+        heuristic = player.heuristic
+        record_cutoff = player.record_cutoff
+        look_for_win_next_round = player.look_for_win_next_round
+        monte_carlo_method = player.monte_carlo_method
+        iterative_deepening = player.iterative_deepening
+        solve_endgame = player.solve_endgame
+
+        def measured_select_move(board):
+            stats = self.current = PlayStats()
+            self.book_move = None
+            start = time.perf_counter()
+            self._watch_board(board)
+            try:
+                stats.move = select_move(board)
+            finally:
+                self._unwatch_board(board)
+                stats.total_time = time.perf_counter() - start
+                self.current = None
+            if stats.branch is None:
+                # Sin búsqueda ni amenaza: la jugada salió del libro o del centro
+                stats.branch = "book" if stats.move == self.book_move else "center"
+            self._finish(stats)
+            return stats.move
+
+        def measured_minimax(board, depth, *args, **kwargs):
+            stats = self.current
+            if stats is None:
+                return minimax(board, depth, *args, **kwargs)
+            stats.nodes += 1
+            if kwargs.get("ply", 0) or args:
+                return minimax(board, depth, *args, **kwargs)
+            # Llamada desde la raíz: se mide su tiempo y profundidad
+            start = time.perf_counter()
+            try:
+                result = minimax(board, depth, *args, **kwargs)
+            finally:
+                stats.stage_times["minimax"] += time.perf_counter() - start
+            stats.branch = "minimax"
+            stats.depth = max(stats.depth, depth)
+            return result
+
+        def measured_heuristic(board):
+            if self.current is not None:
+                self.current.heuristic_calls += 1
+            return heuristic(board)
+
+        def measured_record_cutoff(*args):
+            if self.current is not None:
+                self.current.cutoffs += 1
+            return record_cutoff(*args)
+
+        def measured_look_for_win_next_round(board, player_id):
+            stats = self.current
+            start = time.perf_counter()
+            move = look_for_win_next_round(board, player_id)
+            if stats is not None:
+                stats.stage_times["threats"] += time.perf_counter() - start
+                if move:
+                    stats.branch = "win" if player_id == player.player_id else "block"
+            return move
+
+        def measured_monte_carlo_method(board, player_id, *args, **kwargs):
+            stats = self.current
+            if stats is None:
+                return monte_carlo_method(board, player_id, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return monte_carlo_method(board, player_id, *args, **kwargs)
+            finally:
+                stats.stage_times["monte_carlo"] += time.perf_counter() - start
+                stats.branch = "monte_carlo"
+                stats.playouts += player.playouts
+
+        def measured_solve_endgame(board):
+            stats = self.current
+            start = time.perf_counter()
+            move = solve_endgame(board)
+            if stats is not None:
+                stats.stage_times["solver"] += time.perf_counter() - start
+                stats.nodes += player.solver.nodes
+                if move:
+                    stats.branch = "solver"
+            return move
+
+        def measured_iterative_deepening(board):
+            stats = self.current
+            move = iterative_deepening(board)
+            if stats is not None:
+                stats.branch = "minimax"
+            return move
+
+        player.select_move = measured_select_move
+        player.minimax = measured_minimax
+        player.heuristic = measured_heuristic
+        player.record_cutoff = measured_record_cutoff
+        player.look_for_win_next_round = measured_look_for_win_next_round
+        player.monte_carlo_method = measured_monte_carlo_method
+        player.iterative_deepening = measured_iterative_deepening
+        player.solve_endgame = measured_solve_endgame
+        if player.pool is not None:
+            self._wrap_pool(player.pool)
+        if player.book is not None:
+            self._wrap_book(player.book)
+
+    def detach(self):
+        """Devuelve al jugador sus métodos originales"""
+
+        for name in (
+            "select_move", "minimax", "heuristic", "record_cutoff",
+            "look_for_win_next_round", "monte_carlo_method", "iterative_deepening",
+            "solve_endgame"
+        ):
+            self.player.__dict__.pop(name, None)
+        for target, name in ((self.player.pool, "minimax"), (self.player.book, "lookup")):
+            if target is not None:
+                target.__dict__.pop(name, None)
+
+    def _wrap_book(self, book):
+        lookup = book.lookup
+
+        def measured_lookup(board, player_id):
+            start = time.perf_counter()
+            move = self.book_move = lookup(board, player_id)
+            if self.current is not None:
+                self.current.stage_times["book"] += time.perf_counter() - start
+            return move
+
+        book.lookup = measured_lookup
+
+    def _wrap_pool(self, pool):
+        minimax = pool.minimax
+
+        def measured_minimax(board, player_id, depth, *args, **kwargs):
+            stats = self.current
+            start = time.perf_counter()
+            result = minimax(board, player_id, depth, *args, **kwargs)
+            if stats is not None:
+                stats.stage_times["minimax"] += time.perf_counter() - start
+                stats.branch = "minimax"
+                if result is not None:
+                    stats.depth = max(stats.depth, depth)
+            return result
+
+        pool.minimax = measured_minimax
+
+    def _watch_board(self, board):
+        """Cuenta las comprobaciones de conexión del tablero y de sus copias"""
+
+        check_connection = board.check_connection
+        clone = board.clone
+
+        def counted_check_connection(player_id):
+            # Las copias no se dejan de observar: fuera de `play` no cuentan
+            if self.current is not None:
+                self.current.connection_checks += 1
+            return check_connection(player_id)
+
+        def watched_clone():
+            cloned = clone()
+            self._watch_board(cloned)
+            return cloned
+
+        board.check_connection = counted_check_connection
+        board.clone = watched_clone
+
+    @staticmethod
+    def _unwatch_board(board):
+        board.__dict__.pop("check_connection", None)
+        board.__dict__.pop("clone", None)
+
+    def _finish(self, stats: PlayStats):
+        """Guarda la jugada, la suma a las métricas y exporta si toca"""
+
+        self.last = stats
+        self.recent.append(stats)
+        totals = self.totals
+        totals["plays"] = totals.get("plays", 0) + 1
+        for name in ("nodes", "cutoffs", "heuristic_calls", "connection_checks", "playouts", "total_time"):
+            totals[name] = totals.get(name, 0) + getattr(stats, name)
+        branches = totals.setdefault("branches", {})
+        branches[stats.branch] = branches.get(stats.branch, 0) + 1
+        stage_times = totals.setdefault("stage_times", dict.fromkeys(STAGES, 0.0))
+        for stage, seconds in stats.stage_times.items():
+            stage_times[stage] += seconds
+        totals["max_depth"] = max(totals.get("max_depth", 0), stats.depth)
+
+        if self.export is not None and time.perf_counter() - self.last_export >= self.interval:
+            self.export_metrics()
+
+    def metrics(self) -> dict:
+        """Métricas acumuladas desde la última exportación, con tasas por segundo"""
+
+        metrics = dict(self.totals, player_id=self.player.player_id, timestamp=time.time())
+        seconds = metrics.get("total_time", 0)
+        if seconds:
+            metrics["nodes_per_second"] = metrics["nodes"] / seconds
+            metrics["playouts_per_second"] = metrics["playouts"] / seconds
+        return metrics
+
+    def export_metrics(self):
+        """Envía las métricas acumuladas a `export` y empieza un nuevo período"""
+
+        metrics = self.metrics()
+        if callable(self.export):
+            self.export(metrics)
+        elif self.export is not None:
+            with open(self.export, "a", encoding="utf-8") as output:
+                output.write(json.dumps(metrics) + "\n")
+        self.totals = {}
+        self.last_export = time.perf_counter()
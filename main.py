@@ -1,6 +1,11 @@
 import os
+import time
 from board import HexBoard
 from player import AI_Player
+from records import GameWriter
+
+GAMES_FILE = "partidas.hexr"  # Registro binario de las partidas jugadas
+BOOK_FILE = "opening_book.bin"  # Libro de aperturas generado con book.py
 
 
 def clear_console():
@@ -15,6 +20,7 @@ def main():
         size = 5
 
     board = HexBoard(size)
+    book = BOOK_FILE if os.path.exists(BOOK_FILE) else None
 
     # Game mode:
     # 1: Dos jugadores humanos
@@ -27,12 +33,12 @@ def main():
         ai_player = 2 if human_player == 1 else 1
         player_objects = {
             human_player: None,  # Humano: Él hace su propio input
-           ai_player: AI_Player(ai_player)
+           ai_player: AI_Player(ai_player, book=book)
         }
     elif mode == "3":
         player_objects = {
-            1: AI_Player(1),  # IA
-            2: AI_Player(2)   # IA
+            1: AI_Player(1, book=book),  # IA
+            2: AI_Player(2, book=book)   # IA
         }
     else:
         player_objects = {
@@ -41,17 +47,19 @@ def main():
         }
 
     current_player = 1
+    times = []  # Tiempo de cada jugada, para el registro de la partida
+    turn_start = time.perf_counter()
+    winner = 0
     while True:
         # clear_console()
         board.print_board()
 
-        if AI_Player.check_connection(board, 1)[0]:
-            print("¡El jugador 1 (🔵) ha ganado!")
-            print(AI_Player.check_connection(board, 1)[1])
-            break
-        if AI_Player.check_connection(board, 2)[0]:
-            print("¡El jugador 2 (🔴) ha ganado!")
-            print(AI_Player.check_connection(board, 2)[1])
+        # Solo el jugador que acaba de mover puede haber ganado
+        last_player = 3 - current_player
+        if board.check_connection(last_player):
+            print(f"¡El jugador {last_player} ({'🔵' if last_player == 1 else '🔴'}) ha ganado!")
+            print(AI_Player.check_connection(board, last_player)[1])
+            winner = last_player
             break
         if not board.get_possible_moves():
             print("Empate. No hay más movimientos disponibles.")
@@ -83,8 +91,18 @@ def main():
                 continue
             board.place_piece(move[0], move[1], current_player)
 
+        times.append(time.perf_counter() - turn_start)
+        turn_start = time.perf_counter()
         # Cambiar turno
         current_player = 2 if current_player == 1 else 1
 
+    for player in player_objects.values():
+        if player is not None:
+            player.close()
+
+    if input(f"¿Guardar la partida en {GAMES_FILE}? (s/n): ").strip().lower() == "s":
+        with GameWriter(GAMES_FILE) as writer:
+            writer.write_board(board, winner, times)
+
 if __name__ == "__main__":
     main()
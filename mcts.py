@@ -0,0 +1,271 @@
+import math
+import time
+from numpy import random
+from board import HexBoard, neighbor_table
+import patterns
+
+
+class MCTSNode:
+    """
+    Nodo del árbol: la jugada que lo produjo, quién la hizo y sus estadísticas.
+    Las jugadas sin expandir no se guardan: se recorre la permutación de
+    casillas compartida por el árbol desde una posición al azar del nodo
+    """
+
+    __slots__ = (
+        "move", "player", "parent", "children", "untried", "offset", "scanned",
+        "visits", "wins", "rave_visits", "rave_wins"
+    )
+
+    def __init__(
+        self, move: int, player: int, parent: "MCTSNode", untried: list[int] = None,
+        offset: int = 0
+        ):
+        self.move = move  # Índice plano de la casilla jugada (None en la raíz)
+        self.player = player  # Jugador que hizo la jugada del nodo
+        self.parent = parent
+        self.children = {}  # Índice plano -> MCTSNode
+        # Jugadas sin expandir explícitas (solo una raíz nueva, que puede
+        # limitarlas); None: se toman de la permutación del árbol
+        self.untried = untried
+        self.offset = offset  # Posición de la permutación donde empieza el nodo
+        self.scanned = 0  # Posiciones de la permutación ya expandidas u ocupadas
+        self.visits = 0
+        self.wins = 0  # Victorias de `player` en las simulaciones que pasaron por el nodo
+        self.rave_visits = 0  # Simulaciones en que `player` ocupó `move` en algún momento (AMAF)
+        self.rave_wins = 0
+
+
+class MCTS:
+    """
+    Búsqueda Monte Carlo en árbol con selección UCB1 + RAVE. Las simulaciones
+    llenan el tablero (con `policy` "patterns", salvando puentes; con
+    "random", al azar) y revisan el ganador una sola vez al final (en Hex no
+    hay empates). El árbol se reutiliza entre jugadas consecutivas
+    """
+
+    def __init__(
+        self, player_id: int, exploration: float = 0.4,
+        rave_equivalence: float = 500, max_nodes: int = 500_000, policy: str = "patterns"
+        ):
+        self.player_id = player_id
+        self.exploration = exploration  # Constante de exploración de UCB1
+        self.rave_equivalence = rave_equivalence  # Visitas a partir de las que RAVE pesa la mitad
+        self.max_nodes = max_nodes  # Límite de nodos del árbol
+        self.policy = policy  # Política de las simulaciones: "patterns" o "random"
+        self.root = None
+        self.root_cells = None  # Casillas de la posición de la raíz
+        self.nodes = 0
+        self.order = []  # Permutación al azar de las casillas vacías de la raíz del árbol
+        self.playouts = 0  # Simulaciones de la última búsqueda
+        self.deadline = None  # Límite de la búsqueda en curso (se puede adelantar desde otro hilo)
+
+    def search(
+        self, board: HexBoard, iterations: int | float = 1000, deadline: float = None,
+        moves: list[tuple[int, int]] = None
+        ) -> tuple[int, int]:
+        """
+        Ejecuta `iterations` simulaciones (o hasta `deadline`) desde la posición
+        del tablero y devuelve la jugada más visitada de la raíz. `moves`
+        limita las jugadas de una raíz nueva
+        """
+
+        size = board.size
+        cells = bytearray(value for row in board.board for value in row)
+        root = self._reuse_root(
+            cells, None if moves is None else [row * size + col for row, col in moves]
+        )
+        base_empty = [node for node, value in enumerate(cells) if not value]
+        # Códigos de los anillos en la raíz; cada iteración los copia y los actualiza
+        codes = patterns.neighborhood_codes(cells, size) if self.policy == "patterns" else None
+
+        self.playouts = 0
+        self.deadline = deadline
+        while self.playouts < iterations:
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                break
+            self._iterate(root, cells[:], base_empty, size, codes)
+            self.playouts += 1
+
+        if not root.children:
+            # Sin simulaciones: la primera jugada permitida en la raíz
+            if moves:
+                return tuple(moves[0])
+            return divmod(root.untried[0] if root.untried else base_empty[0], size)
+        best = max(root.children.values(), key=lambda child: child.visits)
+        return divmod(best.move, size)
+
+    def root_statistics(self) -> dict[int, tuple[int, int]]:
+        """Visitas y victorias de cada jugada de la raíz (por índice plano)"""
+
+        return {
+            move: (child.visits, child.wins) for move, child in self.root.children.items()
+        }
+
+    def _reuse_root(self, cells: bytearray, moves: list[int] = None) -> MCTSNode:
+        """
+        Busca en el árbol anterior el nodo que corresponde a la posición actual
+        (las jugadas hechas desde entonces); si no existe crea una raíz nueva
+        con las jugadas `moves` (todas las casillas vacías por defecto)
+        """
+
+        node = None
+        if self.root is not None and len(self.root_cells) == len(cells):
+            new_moves = set()
+            for index, (old, new) in enumerate(zip(self.root_cells, cells)):
+                if old and old != new:
+                    new_moves = None
+                    break
+                if new and not old:
+                    new_moves.add(index)
+
+            node = self.root
+            while new_moves:
+                node = next((
+                    child for move, child in node.children.items()
+                    if move in new_moves and cells[move] == child.player
+                ), None)
+                if node is None:
+                    break
+                new_moves.discard(node.move)
+            if new_moves is None or (node is not None and node.player == self.player_id):
+                node = None
+
+        if node is None:
+            if moves is None:
+                moves = [index for index, value in enumerate(cells) if not value]
+            untried = list(moves)
+            random.shuffle(untried)
+            node = MCTSNode(None, 3 - self.player_id, None, untried)
+            self.order = [index for index, value in enumerate(cells) if not value]
+            random.shuffle(self.order)
+            self.nodes = 1
+        else:
+            self.nodes = MCTS.count_nodes(node)
+        node.parent = None
+        self.root = node
+        self.root_cells = bytes(cells)
+        return node
+
+    @staticmethod
+    def count_nodes(root: MCTSNode) -> int:
+        """Cantidad de nodos del subárbol"""
+
+        count, stack = 0, [root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
+
+    def _iterate(
+        self, root: MCTSNode, cells: bytearray, base_empty: list[int], size: int,
+        codes: list[int] = None
+        ):
+        """Selección, expansión, simulación y retropropagación de una iteración"""
+
+        node = root
+        path = [root]
+        move = self._next_untried(node, cells)
+        while move < 0 and node.children:
+            node = self._select_child(node)
+            cells[node.move] = node.player
+            path.append(node)
+            move = self._next_untried(node, cells)
+
+        if move >= 0 and self.nodes < self.max_nodes:
+            if node.untried is not None:
+                node.untried.pop()
+            else:
+                node.scanned += 1
+            player = 3 - node.player
+            cells[move] = player
+            child = MCTSNode(move, player, node, offset=random.randint(len(self.order)))
+            node.children[move] = child
+            self.nodes += 1
+            node = child
+            path.append(node)
+
+        if codes is None:
+            winner = self._playout(cells, base_empty, 3 - node.player, size)
+        else:
+            codes = codes[:]
+            for tree_node in path[1:]:
+                patterns.place(codes, tree_node.move, tree_node.player, size)
+            empty = [index for index in base_empty if not cells[index]]
+            last = -1 if node.move is None else node.move
+            patterns.playout(cells, codes, empty, 3 - node.player, last, size)
+            winner = MCTS.winner(cells, size)
+
+        for node in path:
+            node.visits += 1
+            if node.player == winner:
+                node.wins += 1
+            for move, child in node.children.items():
+                if cells[move] == child.player:
+                    child.rave_visits += 1
+                    if child.player == winner:
+                        child.rave_wins += 1
+
+    def _next_untried(self, node: MCTSNode, cells: bytearray) -> int:
+        """
+        Siguiente jugada sin expandir del nodo (-1 si no quedan), sin
+        consumirla. `cells` es la posición del nodo: las casillas ocupadas
+        lo seguirán estando en él, así que se saltan para siempre
+        """
+
+        if node.untried is not None:
+            return node.untried[-1] if node.untried else -1
+        order = self.order
+        count = len(order)
+        while node.scanned < count:
+            move = order[(node.offset + node.scanned) % count]
+            if not cells[move]:
+                return move
+            node.scanned += 1
+        return -1
+
+    def _select_child(self, node: MCTSNode) -> MCTSNode:
+        """Escoge el hijo con mayor valor UCB1 combinado con su estimado RAVE"""
+
+        log_visits = math.log(node.visits)
+        best, best_value = None, -1.0
+        for child in node.children.values():
+            beta = math.sqrt(self.rave_equivalence / (3 * child.visits + self.rave_equivalence))
+            value = (1 - beta) * child.wins / child.visits
+            if child.rave_visits:
+                value += beta * child.rave_wins / child.rave_visits
+            value += self.exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    @staticmethod
+    def _playout(cells: bytearray, base_empty: list[int], to_move: int, size: int) -> int:
+        """Llena al azar las casillas vacías alternando turnos y devuelve el ganador"""
+
+        empty = [index for index in base_empty if not cells[index]]
+        order = random.permutation(len(empty)).tolist()
+        other = 3 - to_move
+        for turn, position in enumerate(order):
+            cells[empty[position]] = other if turn & 1 else to_move
+        return MCTS.winner(cells, size)
+
+    @staticmethod
+    def winner(cells: bytearray, size: int) -> int:
+        """Ganador de un tablero lleno: 1 si une izquierda y derecha, si no 2"""
+
+        neighbors = neighbor_table(size)
+        stack = [row * size for row in range(size) if cells[row * size] == 1]
+        seen = bytearray(size * size)
+        for node in stack:
+            seen[node] = 1
+        while stack:
+            node = stack.pop()
+            if node % size == size - 1:
+                return 1
+            for neighbor in neighbors[node]:
+                if cells[neighbor] == 1 and not seen[neighbor]:
+                    seen[neighbor] = 1
+                    stack.append(neighbor)
+        return 2
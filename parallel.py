@@ -0,0 +1,169 @@
+import math
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from numpy import random
+from board import HexBoard, CompactHexBoard
+from mcts import MCTS
+
+# Estado de cada proceso trabajador
+_shared_alpha = None  # Mejor valor encontrado en la raíz por cualquier proceso (multiprocessing.Value)
+# Jugadores de IA por (id, tamaño de la tabla, opciones de búsqueda), para
+# conservar su tabla de transposición entre búsquedas
+_players = {}
+
+
+def _init_worker(shared_alpha):
+    global _shared_alpha
+    _shared_alpha = shared_alpha
+
+
+def _worker_player(player_id: int, tt_megabytes: float, options: tuple = ()):
+    from player import AI_Player  # Importado aquí para evitar el ciclo con player.py
+
+    key = (player_id, tt_megabytes, options)
+    if key not in _players:
+        _players[key] = AI_Player(player_id, tt_megabytes=tt_megabytes, **dict(options))
+    return _players[key]
+
+
+def _minimax_worker(
+    data: bytes, player_id: int, moves: list[tuple[int, int]], depth: int,
+    time_budget: float, tt_megabytes: float, options: tuple = ()
+    ) -> list[tuple[tuple[int, int], float, bool]]:
+    """
+    Evalúa con Minimax un grupo de jugadas de la raíz. Antes de cada jugada
+    toma la cota alfa compartida y al terminar la actualiza. Devuelve
+    (jugada, valor, exacto): un valor no es exacto si la búsqueda se cortó
+    contra la cota compartida. Las jugadas sin terminar a tiempo se omiten
+    """
+    from player import SearchTimeout
+
+    board = CompactHexBoard.from_bytes(data)
+    ai = _worker_player(player_id, tt_megabytes, options)
+    ai.new_search()
+    ai.deadline = None if time_budget is None else time.perf_counter() + time_budget
+    results = []
+    try:
+        for move in moves:
+            alpha = _shared_alpha.value
+            board.push(move, player_id)
+            score = ai.minimax(board, depth - 1, False, alpha=alpha, ply=1)[1]
+            board.pop()
+            results.append((move, score, score > alpha))
+            with _shared_alpha.get_lock():
+                if score > _shared_alpha.value:
+                    _shared_alpha.value = score
+    except SearchTimeout:
+        pass
+    finally:
+        ai.deadline = None
+    return results
+
+
+def _mcts_worker(
+    data: bytes, player_id: int, iterations: int | float, time_budget: float, seed: int,
+    policy: str = "patterns", moves: list[tuple[int, int]] = None
+    ) -> tuple[dict[int, tuple[int, int]], int]:
+    """
+    Ejecuta una búsqueda MCTS independiente (limitada en la raíz a `moves`) y
+    devuelve las estadísticas de la raíz y las simulaciones hechas
+    """
+
+    random.seed(seed)
+    board = CompactHexBoard.from_bytes(data)
+    engine = MCTS(player_id, policy=policy)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    engine.search(board, iterations, deadline, moves)
+    return engine.root_statistics(), engine.playouts
+
+
+class ParallelSearch:
+    """
+    Búsqueda paralela en la raíz sobre un grupo de procesos: las jugadas de
+    la raíz se reparten entre los procesos (Minimax con cota alfa compartida)
+    o cada proceso hace su propio árbol MCTS y se suman sus estadísticas.
+    Los tableros viajan serializados con `HexBoard.to_bytes`; `options` son
+    los argumentos de `AI_Player` de los jugadores de los procesos
+    """
+
+    def __init__(self, workers: int = None, tt_megabytes: float = 16, options: dict = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.tt_megabytes = tt_megabytes  # Tamaño de la tabla de cada proceso
+        self.options = tuple(sorted((options or {}).items()))
+        self.shared_alpha = multiprocessing.Value("d", -math.inf)
+        self.executor = ProcessPoolExecutor(
+            self.workers, initializer=_init_worker, initargs=(self.shared_alpha,)
+        )
+
+    def minimax(
+        self, board: HexBoard, player_id: int, depth: int, deadline: float = None,
+        moves: list[tuple[int, int]] = None
+        ) -> tuple[tuple[int, int], float] | None:
+        """
+        Minimax en paralelo desde la raíz sobre `moves` (todas las casillas
+        vacías por defecto). Devuelve (jugada, valor) o None si alguna jugada
+        de la raíz no se terminó antes de `deadline`
+        """
+
+        moves = board.get_possible_moves() if moves is None else list(moves)
+        moves.sort(key=lambda move: (
+            abs(move[0] - board.size // 2) + abs(move[1] - board.size // 2)
+        ))
+        # Reparto circular para que cada proceso empiece por jugadas prometedoras
+        groups = [moves[index::self.workers] for index in range(self.workers)]
+        self.shared_alpha.value = -math.inf
+
+        data = board.to_bytes()
+        time_budget = None if deadline is None else deadline - time.perf_counter()
+        futures = [
+            self.executor.submit(
+                _minimax_worker, data, player_id, group, depth,
+                time_budget, self.tt_megabytes, self.options
+            )
+            for group in groups if group
+        ]
+        results = [result for future in futures for result in future.result()]
+        if len(results) < len(moves):
+            return None
+
+        exact = [result for result in results if result[2]] or results
+        move, score, _ = max(exact, key=lambda result: result[1])
+        return move, score
+
+    def monte_carlo(
+        self, board: HexBoard, player_id: int, iterations: int | float,
+        deadline: float = None, policy: str = "patterns",
+        moves: list[tuple[int, int]] = None
+        ) -> tuple[tuple[int, int], int]:
+        """
+        MCTS paralelo en la raíz: cada proceso hace `iterations` simulaciones
+        con su propia semilla (limitado a `moves` en la raíz) y se escoge la
+        jugada con más visitas sumadas. Devuelve (jugada, simulaciones de
+        todos los procesos); si ninguno alcanzó a simular, la primera de `moves`
+        """
+
+        data = board.to_bytes()
+        time_budget = None if deadline is None else deadline - time.perf_counter()
+        futures = [
+            self.executor.submit(
+                _mcts_worker, data, player_id, iterations, time_budget,
+                random.randint(2 ** 31), policy, moves
+            )
+            for _ in range(self.workers)
+        ]
+        visits, playouts = {}, 0
+        for future in futures:
+            statistics, worker_playouts = future.result()
+            playouts += worker_playouts
+            for move, (move_visits, _) in statistics.items():
+                visits[move] = visits.get(move, 0) + move_visits
+        if not visits:
+            return (moves or board.get_possible_moves())[0], playouts
+        return divmod(max(visits, key=visits.get), board.size), playouts
+
+    def shutdown(self):
+        """Termina los procesos trabajadores"""
+
+        self.executor.shutdown()
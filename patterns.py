@@ -0,0 +1,120 @@
+"""
+Política de simulación con patrones para Monte Carlo. En lugar de llenar el
+tablero en orden uniforme, cada jugada de la simulación mira el anillo de
+la última jugada del oponente (código en base 3 de sus 6 vecinas, como en
+`inferior`, con los bordes como fichas de su dueño):
+
+- Salvar un puente: si la jugada entró en un puente propio (dos fichas o
+  ficha y borde con dos casillas comunes vacías), se responde en la otra.
+- Si no, una casilla vacía al azar.
+
+Los códigos de todas las casillas se mantienen al jugar (6 sumas por
+jugada) y las respuestas salen de una tabla precalculada por código, así
+que cada paso de la simulación cuesta O(1).
+
+Solo se usa el patrón de salvar puentes. Se probaron patrones locales de 6
+vecinas (jugar junto a la última jugada la casilla vacía que une dos cadenas
+propias y/o separa dos del oponente) y en 7x7 debilitaron al árbol, así que
+no se incluyen.
+"""
+from functools import lru_cache
+from numpy import random
+from inferior import ring_table, POWERS
+
+
+def _bridge_saves(code: int, player_id: int) -> tuple[int, ...]:
+    """
+    Posiciones del anillo que salvan un puente de `player_id`: una casilla
+    vacía entre dos vecinas suyas, que con la casilla central eran las dos
+    casillas comunes del puente
+    """
+
+    values = [(code // power) % 3 for power in POWERS]
+    return tuple(
+        index for index in range(6)
+        if not values[index] and values[index - 1] == player_id == values[(index + 1) % 6]
+    )
+
+
+# Jugador -> código del anillo de la última jugada -> posiciones que responden
+SAVES = {
+    player_id: tuple(_bridge_saves(code, player_id) for code in range(3 ** 6))
+    for player_id in (1, 2)
+}
+
+
+@lru_cache(maxsize=None)
+def update_table(size: int) -> tuple[tuple[tuple[tuple[int, int], ...], ...], ...]:
+    """
+    Por casilla y jugador (índices 1 y 2): (vecina, incremento de su código)
+    al jugar en la casilla. La casilla ocupa en el anillo de su vecina la
+    posición opuesta (índice + 3)
+    """
+
+    table = []
+    for ring, _ in ring_table(size):
+        neighbors = [
+            (neighbor, POWERS[(index + 3) % 6])
+            for index, neighbor in enumerate(ring) if neighbor >= 0
+        ]
+        table.append((
+            (),
+            tuple((neighbor, power) for neighbor, power in neighbors),
+            tuple((neighbor, 2 * power) for neighbor, power in neighbors),
+        ))
+    return tuple(table)
+
+
+def neighborhood_codes(cells: bytearray, size: int) -> list[int]:
+    """Código del anillo de cada casilla del tablero"""
+
+    codes = []
+    for ring, code in ring_table(size):
+        for power, neighbor in zip(POWERS, ring):
+            if neighbor >= 0:
+                code += cells[neighbor] * power
+        codes.append(code)
+    return codes
+
+
+def place(codes: list[int], node: int, player_id: int, size: int):
+    """Actualiza los códigos de las vecinas tras jugar `player_id` en `node`"""
+
+    for neighbor, increment in update_table(size)[node][player_id]:
+        codes[neighbor] += increment
+
+
+def playout(
+    cells: bytearray, codes: list[int], empty: list[int], to_move: int, last: int,
+    size: int
+    ):
+    """
+    Llena las casillas vacías de `empty` alternando turnos desde `to_move`,
+    respondiendo con los patrones a cada jugada (`last` es la última jugada
+    antes de la simulación, -1 si no hay). Modifica `cells` y `codes`
+    """
+
+    rings = ring_table(size)
+    updates = update_table(size)
+    saves = SAVES
+    order = [empty[position] for position in random.permutation(len(empty)).tolist()]
+    next_random = 0
+    player_id = to_move
+    for _ in range(len(empty)):
+        move = -1
+        if last >= 0:
+            options = saves[player_id][codes[last]]
+            if options:
+                move = rings[last][0][options[0]]
+        if move < 0:
+            # Siguiente casilla del orden al azar que siga vacía
+            move = order[next_random]
+            while cells[move]:
+                next_random += 1
+                move = order[next_random]
+            next_random += 1
+        cells[move] = player_id
+        for neighbor, increment in updates[move][player_id]:
+            codes[neighbor] += increment
+        last = move
+        player_id = 3 - player_id
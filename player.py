@@ -1,6 +1,19 @@
-from numpy import random
+import threading
+import time
 from board import HexBoard #importar aqui el archivo del tablero a usar con la definción de la clase `HexBoard`
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND, SIDE_TO_MOVE_KEY
+from mcts import MCTS
+from parallel import ParallelSearch
+from heuristics import DistanceMaps, two_distance
+from virtual import connecting_move, virtual_connection
+from inferior import candidate_moves, relevant_zone
+from solver import ProofNumberSolver, WIN
+from scheduler import CostModel, CALIBRATION_SHARE, MONTE_CARLO, SOLVER_SHARE, UNTIMED_BUDGET
+import batch_playouts
+from book import OpeningBook
+from instrumentation import Instrumentation
 from collections import deque
+from functools import lru_cache
 from abc import ABC, abstractmethod
 
 class Player(ABC):
@@ -11,13 +24,131 @@ class Player(ABC):
     def play(self, board: HexBoard) -> tuple:
         pass  
 
+EVAL_CACHE_SIZE = 1 << 18  # Máximo de evaluaciones guardadas antes de vaciar la caché
+ZONE_SLACK = 1  # Fichas de más permitidas a los caminos de la zona relevante
+# Profundidad máxima de Minimax: cada nivel es un marco de Python, así que se
+# mantiene muy por debajo del límite de recursión en cualquier tamaño de tablero
+MAX_SEARCH_DEPTH = 64
+KILLER_SLOTS = 2  # Jugadas asesinas guardadas por nivel del árbol
+SOLVER_THRESHOLD = 16  # Casillas vacías a partir de las que se intenta resolver la posición
+SOLVER_NODES = 2000  # Nodos máximos del solucionador sin límite de tiempo
+PONDER_SLICE = 0.05  # Segundos de cada tramo de búsqueda en el tiempo del oponente
+
+
+@lru_cache(maxsize=None)
+def center_scores(size: int) -> dict[tuple[int, int], float]:
+    """
+    Valor inicial de cada casilla en la tabla de historia: menos la distancia
+    al centro, escalada para que quede en (-1, 0] y solo desempate
+    """
+    
+    return {
+        (row, col): -(abs(row - size // 2) + abs(col - size // 2)) / (2 * size)
+        for row in range(size) for col in range(size)
+    }
+
+
+class SearchTimeout(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el tiempo de la jugada"""
+
+
 class AI_Player(Player):
-    def __init__(self, player_id):
+    def __init__(
+        self, player_id, time_limit=None, tt_megabytes=16, tt_replacement="depth", 
+        mc_engine="uct", workers=1, evaluator="distance", book=None,
+        move_filter="inferior", move_ordering="history", instrument=False,
+        metrics=None, metrics_interval=60.0, ponder=False,
+        solver_threshold=SOLVER_THRESHOLD, scheduler="cost", playout_policy="patterns"
+        ):
         super().__init__(player_id)
+        self.time_limit = time_limit  # Segundos por jugada (None: sin límite, profundidad fija)
+        self.mc_engine = mc_engine  # Motor de Monte Carlo: "uct" (árbol) o "batch" (NumPy en lote)
+        # Simulaciones de "uct": "patterns" (salvan puentes) o "random"
+        self.playout_policy = playout_policy
+        self.evaluator = evaluator  # Evaluación de hojas: "distance" (camino mínimo) o "two_distance"
+        # Generación de jugadas: "all" (todas las vacías), "inferior" (sin casillas 
+        # muertas, capturadas ni dominadas) o "zone" (además, solo la zona relevante)
+        self.move_filter = move_filter
+        # Orden de jugadas en Minimax: "center" (distancia al centro), "history" 
+        # (jugada de la tabla, asesinas y tabla de historia) o "path" (además, 
+        # primero las casillas de los caminos mínimos de ambos jugadores)
+        self.move_ordering = move_ordering
+        self.killers = {}  # Nivel del árbol -> jugadas que produjeron cortes
+        self.history = {}  # Jugador -> {jugada: valor}; crece con los cortes
+        self.history_size = None  # Tamaño del tablero de la tabla de historia
+        self.distances = DistanceMaps()  # Mapas de distancia reparados jugada a jugada
+        self.eval_cache = {}  # Hash del tablero -> valor de la heurística
+        self.vc_cache = {}  # Hash del tablero -> jugador conectado virtualmente (0: ninguno)
+        self.deadline = None  # Instante (time.perf_counter) en que se debe cortar la búsqueda
+        # Tabla de transposición compartida entre jugadas (valores desde la perspectiva de player_id)
+        self.table = TranspositionTable(tt_megabytes, tt_replacement)
+        self.mcts = MCTS(player_id, policy=playout_policy)  # Árbol de Monte Carlo reutilizado entre jugadas
+        # Procesos para la búsqueda paralela en la raíz (None: un solo proceso)
+        self.pool = None
+        if workers > 1:
+            self.pool = ParallelSearch(workers, tt_megabytes, {
+                "tt_replacement": tt_replacement, "evaluator": evaluator,
+                "move_filter": move_filter, "move_ordering": move_ordering
+            })
+        # Libro de aperturas (ruta o OpeningBook) consultado antes de buscar
+        self.book = OpeningBook(book) if isinstance(book, str) else book
+        self.playouts = 0  # Simulaciones de la última búsqueda Monte Carlo
+        self.nodes = 0  # Nodos visitados por Minimax (acumulado)
+        # Elección de la búsqueda: "cost" (según el ritmo medido del motor y el 
+        # tiempo disponible) o "phase" (umbrales fijos por fase y tamaño)
+        self.scheduler = scheduler
+        self.cost_model = CostModel(self)
+        # Con a lo sumo `solver_threshold` casillas vacías se intenta resolver el 
+        # final con números de prueba antes de buscar (0: nunca)
+        self.solver_threshold = solver_threshold
+        self.solver = ProofNumberSolver(tt_megabytes)
+        # Búsqueda en el tiempo del oponente: tras cada jugada un hilo predice la
+        # respuesta y busca la jugada para la posición resultante
+        self.ponder_mode = ponder
+        self.ponder_thread = None
+        self.ponder_stop = threading.Event()
+        self.ponder_base = None  # Hash de la posición tras la jugada de la IA
+        self.ponder_board = None  # Posición prevista (tras la respuesta prevista)
+        self.ponder_move = None  # Mejor jugada encontrada para la posición prevista
+        self.pondered = 0.0  # Segundos buscados en la posición prevista (inf: decisión final)
+        # Estadísticas por jugada (None: sin instrumentar). `metrics` es una función
+        # o la ruta de un archivo JSON lines que recibe las métricas cada `metrics_interval` s
+        self.instrumentation = None
+        if instrument or metrics is not None:
+            self.instrumentation = Instrumentation(self, metrics, metrics_interval)
         
     def play(self, board: HexBoard) -> tuple[int, int]:
         """Calcula y devuelve la jugada de la PC"""
         
+        start = time.perf_counter()
+        self.stop_pondering()
+        move = self.pondered_move(board)
+        if move is None:
+            move = self.timed_select_move(board, start)
+        if self.ponder_mode:
+            self.start_pondering(board, move)
+        return move
+    
+    def timed_select_move(self, board: HexBoard, start: float) -> tuple[int, int]:
+        """`select_move` con el límite de tiempo contado desde `start`"""
+        
+        if self.time_limit is None:
+            return self.select_move(board)
+        
+        self.deadline = start + self.time_limit
+        try:
+            return self.select_move(board)
+        finally:
+            self.deadline = None
+    
+    def select_move(self, board: HexBoard) -> tuple[int, int]:
+        """Escoge la estrategia según la fase del juego y devuelve la jugada"""
+        
+        if self.book is not None:
+            move = self.book.lookup(board, self.player_id)
+            if move is not None and not board.board[move[0]][move[1]]:
+                return move
+        
         n = board.size
         if n % 2 and not board.board[n // 2][n // 2]:
             return (n // 2, n // 2)
@@ -32,7 +163,15 @@ class AI_Player(Player):
         if blocking_move:
             return blocking_move
         
-        empty_cells = sum(row.count(0) for row in board.board)
+        empty_cells = board.empty_count()
+        if empty_cells <= self.solver_threshold:
+            solved_move = self.solve_endgame(board)
+            if solved_move:
+                return solved_move
+        
+        if self.scheduler == "cost":
+            return self.scheduled_search(board)
+        
         game_phase = empty_cells / (n ** 2)
         
         if n > 15 and game_phase > 0.50:
@@ -41,13 +180,251 @@ class AI_Player(Player):
             return self.monte_carlo_method(board, self.player_id)
         elif n <= 9 and game_phase > 0.85:
             return self.monte_carlo_method(board, self.player_id)
+        elif self.deadline is not None:
+            return self.iterative_deepening(board)
         else:
             depth = self.calculate_depth_limit(board)
+            self.new_search()
+            if self.pool is not None:
+                return self.pool.minimax(
+                    board, self.player_id, depth, moves=self.candidate_moves(board, self.player_id)
+                )[0]
             return self.minimax(board, depth)[0]
+    
+    def scheduled_search(self, board: HexBoard) -> tuple[int, int]:
+        """
+        Minimax o Monte Carlo según el costo estimado de cada uno en la 
+        posición y el tiempo que queda de la jugada (sin límite de tiempo, 
+        `UNTIMED_BUDGET` segundos estimados fijan la profundidad o las simulaciones)
+        """
+        
+        if self.deadline is not None:
+            # Una calibración pendiente usa solo parte del tiempo de la jugada
+            self.cost_model.throughput(board.size, self.remaining_time() * CALIBRATION_SHARE)
+        plan = self.cost_model.plan(
+            board, len(self.candidate_moves(board, self.player_id)), self.remaining_time()
+        )
+        if plan.strategy == MONTE_CARLO:
+            return self.monte_carlo_method(board, self.player_id, plan.playouts, plan.batch_size)
+        elif self.deadline is not None:
+            return self.iterative_deepening(board)
+        
+        self.new_search()
+        if self.pool is not None:
+            return self.pool.minimax(
+                board, self.player_id, plan.depth, moves=self.candidate_moves(board, self.player_id)
+            )[0]
+        return self.minimax(board, plan.depth)[0]
+    
+    def remaining_time(self) -> float:
+        """Segundos que quedan de la jugada (`UNTIMED_BUDGET` sin límite de tiempo)"""
+        
+        if self.deadline is None:
+            return UNTIMED_BUDGET
+        return max(0.0, self.deadline - time.perf_counter())
+    
+    def solve_endgame(self, board: HexBoard) -> tuple[int, int]:
+        """
+        Jugada ganadora demostrada por el solucionador de finales, o () si la
+        posición está perdida o no se resolvió a tiempo (con límite de tiempo
+        usa a lo sumo la mitad del que queda, para que la búsqueda normal 
+        tenga con qué responder)
+        """
+        
+        deadline = None
+        if self.deadline is not None:
+            deadline = time.perf_counter() + self.remaining_time() * SOLVER_SHARE
+        result, move = self.solver.solve(board, self.player_id, deadline, SOLVER_NODES)
+        return move if result == WIN else ()
+    
+    def iterative_deepening(self, board: HexBoard) -> tuple[int, int]:
+        """
+        Ejecuta Minimax con profundidad creciente hasta que se agota el tiempo 
+        y devuelve la mejor jugada de la última profundidad completada
+        """
+        
+        self.new_search()
+        search_board = board.clone()  # Una búsqueda interrumpida deja fichas sin deshacer
+        possible_moves = AI_Player.get_possible_moves(board)
+        best_move = min(possible_moves, key=lambda move: (
+            abs(move[0]-board.size//2) + abs(move[1]-board.size//2)
+            ))
+        
+        start, start_nodes = time.perf_counter(), self.nodes
+        depth = 1
+        while depth <= min(len(possible_moves), MAX_SEARCH_DEPTH):
+            if self.pool is not None:
+                result = self.pool.minimax(
+                    board, self.player_id, depth, self.deadline,
+                    self.candidate_moves(board, self.player_id)
+                )
+                if result is None:
+                    break
+                move, score = result
+            else:
+                try:
+                    move, score = self.minimax(search_board, depth)
+                except SearchTimeout:
+                    break
+            if move:
+                best_move = move
+            if abs(score) >= 1000:
+                break  # Victoria o derrota demostrada
+            depth += 1
+        
+        self.cost_model.record_minimax(
+            board.size, self.nodes - start_nodes, time.perf_counter() - start
+        )
+        return best_move
+
+    def ponder(self, board: HexBoard, seconds: float) -> tuple[int, int]:
+        """
+        Un tramo de búsqueda en el tiempo del oponente: `board` es la posición
+        tras la jugada de la IA. La primera vez predice la respuesta del 
+        oponente; cada tramo busca durante `seconds` la jugada para la 
+        posición prevista, reutilizando la tabla de transposición y el árbol 
+        de Monte Carlo entre tramos. Devuelve la respuesta prevista
+        """
+        
+        if self.ponder_base != board.hash:
+            self.ponder_base = board.hash
+            self.ponder_board, self.ponder_move, self.pondered = None, None, 0.0
+            reply = self.predict_reply(board)
+            if reply:
+                self.ponder_board = board.clone()
+                self.ponder_board.push(reply, 3 - self.player_id)
+        if self.ponder_board is None or self.pondered == float('inf'):
+            return ()
+        
+        start = time.perf_counter()
+        self.deadline = start + seconds
+        try:
+            # Sin pasar por la instrumentación de la instancia: no es una jugada
+            self.ponder_move = type(self).select_move(self, self.ponder_board)
+            # Si terminó antes de tiempo la decisión ya no cambia con más búsqueda
+            finished = time.perf_counter() < self.deadline
+        finally:
+            self.deadline = None
+        self.pondered = float('inf') if finished else self.pondered + time.perf_counter() - start
+        row, col = self.ponder_board.history[-1][:2]
+        return row, col
+    
+    def predict_reply(self, board: HexBoard) -> tuple[int, int]:
+        """
+        Respuesta más probable del oponente en `board` (tras la jugada de la 
+        IA): la más visitada del árbol de Monte Carlo si la última búsqueda la
+        exploró, la guardada en la tabla de transposición para esa posición o
+        la de Minimax desde la posición del oponente en un tramo
+        """
+        
+        reply = self.table.best_move(board.hash ^ SIDE_TO_MOVE_KEY)
+        if reply and not board.board[reply[0]][reply[1]]:
+            return reply
+        
+        cells = bytearray(value for row in board.board for value in row)
+        root = self.mcts.root
+        if root is not None and len(self.mcts.root_cells) == len(cells):
+            changed = [
+                node for node, (old, new) in enumerate(zip(self.mcts.root_cells, cells))
+                if old != new
+            ]
+            if len(changed) == 1 and changed[0] in root.children:
+                replies = root.children[changed[0]].children
+                if replies:
+                    best = max(replies.values(), key=lambda child: child.visits)
+                    return divmod(best.move, board.size)
+        
+        self.deadline = time.perf_counter() + PONDER_SLICE
+        search_board = board.clone()
+        predicted = ()
+        try:
+            for depth in range(1, min(board.empty_count(), MAX_SEARCH_DEPTH) + 1):
+                predicted = self.minimax(search_board, depth, False)[0] or predicted
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+        return predicted
+    
+    def pondered_move(self, board: HexBoard) -> tuple[int, int] | None:
+        """
+        La jugada buscada en el tiempo del oponente si este respondió lo 
+        previsto y se buscó al menos `time_limit` segundos (o la decisión ya 
+        era final); None si hay que buscar
+        """
+        
+        predicted = self.ponder_board
+        if (
+            predicted is None or self.ponder_move is None
+            or predicted.size != board.size or predicted.hash != board.hash
+            or predicted.move_count != board.move_count
+            or board.board[self.ponder_move[0]][self.ponder_move[1]]
+        ):
+            return None
+        if self.pondered < (float('inf') if self.time_limit is None else self.time_limit):
+            return None
+        return self.ponder_move
+    
+    def start_pondering(self, board: HexBoard, move: tuple[int, int]):
+        """Empieza a buscar en un hilo en el tiempo del oponente, tras jugar `move`"""
+        
+        after = board.clone()
+        after.push(move, self.player_id)
+        if after.check_connection(self.player_id) or not after.empty_count():
+            return
+        
+        # La predicción anterior ya no sirve; se hace de nuevo en el hilo
+        self.ponder_base = self.ponder_board = self.ponder_move = None
+        self.pondered = 0.0
+        self.ponder_stop.clear()
+        
+        def loop():
+            while not self.ponder_stop.is_set() and self.pondered != float('inf'):
+                if not self.ponder(after, PONDER_SLICE):
+                    break
+        self.ponder_thread = threading.Thread(target=loop, daemon=True)
+        self.ponder_thread.start()
+    
+    def stop_pondering(self):
+        """Detiene la búsqueda en el tiempo del oponente (espera a que termine su tramo)"""
+        
+        if self.ponder_thread is not None:
+            self.ponder_stop.set()
+            self.ponder_thread.join()
+            self.ponder_thread = None
+
+    def interrupt(self):
+        """
+        Corta desde otro hilo la búsqueda con límite de tiempo en curso: 
+        adelanta el límite de Minimax, del solucionador y del árbol de Monte 
+        Carlo (un lote de simulaciones vectorizadas termina antes) y `play` 
+        devuelve la mejor jugada encontrada hasta ahora
+        """
+        
+        for engine in (self, self.solver, self.mcts):
+            if engine.deadline is not None:
+                engine.deadline = 0.0
+
+    def close(self):
+        """
+        Detiene la búsqueda en el tiempo del oponente y libera los procesos 
+        de la búsqueda paralela; se llama al terminar la partida
+        """
+
+        self.stop_pondering()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self) -> "AI_Player":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def minimax(
         self, board: HexBoard, depth: int, level_parity=True, 
-        alpha=-float('inf'), betha=float('inf')
+        alpha=-float('inf'), betha=float('inf'), ply=0
         ) -> tuple[tuple[int, int], int]:
         """
         Algoritmo Minimax para buscar en profundidad 
@@ -56,33 +433,53 @@ class AI_Player(Player):
         
         id = self.player_id if level_parity else 3 - self.player_id
         
-        if AI_Player.check_connection(board, 3 - self.player_id)[0]:
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+        
+        if board.check_connection(3 - self.player_id):
             return (), -1000
-        elif AI_Player.check_connection(board, self.player_id)[0]:
+        elif board.check_connection(self.player_id):
             return (), 1000
         
         if (not depth):
             return (), self.heuristic(board)
         
-        possible_moves = AI_Player.get_possible_moves(board)
-        possible_moves.sort(key=lambda move: (
-            abs(move[0]-board.size//2) + abs(move[1]-board.size//2)
-            ))
+        # Una conexión virtual no se puede cortar: la partida ya está decidida
+        winner = self.virtual_winner(board)
+        if winner:
+            return (), 1000 if winner == self.player_id else -1000
+        
+        key = board.hash if level_parity else board.hash ^ SIDE_TO_MOVE_KEY
+        entry = self.table.get(key)
+        hash_move = ()
+        if entry:
+            entry_depth, flag, hash_move, score = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return hash_move, score
+                if flag == LOWER_BOUND and score >= betha:
+                    return (), betha
+                if flag == UPPER_BOUND and score <= alpha:
+                    return (), alpha
+        
+        possible_moves = self.candidate_moves(board, id)
+        self.order_moves(board, possible_moves, id, depth, ply, hash_move)
         next_move = possible_moves[0]
         
         for row, col in possible_moves:
-            AI_Player.place_piece(board, row, col, id)
+            board.push((row, col), id)
             
             if level_parity:
                 move_eval = self.minimax(
-                    board, depth - 1, not level_parity, alpha=alpha
+                    board, depth - 1, not level_parity, alpha=alpha, ply=ply + 1
                 )[1] 
             else:
                 move_eval = self.minimax(
-                    board, depth - 1, not level_parity, betha=betha
+                    board, depth - 1, not level_parity, betha=betha, ply=ply + 1
                 )[1]
 
-            AI_Player.remove_piece(board, row, col)
+            board.pop()
             
             if level_parity and alpha < move_eval:
                 alpha = move_eval
@@ -92,74 +489,165 @@ class AI_Player(Player):
                 next_move = (row, col)
             
             if betha <= alpha:
+                self.record_cutoff((row, col), id, depth, ply)
                 result = betha if level_parity else alpha
+                self.table.store(
+                    key, depth, LOWER_BOUND if level_parity else UPPER_BOUND, 
+                    (row, col), result
+                )
                 return (), result
             
         result = alpha if level_parity else betha
+        self.table.store(key, depth, EXACT, next_move, result)
         return next_move, result
     
+    def new_search(self):
+        """Prepara la tabla de transposición y el orden de jugadas para una nueva búsqueda"""
+        
+        self.table.new_search()
+        self.killers.clear()
+        self.history_size = None
+    
+    def order_moves(
+        self, board: HexBoard, moves: list[tuple[int, int]], player_id: int, 
+        depth: int, ply: int, hash_move: tuple[int, int]
+        ):
+        """
+        Ordena `moves` en el lugar: la jugada de la tabla de transposición, 
+        las asesinas del nivel y el resto según la tabla de historia (que 
+        empieza con la distancia al centro)
+        """
+        
+        if self.history_size != board.size:
+            scores = center_scores(board.size)
+            self.history = {1: dict(scores), 2: dict(scores)}
+            self.history_size = board.size
+        
+        moves.sort(key=self.history[player_id].__getitem__, reverse=True)
+        if self.move_ordering != "center":
+            if self.move_ordering == "path" and depth > 1:
+                # Ordenación estable: las casillas de los caminos mínimos pasan adelante
+                zone, size = relevant_zone(board, 0), board.size
+                moves.sort(key=lambda move: move[0] * size + move[1] not in zone)
+            for move in reversed(self.killers.get(ply, ())):
+                if move != hash_move and move in moves:
+                    moves.remove(move)
+                    moves.insert(0, move)
+        if hash_move:
+            # La mejor jugada de una búsqueda anterior se explora primero
+            if hash_move in moves:
+                moves.remove(hash_move)
+            moves.insert(0, hash_move)
+    
+    def record_cutoff(self, move: tuple[int, int], player_id: int, depth: int, ply: int):
+        """Premia la jugada que produjo un corte alfa-beta"""
+        
+        if self.move_ordering == "center":
+            return
+        self.history[player_id][move] += depth * depth
+        killers = self.killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLER_SLOTS:]
+    
+    def candidate_moves(self, board: HexBoard, player_id: int) -> list[tuple[int, int]]:
+        """Jugadas a considerar según `move_filter`"""
+        
+        if self.move_filter == "all":
+            return AI_Player.get_possible_moves(board)
+        zone_slack = ZONE_SLACK if self.move_filter == "zone" else None
+        return candidate_moves(board, player_id, zone_slack)
+    
+    def virtual_winner(self, board: HexBoard) -> int:
+        """Jugador conectado virtualmente en la posición (0 si ninguno)"""
+        
+        winner = self.vc_cache.get(board.hash)
+        if winner is None:
+            winner = next((
+                player_id for player_id in (self.player_id, 3 - self.player_id)
+                if virtual_connection(board, player_id) is not None
+            ), 0)
+            if len(self.vc_cache) >= EVAL_CACHE_SIZE:
+                self.vc_cache.clear()
+            self.vc_cache[board.hash] = winner
+        return winner
+    
     def calculate_depth_limit(self, board: HexBoard) -> int:
         """Calcula el límite de profundidad a explorar"""
         
-        possible_moves = AI_Player.get_possible_moves(board)
-        times_AI_already_played = sum(
-            [row.count(self.player_id) for row in board.board]
-        )
-        times_opponent_already_played = sum(
-            [row.count(3 - self.player_id) for row in board.board]
-        )
-        total_played = times_AI_already_played + times_opponent_already_played
+        total_played = board.move_count
         max_to_play = board.size ** 2
         
-        if len(possible_moves) < 10:
-            return float('inf')
+        if board.empty_count() < 10:
+            return min(board.empty_count(), MAX_SEARCH_DEPTH)
         else:
-            return 3 + (total_played // max_to_play) * 2
+            return min(3 + (total_played // max_to_play) * 2, MAX_SEARCH_DEPTH)
 
-    def simulate(self, board: HexBoard, player_id: int, player_on_turn: int, depth) -> int:
-        """Simula cada jugada de manera aleatoria hasta que gane alguien"""
-        
-        if AI_Player.check_connection(board, player_id)[0]:
-            result = float('inf') if depth != float('inf') else 1
-        elif AI_Player.check_connection(board, 3 - player_id)[0]:
-            result = -float('inf') if depth != float('inf') else 0
-        elif not depth:
-            return self.heuristic(board)
+    def monte_carlo_method(
+        self, board: HexBoard, player_id: int, simulations=None, batch_size=None
+        ) -> tuple[int, int]:
+        """
+        Búsqueda Monte Carlo en árbol (UCT con RAVE): cada simulación baja por 
+        el árbol, expande una jugada y llena el resto del tablero al azar; se 
+        escoge la jugada más visitada. Con límite de tiempo simula hasta agotarlo
+        """
+        
+        start = time.perf_counter()
+        if self.mc_engine == "batch":
+            move = self.batch_monte_carlo(board, player_id, simulations, batch_size)
         else:
-            possible_moves = AI_Player.get_possible_moves(board)
-            row, col = possible_moves[random.choice(len(possible_moves))]
-            AI_Player.place_piece(board, row, col, player_on_turn)
-            result = self.simulate(board, player_id, 3 - player_on_turn, depth - 1)
-            AI_Player.remove_piece(board, row, col)
-
-        return result
-
-    def monte_carlo_method(self, board: HexBoard, player_id: int, simulations=1000) -> tuple[int, int]:
+            move = self.tree_monte_carlo(board, player_id, simulations)
+        # El plan da las simulaciones de cada proceso: el ritmo se mide por proceso
+        playouts = self.playouts
+        if self.pool is not None and self.mc_engine != "batch":
+            playouts /= self.pool.workers
+        self.cost_model.record_playouts(
+            board.size, board.empty_count(), playouts, time.perf_counter() - start
+        )
+        return move
+    
+    def tree_monte_carlo(self, board: HexBoard, player_id: int, simulations=None) -> tuple[int, int]:
+        """Monte Carlo en árbol con el árbol del jugador (o uno nuevo para el oponente)"""
+        
+        engine = self.mcts if player_id == self.player_id else MCTS(player_id, policy=self.playout_policy)
+        if simulations is None:
+            simulations = 5000 if board.size < 9 else 3000
+        if self.deadline is not None:
+            simulations = float('inf')  # Con límite de tiempo se simula hasta agotarlo
+        
+        self.playouts = 0
+        moves = self.candidate_moves(board, player_id)
+        if self.pool is not None:
+            move, self.playouts = self.pool.monte_carlo(
+                board, player_id, simulations, self.deadline, self.playout_policy, moves
+            )
+            return move
+        move = engine.search(board, simulations, self.deadline, moves)
+        self.playouts = engine.playouts
+        return move
+    
+    def batch_monte_carlo(
+        self, board: HexBoard, player_id: int, simulations=None, batch_size=None
+        ) -> tuple[int, int]:
         """
-        Método de monte carlo para simular las jugadas hasta que alguien gane y 
-        contar la cantidad de victorias en cada jugada realizada por simulación, 
-        así se escoge la que más victorias haya producido
+        Evalúa todas las jugadas candidatas con simulaciones vectorizadas en 
+        lote; `simulations` es el total de partidas repartido entre las jugadas
+        y `batch_size` los tableros de cada lote (por defecto, los de `batch_playouts`)
         """
         
-        possible_moves = AI_Player.get_possible_moves(board)
-        move_score_counts = {move: 0 for move in possible_moves}
-        move_played_count = {move: 0 for move in possible_moves}
-        depth = 20 if board.size > 7 else float('inf')
-        simulations = 2000 if board.size < 9 else 1000
-
-        while simulations > 0:
-            move = possible_moves[random.randint(0, len(possible_moves))]
-            move_played_count[move] += 1
-            AI_Player.place_piece(board, move[0], move[1], player_id)
-            move_score_counts[move] += self.simulate(board, player_id, 3 - player_id, depth)
-            AI_Player.remove_piece(board, move[0], move[1])
-            
-            simulations -= 1
+        moves = self.candidate_moves(board, player_id)
+        if self.deadline is not None:
+            playouts_per_move = float('inf')  # Con límite de tiempo se simula hasta agotarlo
+        else:
+            simulations = 100000 if simulations is None else simulations
+            playouts_per_move = max(1, simulations // len(moves))
         
-        return max(
-            possible_moves, key=lambda move: move_score_counts[move] / move_played_count[move] 
-                if move_played_count[move] > 0 else 0
+        counts = {}
+        move = batch_playouts.best_move(
+            board, player_id, playouts_per_move, self.deadline, moves, counts, batch_size
         )
+        self.playouts = counts["playouts"]
+        return move
 
     def heuristic(self, board: HexBoard) -> int:
         """
@@ -167,15 +655,29 @@ class AI_Player(Player):
         Prioriza jugadas ganadoras o bloquear al oponente.
         """
         
-        player_path = AI_Player.shortest_path(board, self.player_id)
+        value = self.eval_cache.get(board.hash)
+        if value is not None:
+            return value
+        
         opponent_id = 3 - self.player_id
-        opponent_path = AI_Player.shortest_path(board, opponent_id)
+        if self.evaluator == "two_distance":
+            player_path = two_distance(board, self.player_id)
+            opponent_path = two_distance(board, opponent_id)
+        else:
+            player_path = self.distances.distance(board, self.player_id)
+            opponent_path = self.distances.distance(board, opponent_id)
         
         if player_path == 0:
-            return float('inf')
-        if opponent_path == 0:
-            return -float('inf')
-        return opponent_path - player_path
+            value = float('inf')
+        elif opponent_path == 0:
+            value = -float('inf')
+        else:
+            value = opponent_path - player_path
+        
+        if len(self.eval_cache) >= EVAL_CACHE_SIZE:
+            self.eval_cache.clear()
+        self.eval_cache[board.hash] = value
+        return value
     
     @staticmethod
     def shortest_path(board: HexBoard, player_id: int) -> int:
@@ -226,159 +728,24 @@ class AI_Player(Player):
     
     @staticmethod
     def look_for_win_next_round(board: HexBoard, player_id: int) -> tuple[int, int]:
-        """Busca alguna opción con 100% de probabilidades de victoria en próxima ronda"""
-        
-        possible_moves = AI_Player.get_possible_moves(board)
-        inmediate_victory = AI_Player.find_inmediate_win(board, possible_moves, player_id)
-        
-        if inmediate_victory:
-            return inmediate_victory
-        
-        for row, col in possible_moves:
-            AI_Player.place_piece(board, row, col, player_id)
-            if AI_Player.more_than_one_chance_for_winning(board, player_id):
-                AI_Player.remove_piece(board, row, col)
-                return row, col
-            AI_Player.remove_piece(board, row, col)
-            
-        return ()
-    
-    @staticmethod
-    def find_inmediate_win(
-        board: HexBoard, possible_moves: list[tuple[int, int]], 
-        player_id: int
-        ) -> tuple[int, int]:
-        """Busca alguna victoria en la jugada actual"""
-        
-        for row, col in possible_moves:
-            AI_Player.place_piece(board, row, col, player_id)
-            if AI_Player.check_connection(board, player_id)[0]:
-                AI_Player.remove_piece(board, row, col)
-                return row, col
-            AI_Player.remove_piece(board, row, col)
-            
-        return ()
-    
-    @staticmethod
-    def more_than_one_chance_for_winning(
-        board: HexBoard, player_id: int, check_next_move=True
-        ) -> bool:
         """
-        Revisa si el movimiento realizado anteriormente permite 100% de 
-        probabilidades de victoria en la próxima ronda
+        Busca una jugada que gane de inmediato o que deje al jugador 
+        conectado virtualmente (100% de probabilidades de victoria)
         """
         
-        size = board.size
-        win_area = [
-            (i, j) for i in range(size) for j in [0, size - 1]
-            ] if player_id == 1 else [
-                (i, j) for j in range(size) for i in [0, size - 1]
-                ]
-        wins_count = 0
-        for row, col in win_area:
-            if board.board[row][col] != 0:
-                continue
-            AI_Player.place_piece(board, row, col, player_id)
-            if (AI_Player.check_connection(board, player_id)[0]):
-                wins_count += 1
-            AI_Player.remove_piece(board, row, col)
-            
-            if wins_count > 1:
-                return True
-            
-        if check_next_move:
-            return AI_Player.chances_for_winning_after_next_round(board, player_id)
-        else:
-            return False
-    
-    @staticmethod
-    def build_reduced_board(
-        size: int, positions: dict[int: list[tuple[int, int]]]
-        ) -> HexBoard:
-        """Construye un tablero reducido a partir del tablero real"""
-        
-        new_board = HexBoard(size)
-        for player in positions:
-            for row, col in positions[player]:
-                AI_Player.place_piece(new_board, row, col, player)
-                
-        return new_board
-    
-    @staticmethod
-    def chances_for_winning_after_next_round(board: HexBoard, player_id: int) -> bool:
-        """Busca posibilidades de victoria en las próximas 2 jugadas"""
-        
-        size = board.size
-        win_area = [
-            (i, j) for i in range(size) for j in [0, size - 1]
-            ] if player_id == 1 else [
-                (i, j) for j in range(size) for i in [0, size - 1]
-                ]
-            
-        player_pos = [
-            (i, j) for i, row in enumerate(board.board) 
-            for j, value in enumerate(row) if value == player_id
-            ]
-        
-        opponent_pos = [
-            (i, j) for i, row in enumerate(board.board) 
-            for j, value in enumerate(row) if value == 3 - player_id
-            ]
-        
-        player_pos_reduced = [
-            (pos[0] - 1, pos[1] - 1) for pos in player_pos 
-                if pos[0] > 0 and pos[1] > 0 and pos[0] < size - 1 and pos[1] < size - 1
-            ]
-        opponent_pos_reduced = [
-            (pos[0] - 1, pos[1] - 1) for pos in opponent_pos 
-                if pos[0] > 0 and pos[1] > 0 and pos[0] < size - 1 and pos[1] < size - 1
-            ]
-        positions = {player_id: player_pos_reduced, (3-player_id): opponent_pos_reduced}
-        inside_board = AI_Player.build_reduced_board(board.size - 2, positions)
-        won, (start, end) = AI_Player.check_connection(inside_board, player_id)
-        
-        if not won:
-            return False
-        
-        adj_start = [
-            (row, col) for (row, col) in win_area 
-            if not board.board[row][col] and AI_Player.is_adjacent(start, (row, col))
-            ]
-        adj_end = [
-            (row, col) for (row, col) in win_area 
-            if not board.board[row][col] and AI_Player.is_adjacent(end, (row, col))
-            ]
-        
-        return len(adj_end) >= 2 and len(adj_start) >= 2
-        
-    @staticmethod
-    def is_adjacent(place: tuple[int, int], to_check: tuple[int, int]) -> bool:
-        """Revisa si dos casillas son adjacentes en el tablero"""
-        
-        adj = [(0,1), (0,-1), (1,-1), (1,0), (-1,1), (-1,0)]
-        
-        for dx, dy in adj:
-            if place[0] + dx == to_check[0] and place[1] + dy == to_check[1]:
-                return True
-        return False 
+        return connecting_move(board, player_id) or ()
         
     @staticmethod
     def place_piece(board: HexBoard, row: int, col: int, player_id: int) -> bool:
         """Coloca una ficha si la casilla está vacía."""
         
-        if board.board[row][col] != 0:
-            return False
-        board.board[row][col] = player_id
-        return True
+        return board.place_piece(row, col, player_id)
         
     @staticmethod 
     def remove_piece(board: HexBoard, row: int, col: int) -> bool:
         """Remueve una ficha del tablero."""
         
-        if board.board[row][col] == 0:
-            return False
-        board.board[row][col] = 0
-        return True
+        return board.remove_piece(row, col)
     
     @staticmethod
     def check_connection(
@@ -388,23 +755,21 @@ class AI_Player(Player):
         Verifica si el jugador ha conectado sus dos lados y 
         devuelve los extremos ganadores
         """
-        player_positions = []
-        for i in range(board.size):
-            for j in range(board.size):
-                if (board.board[i][j] == player_id):
-                    player_positions.append((i, j))
         
+        if not board.check_connection(player_id):
+            return False, (None, None)
+        
+        player_positions = [
+            (i, j) for i, row in enumerate(board.board) 
+                for j, value in enumerate(row) if value == player_id
+        ]
         return AI_Player.dfs(player_positions, player_id, board.size)
     
     @staticmethod
     def get_possible_moves(board: HexBoard) -> list[tuple[int, int]]:
         """Devuelve todas las casillas vacías como tuplas (fila, columna)."""
-        result = [
-            (i, j) for i, row in enumerate(board.board) 
-                for j, value in enumerate(row) if not value
-        ]
         
-        return result
+        return board.get_possible_moves()
     
     @staticmethod
     def dfs(
@@ -413,6 +778,7 @@ class AI_Player(Player):
         visited = set()
         adj = [(0,1), (0,-1), (1,-1), (1,0), (-1,1), (-1,0)]
         p = {}
+        members = set(g)
         for u in g:
             if player_id == 1 and u[1] != 0:
                 continue
@@ -421,7 +787,7 @@ class AI_Player(Player):
 
             if u not in visited:
                 p[(u[0], u[1])] = None
-                result = AI_Player.dfs_visit(g, u, visited, p, size, player_id, adj)
+                result = AI_Player.dfs_visit(members, u, visited, p, size, player_id, adj)
                 if result is not None:
                     start_node = u
                     end_node = result
@@ -430,22 +796,28 @@ class AI_Player(Player):
 
     @staticmethod
     def dfs_visit(
-        g: list[tuple[int, int]], u: tuple[int, int], visited: set, 
+        g: set[tuple[int, int]], u: tuple[int, int], visited: set, 
         p: dict, size: int, player_id: int, adj: list[tuple[int, int]]
         ) -> tuple[int, int]:
+        # Pila explícita de (casilla, iterador de direcciones pendientes)
         visited.add(u)
-        for dir in adj:
-            v = (u[0] + dir[0], u[1] + dir[1])
-            if v not in g:
-                continue
-            if player_id == 1 and v[1] == size - 1:
-                return v 
-            elif player_id == 2 and v[0] == size - 1:
-                return v 
-
-            if v not in visited:
-                p[v] = u
-                result = AI_Player.dfs_visit(g, v, visited, p, size, player_id, adj)
-                if result is not None:
-                    return result
+        stack = [(u, iter(adj))]
+        while stack:
+            u, directions = stack[-1]
+            for dir in directions:
+                v = (u[0] + dir[0], u[1] + dir[1])
+                if v not in g:
+                    continue
+                if player_id == 1 and v[1] == size - 1:
+                    return v 
+                elif player_id == 2 and v[0] == size - 1:
+                    return v 
+                
+                if v not in visited:
+                    p[v] = u
+                    visited.add(v)
+                    stack.append((v, iter(adj)))
+                    break
+            else:
+                stack.pop()
         return None
@@ -0,0 +1,188 @@
+"""
+Formato binario de partidas. El archivo empieza con `MAGIC` y luego cada
+partida ocupa 4 + 4n bytes (little endian):
+
+    tamaño (uint8) | ganador (uint8, 0 si no terminó) | n jugadas (uint16)
+    n jugadas (uint16: índice plano, bit más alto = jugador 2, como `HexBoard.to_bytes`)
+    n tiempos (float16, segundos que tardó cada jugada)
+
+`GameWriter` escribe partidas una a una y `GameReader` las recorre sobre el
+archivo mapeado en memoria, sin cargarlo completo.
+"""
+import mmap
+import numbers
+import os
+import struct
+import sys
+from array import array
+from board import HexBoard
+
+MAGIC = b"HEXR\x01"
+HEADER = struct.Struct("<BBH")
+PLAYER_BIT = 1 << 15
+
+
+class GameRecord:
+    """Partida leída de un archivo: tamaño, ganador, jugadas codificadas y tiempos"""
+
+    __slots__ = ("size", "winner", "encoded", "times")
+
+    def __init__(self, size: int, winner: int, encoded: array, times: tuple[float, ...]):
+        self.size = size
+        self.winner = winner
+        self.encoded = encoded  # array('H') con las jugadas como en `HexBoard.to_bytes`
+        self.times = times
+
+    def __len__(self) -> int:
+        return len(self.encoded)
+
+    def moves(self) -> list[tuple[int, int, int]]:
+        """Jugadas como (fila, columna, jugador)"""
+
+        return [
+            (*divmod(value & ~PLAYER_BIT, self.size), 2 if value & PLAYER_BIT else 1)
+            for value in self.encoded
+        ]
+
+    def to_board(self, moves: int = None) -> HexBoard:
+        """Tablero tras las primeras `moves` jugadas (todas por defecto)"""
+
+        board = HexBoard(self.size)
+        for row, col, player_id in self.moves()[:moves]:
+            board.push((row, col), player_id)
+        return board
+
+
+def encode_moves(size: int, moves) -> array:
+    """
+    Codifica jugadas dadas como índices planos (turnos alternos empezando
+    por el jugador 1) o como tuplas (fila, columna, jugador)
+    """
+
+    encoded = array("H")
+    for turn, move in enumerate(moves):
+        if isinstance(move, numbers.Integral):  # También los enteros de NumPy
+            encoded.append(int(move) | (PLAYER_BIT if turn & 1 else 0))
+        else:
+            row, col, player_id = move[:3]
+            encoded.append((row * size + col) | (PLAYER_BIT if player_id == 2 else 0))
+    return encoded
+
+
+class GameWriter:
+    """
+    Escribe partidas en un archivo a medida que terminan. Si el archivo ya
+    existe se agregan al final
+    """
+
+    def __init__(self, path: str, buffering: int = 1 << 16):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "ab", buffering=buffering)
+        if exists:
+            with open(path, "rb") as file:
+                if file.read(len(MAGIC)) != MAGIC:
+                    self.file.close()
+                    raise ValueError(f"{path} no es un archivo de partidas")
+        else:
+            self.file.write(MAGIC)
+        self.count = 0  # Partidas escritas por este escritor
+
+    def write(self, size: int, moves, winner: int = 0, times: list[float] = None):
+        """Agrega una partida (ver `encode_moves` para el formato de `moves`)"""
+
+        encoded = encode_moves(size, moves)
+        if times is None:
+            times = [0.0] * len(encoded)
+        elif len(times) != len(encoded):
+            raise ValueError("Se necesita un tiempo por jugada")
+        if len(encoded) > 0xFFFF:
+            raise ValueError("Partida demasiado larga")
+
+        if sys.byteorder == "big":
+            encoded.byteswap()
+        self.file.write(HEADER.pack(size, winner, len(encoded)))
+        self.file.write(encoded.tobytes())
+        self.file.write(struct.pack(f"<{len(times)}e", *(min(value, 65504.0) for value in times)))
+        self.count += 1
+
+    def write_board(self, board: HexBoard, winner: int = 0, times: list[float] = None):
+        """Agrega la partida con las jugadas del historial del tablero"""
+
+        self.write(board.size, board.history, winner, times)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "GameWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameReader:
+    """
+    Recorre las partidas de un archivo mapeado en memoria. La iteración no
+    guarda nada; `reader[i]` construye (una sola vez) el índice de posiciones
+    de cada partida, 8 bytes por partida
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if self.data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} no es un archivo de partidas")
+        self.offsets = None
+
+    def _offsets(self):
+        """Posición de cada partida en el archivo (escaneando solo los encabezados)"""
+
+        offset, end = len(MAGIC), len(self.data)
+        while offset + HEADER.size <= end:
+            moves = HEADER.unpack_from(self.data, offset)[2]
+            if offset + HEADER.size + 4 * moves > end:
+                break  # Partida truncada (escritura interrumpida)
+            yield offset
+            offset += HEADER.size + 4 * moves
+
+    def _read(self, offset: int) -> GameRecord:
+        size, winner, moves = HEADER.unpack_from(self.data, offset)
+        start = offset + HEADER.size
+        encoded = array("H", self.data[start:start + 2 * moves])
+        if sys.byteorder == "big":
+            encoded.byteswap()
+        times = struct.unpack_from(f"<{moves}e", self.data, start + 2 * moves)
+        return GameRecord(size, winner, encoded, times)
+
+    def __iter__(self):
+        for offset in self._offsets():
+            yield self._read(offset)
+
+    def __len__(self) -> int:
+        self._build_index()
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        self._build_index()
+        return self._read(self.offsets[index])
+
+    def _build_index(self):
+        if self.offsets is None:
+            self.offsets = array("Q", self._offsets())
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self) -> "GameReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,255 @@
+"""
+Planificación de la jugada según costos. En lugar de umbrales fijos por fase
+del juego y tamaño del tablero, se mide una vez por tamaño el ritmo del motor
+en esta máquina (nodos de Minimax por segundo, crecimiento del árbol por
+nivel y simulaciones de Monte Carlo por segundo), se estima el costo de cada
+opción en la posición actual y se reparte el tiempo de la jugada:
+
+- las amenazas (ganar o bloquear en una jugada) se revisan siempre;
+- en finales, el solucionador usa a lo sumo `SOLVER_SHARE` del tiempo;
+- con el resto se busca con Minimax si alcanza `MIN_MINIMAX_DEPTH` niveles
+  y, si no, con Monte Carlo con tantas simulaciones como quepan.
+
+Los ritmos medidos se corrigen después de cada búsqueda de la partida. Si
+la calibración queda pendiente para una jugada con límite de tiempo, se
+acorta a `CALIBRATION_SHARE` del tiempo que queda (o, si no alcanza, se
+usan ritmos por defecto), así la jugada no se pasa de su tiempo.
+"""
+import time
+import numpy as np
+from board import HexBoard
+from mcts import MCTS
+import batch_playouts
+
+CALIBRATION_TIME = 0.05  # Segundos de cada medición de la calibración
+CALIBRATION_LIMIT = 0.25  # Segundos máximos de la calibración de Minimax
+CALIBRATION_LEVELS = 3  # Niveles de Minimax que se intentan terminar al calibrar
+CALIBRATION_FILL = 0.3  # Fracción de casillas ocupadas en la posición de calibración
+CALIBRATION_SHARE = 0.25  # Fracción del tiempo de una jugada que puede usar una calibración pendiente
+MIN_CALIBRATION = 0.02  # Segundos mínimos de una calibración acortada (si no, ritmos por defecto)
+# Ritmos por defecto (conservadores) cuando no hay tiempo para calibrar
+DEFAULT_NODES_PER_SECOND = 2000
+DEFAULT_PLAYOUTS_PER_SECOND = 1000
+UNTIMED_BUDGET = 1.0  # Segundos supuestos para una jugada sin límite de tiempo
+SOLVER_SHARE = 0.5  # Fracción del tiempo que queda que puede usar el solucionador
+MIN_MINIMAX_DEPTH = 4  # Profundidad que debe alcanzar Minimax para preferirlo a Monte Carlo
+BATCH_SHARE = 0.25  # Fracción del tiempo que puede tardar un lote de simulaciones vectorizadas
+RATE_SMOOTHING = 0.25  # Peso de cada medición de la partida al corregir los ritmos
+
+MINIMAX, MONTE_CARLO = "minimax", "monte_carlo"
+
+
+class Throughput:
+    """Ritmo del motor medido en un tamaño de tablero"""
+
+    __slots__ = ("nodes_per_second", "growth", "candidates", "playouts_per_second", "empty")
+
+    def __init__(
+        self, nodes_per_second: float, growth: float, candidates: int,
+        playouts_per_second: float, empty: int
+        ):
+        self.nodes_per_second = nodes_per_second
+        # Nodos de un nivel de profundidad iterativa sobre los del anterior,
+        # con `candidates` jugadas candidatas en la raíz
+        self.growth = growth
+        self.candidates = candidates
+        # Simulaciones por segundo desde una posición con `empty` casillas vacías
+        self.playouts_per_second = playouts_per_second
+        self.empty = empty
+
+
+class Plan:
+    """Estrategia escogida para la jugada y sus límites"""
+
+    __slots__ = ("strategy", "depth", "playouts", "batch_size")
+
+    def __init__(self, strategy: str, depth: int, playouts: int, batch_size: int):
+        self.strategy = strategy  # MINIMAX o MONTE_CARLO
+        self.depth = depth  # Profundidad de Minimax que cabe en el tiempo
+        self.playouts = playouts  # Simulaciones que caben en el tiempo
+        self.batch_size = batch_size  # Tableros por lote del motor vectorizado
+
+    def __repr__(self) -> str:
+        return f"Plan({self.strategy}, depth={self.depth}, playouts={self.playouts})"
+
+
+# (tamaño, configuración del motor) -> Throughput, compartido por los jugadores del proceso
+_calibrations = {}
+
+
+def calibration_board(size: int) -> HexBoard:
+    """Posición de medio juego fija para el tamaño, sin ganador"""
+
+    rng = np.random.default_rng(size)
+    while True:
+        board = HexBoard(size)
+        player_id = 1
+        for _ in range(int(size * size * CALIBRATION_FILL)):
+            board.push(board.random_move(rng.integers), player_id)
+            player_id = 3 - player_id
+        if not (board.check_connection(1) or board.check_connection(2)):
+            return board
+
+
+def default_throughput(size: int) -> Throughput:
+    """Ritmo supuesto sin calibrar, con el crecimiento de alfa-beta ideal"""
+
+    empty = size * size - int(size * size * CALIBRATION_FILL)
+    return Throughput(
+        DEFAULT_NODES_PER_SECOND, empty ** 0.5, empty, DEFAULT_PLAYOUTS_PER_SECOND, empty
+    )
+
+
+def calibrate(player, size: int, budget: float = None) -> Throughput:
+    """
+    Mide el ritmo de la configuración de `player` en una posición de
+    calibración del tamaño dado. Se usa un jugador aparte para no tocar la
+    tabla de transposición ni el árbol de Monte Carlo de `player`. Con
+    `budget` las mediciones se acortan para tardar a lo sumo esos segundos
+    """
+
+    from player import SearchTimeout  # Importado aquí para evitar el ciclo con player.py
+
+    end = None if budget is None else time.perf_counter() + budget
+    board = calibration_board(size)
+    player_id = 1 if board.move_count % 2 == 0 else 2
+    probe = type(player)(
+        player_id, tt_megabytes=1, mc_engine=player.mc_engine,
+        playout_policy=player.playout_policy, evaluator=player.evaluator,
+        move_filter=player.move_filter, move_ordering=player.move_ordering, solver_threshold=0
+    )
+    moves = probe.candidate_moves(board, player_id)
+
+    # Profundidad iterativa como en `iterative_deepening`, contando nodos por
+    # nivel: se mide al menos `CALIBRATION_TIME` y hasta terminar
+    # `CALIBRATION_LEVELS` niveles (o `CALIBRATION_LIMIT` en tableros grandes)
+    level_nodes = []
+    search_board = board.clone()
+    probe.new_search()
+    start = time.perf_counter()
+    # Con `budget`, Minimax usa a lo sumo 3/4 de lo que queda y Monte Carlo el resto
+    minimax_limit = CALIBRATION_LIMIT if end is None else min(CALIBRATION_LIMIT, 0.75 * (end - start))
+    probe.deadline = start + minimax_limit
+    try:
+        for depth in range(1, len(moves) + 1):
+            before = probe.nodes
+            probe.minimax(search_board, depth)
+            level_nodes.append(probe.nodes - before)
+            elapsed = time.perf_counter() - start
+            if depth >= CALIBRATION_LEVELS and elapsed >= min(CALIBRATION_TIME, minimax_limit):
+                break
+    except SearchTimeout:
+        pass
+    nodes_per_second = probe.nodes / max(time.perf_counter() - start, 1e-6) or DEFAULT_NODES_PER_SECOND
+    # Alfa-beta alterna niveles caros y baratos: se compara el primero con el
+    # último nivel impar terminado para no quedarse con un salto barato
+    last = len(level_nodes) - 1 - (len(level_nodes) - 1) % 2
+    if last >= 2:
+        growth = (level_nodes[last] / level_nodes[0]) ** (1 / last)
+    else:
+        growth = len(moves) ** 0.5  # Sin niveles suficientes: poda alfa-beta ideal
+    growth = max(growth, 1.0)
+
+    start = time.perf_counter()
+    deadline = start + CALIBRATION_TIME if end is None else min(start + CALIBRATION_TIME, end)
+    if player.mc_engine == "batch":
+        counts = {}
+        batch_playouts.evaluate_moves(
+            board, player_id, float('inf'), batch_size=2 * len(moves),
+            deadline=deadline, moves=moves, counts=counts
+        )
+        playouts = counts["playouts"]
+    else:
+        engine = MCTS(player_id, policy=player.playout_policy)
+        engine.search(board, float('inf'), deadline, moves)
+        playouts = engine.playouts
+    playouts_per_second = playouts / max(time.perf_counter() - start, 1e-6) or DEFAULT_PLAYOUTS_PER_SECOND
+
+    return Throughput(
+        nodes_per_second, growth, len(moves), playouts_per_second, board.empty_count()
+    )
+
+
+class CostModel:
+    """Ritmos de un jugador por tamaño de tablero y planes de jugada a partir de ellos"""
+
+    def __init__(self, player):
+        self.player = player
+        self.rates = {}  # Tamaño -> Throughput corregido con las búsquedas de la partida
+
+    def throughput(self, size: int, budget: float = None) -> Throughput:
+        """
+        Ritmo en el tamaño dado; la primera vez se calibra (una vez por
+        proceso). Con `budget` la calibración pendiente tarda a lo sumo esos
+        segundos y no se guarda para otros jugadores; si no alcanzan ni para
+        `MIN_CALIBRATION` se usan los ritmos por defecto
+        """
+
+        rates = self.rates.get(size)
+        if rates is None:
+            player = self.player
+            key = (
+                size, player.mc_engine, player.playout_policy, player.evaluator,
+                player.move_filter, player.move_ordering
+            )
+            base = _calibrations.get(key)
+            if base is None and budget is None:
+                base = _calibrations[key] = calibrate(player, size)
+            elif base is None and budget >= MIN_CALIBRATION:
+                base = calibrate(player, size, budget)
+            elif base is None:
+                base = default_throughput(size)
+            rates = self.rates[size] = Throughput(
+                base.nodes_per_second, base.growth, base.candidates,
+                base.playouts_per_second, base.empty
+            )
+        return rates
+
+    def minimax_seconds(self, rates: Throughput, candidates: int, depth: int) -> float:
+        """
+        Segundos estimados de la profundidad iterativa hasta `depth` con
+        `candidates` jugadas en la raíz. Con buen orden de jugadas, alfa-beta
+        crece por nivel como la raíz cuadrada de las jugadas, así que el
+        crecimiento medido se escala con la de `candidates`
+        """
+
+        growth = max(1.0, rates.growth * (candidates / max(rates.candidates, 1)) ** 0.5)
+        nodes = sum(candidates * growth ** (level - 1) for level in range(1, depth + 1))
+        return nodes / rates.nodes_per_second
+
+    def playouts_per_second(self, rates: Throughput, empty: int) -> float:
+        """Simulaciones por segundo estimadas: su costo crece con las casillas vacías"""
+
+        return rates.playouts_per_second * rates.empty / max(empty, 1)
+
+    def plan(self, board: HexBoard, candidates: int, budget: float) -> Plan:
+        """Escoge la estrategia para la posición con `budget` segundos de búsqueda"""
+
+        from player import MAX_SEARCH_DEPTH  # Importado aquí para evitar el ciclo con player.py
+
+        rates = self.throughput(board.size)
+        empty = board.empty_count()
+        max_depth = min(candidates, empty, MAX_SEARCH_DEPTH)
+        depth = 0
+        while depth < max_depth and self.minimax_seconds(rates, candidates, depth + 1) <= budget:
+            depth += 1
+        playouts_per_second = self.playouts_per_second(rates, empty)
+        playouts = max(1, int(budget * playouts_per_second))
+        batch_size = max(candidates, int(BATCH_SHARE * playouts))
+        strategy = MINIMAX if depth >= min(MIN_MINIMAX_DEPTH, max_depth) else MONTE_CARLO
+        return Plan(strategy, max(depth, 1), playouts, batch_size)
+
+    def record_minimax(self, size: int, nodes: int, seconds: float):
+        """Corrige los nodos por segundo con una búsqueda de la partida"""
+
+        rates = self.rates.get(size)
+        if rates is not None and nodes and seconds > 0:
+            rates.nodes_per_second += RATE_SMOOTHING * (nodes / seconds - rates.nodes_per_second)
+
+    def record_playouts(self, size: int, empty: int, playouts: int, seconds: float):
+        """Corrige las simulaciones por segundo con una búsqueda de la partida"""
+
+        rates = self.rates.get(size)
+        if rates is not None and playouts and seconds > 0:
+            measured = playouts / seconds * empty / rates.empty
+            rates.playouts_per_second += RATE_SMOOTHING * (measured - rates.playouts_per_second)
@@ -0,0 +1,462 @@
+"""
+Servicio de motor con asyncio para muchas partidas a la vez. Habla un
+protocolo de líneas JSON por la entrada/salida estándar o por un socket
+local (TCP o Unix); cada petición lleva un "id" que se repite en su respuesta
+y las respuestas pueden llegar en otro orden que las peticiones.
+
+    {"id": 1, "op": "new_game", "game": "g1", "size": 11, "player": 2,
+     "ponder": true, "options": {"mc_engine": "batch"}}
+    {"id": 2, "op": "play", "game": "g1", "moves": [[5, 5]], "time": 1.0}
+        -> {"id": 2, "move": [4, 6], "elapsed": 0.98}
+    {"id": 3, "op": "cancel", "target": 2}
+    {"id": 4, "op": "end_game", "game": "g1"}
+    {"id": 5, "op": "stats"}
+
+La posición se da con "moves" (jugadas alternadas empezando por el jugador
+1, o [fila, columna, jugador]) o con "cells" (las n*n casillas, 0 vacía).
+"time" es el tiempo de respuesta en segundos contado desde que llega la
+petición, así que la espera en cola se descuenta de la búsqueda.
+
+Cada partida queda fija en un proceso trabajador que conserva su tablero y
+su `AI_Player` (tabla de transposición, árbol de Monte Carlo, cachés) entre
+jugadas. Con "ponder" el trabajador sigue buscando en el tiempo del oponente
+mientras no tenga peticiones (`AI_Player.ponder`: predice la respuesta y
+busca la jugada siguiente; si acierta, la jugada sale al momento). Cancelar una petición en cola la descarta; una
+que ya se está buscando se responde al momento como cancelada y el
+trabajador corta la búsqueda (`AI_Player.interrupt`) para atender la
+siguiente; su resultado se ignora.
+
+Ejemplos:
+    python service.py --stdio --workers 4
+    python service.py --port 8765
+    python service.py --unix /tmp/hex.sock
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from numpy import random
+from board import HexBoard
+
+DEFAULT_BUDGET = 1.0  # Segundos por jugada si la petición no indica "time"
+MIN_BUDGET = 0.05  # Tiempo mínimo de búsqueda aunque la petición llegue tarde
+PONDER_SLICE = 0.1  # Segundos de cada tramo de búsqueda en el tiempo del oponente
+PONDER_LIMIT = 60.0  # Máximo de segundos pensando en el tiempo del oponente por jugada
+CANCEL_POLL = 0.01  # Segundos entre los cortes de una búsqueda cancelada hasta que termina
+
+
+class ServiceError(Exception):
+    """Petición inválida; su mensaje se devuelve al cliente"""
+
+
+def player_number(value) -> int:
+    """Valida un identificador de jugador (1 o 2) de una petición"""
+
+    if type(value) is not int or value not in (1, 2):
+        raise ServiceError(f"Jugador inválido: {value!r} (debe ser 1 o 2)")
+    return value
+
+
+def position_cells(size: int, request: dict) -> bytearray:
+    """Casillas (índice plano -> jugador) de la posición de una petición"""
+
+    cells = bytearray(size * size)
+    if "cells" in request:
+        values = request["cells"]
+        if not isinstance(values, list) or len(values) != size * size:
+            raise ServiceError(f"Se esperaban {size * size} casillas")
+        for index, value in enumerate(values):
+            if type(value) is not int or value not in (0, 1, 2):
+                raise ServiceError(
+                    f"Casilla {index} inválida: {value!r} (debe ser 0 vacía, 1 o 2)"
+                )
+        cells[:] = bytes(values)
+        return cells
+    for index, move in enumerate(request.get("moves", ())):
+        if (
+            not isinstance(move, list) or len(move) not in (2, 3)
+            or any(type(value) is not int for value in move)
+        ):
+            raise ServiceError(f"Jugada inválida: {move!r} (debe ser [fila, columna] o [fila, columna, jugador])")
+        row, col = move[0], move[1]
+        player_id = player_number(move[2]) if len(move) > 2 else 1 + index % 2
+        if not (0 <= row < size and 0 <= col < size) or cells[row * size + col]:
+            raise ServiceError(f"Jugada inválida: {move}")
+        cells[row * size + col] = player_id
+    return cells
+
+
+class GameState:
+    """Tablero y jugador de una partida, dentro de su proceso trabajador"""
+
+    def __init__(self, size: int, player_id: int, ponder: bool, options: dict):
+        from player import AI_Player  # Importado aquí: solo los trabajadores lo necesitan
+
+        self.board = HexBoard(size)
+        # Un solo proceso por partida: el paralelismo está entre partidas, y el
+        # trabajador decide cuándo pensar en el tiempo del oponente (sin hilos)
+        self.player = AI_Player(player_id, **dict(options, workers=1, ponder=False))
+        if self.player.scheduler == "cost":
+            # Calibra el ritmo del motor al crear la partida y no en su primera jugada
+            self.player.cost_model.throughput(size)
+        self.ponder = ponder
+        self.ponder_board = None  # Posición tras la última jugada de la IA
+        self.pondered = 0.0  # Segundos pensados en el tiempo del oponente
+
+    def sync(self, cells: bytearray):
+        """
+        Lleva el tablero a la posición dada agregando solo las fichas nuevas;
+        si se quitó o cambió alguna se reconstruye
+        """
+
+        size = self.board.size
+        current = bytearray(value for row in self.board.board for value in row)
+        if any(old and old != new for old, new in zip(current, cells)):
+            self.board = HexBoard(size)
+            current = bytearray(size * size)
+        for node, (old, new) in enumerate(zip(current, cells)):
+            if new and not old:
+                self.board.push(divmod(node, size), new)
+
+    def play(self, cells: bytearray, deadline: float) -> dict:
+        self.ponder_board = None
+        self.sync(cells)
+        board, player = self.board, self.player
+        if board.check_connection(1) or board.check_connection(2):
+            raise ServiceError("La partida ya terminó")
+        if not board.empty_count():
+            raise ServiceError("No quedan casillas vacías")
+
+        start = time.time()
+        player.time_limit = max(MIN_BUDGET, deadline - start)
+        move = player.play(board)
+        response = {"move": list(move), "elapsed": time.time() - start, "pondered": self.pondered}
+
+        self.pondered = 0.0
+        if self.ponder:
+            self.ponder_board = board.clone()
+            self.ponder_board.push(move, player.player_id)
+            if self.ponder_board.check_connection(player.player_id):
+                self.ponder_board = None
+        return response
+
+    def ponder_slice(self):
+        """Un tramo de búsqueda en el tiempo del oponente"""
+
+        predicted = self.player.ponder(self.ponder_board, PONDER_SLICE)
+        self.pondered += PONDER_SLICE
+        # Sin respuesta prevista, con la decisión ya final o tras PONDER_LIMIT se deja de pensar
+        if not predicted or self.player.pondered == float('inf') or self.pondered >= PONDER_LIMIT:
+            self.ponder_board = None
+
+
+def _worker_main(
+    tasks: multiprocessing.Queue, results: multiprocessing.Queue,
+    cancel_target: multiprocessing.Value, cancel_event: multiprocessing.Event
+    ):
+    """
+    Bucle de un proceso trabajador: atiende las tareas en orden y, si no hay
+    ninguna, piensa en el tiempo del oponente de sus partidas por turnos. Un
+    hilo corta la jugada en curso cuando el servicio pone su id en
+    `cancel_target` y avisa con `cancel_event`
+    """
+
+    random.seed()  # Cada proceso con su propia semilla aunque se haya bifurcado
+    games = {}
+    turns = itertools.count()
+    current = [None]  # (id de tarea, partida) de la jugada en curso
+
+    def watch_cancels():
+        while True:
+            cancel_event.wait()
+            cancel_event.clear()
+            # Se repite hasta que termine: la jugada puede no haber fijado aún su límite
+            while (running := current[0]) is not None and running[0] == cancel_target.value:
+                running[1].player.interrupt()
+                time.sleep(CANCEL_POLL)
+
+    threading.Thread(target=watch_cancels, daemon=True).start()
+    while True:
+        pondering = [game for game in games.values() if game.ponder_board is not None]
+        try:
+            task = tasks.get(block=not pondering)
+        except queue.Empty:
+            # Por turnos, para repartir el tiempo entre las partidas
+            pondering[next(turns) % len(pondering)].ponder_slice()
+            continue
+        if task is None:
+            break
+
+        task_id, op, game_id, payload = task
+        try:
+            if op == "new_game":
+                games[game_id] = GameState(**payload)
+                result = {"ok": True}
+            elif op == "play":
+                if game_id not in games:
+                    raise ServiceError(f"Partida desconocida: {game_id}")
+                current[0] = (task_id, games[game_id])
+                # Cancelada antes de empezar: el hilo de cortes ya no la va a ver
+                if cancel_target.value == task_id:
+                    raise ServiceError("cancelled")
+                result = games[game_id].play(payload["cells"], payload["deadline"])
+            elif op == "end_game":
+                game = games.pop(game_id, None)
+                if game is not None:
+                    game.player.close()
+                result = {"ok": True}
+            else:
+                raise ServiceError(f"Operación desconocida: {op}")
+            results.put((task_id, result))
+        except Exception as error:
+            results.put((task_id, {"error": str(error) or type(error).__name__}))
+        finally:
+            current[0] = None
+
+
+class EngineService:
+    """
+    Atiende peticiones con asyncio y reparte las partidas entre `workers`
+    procesos. Cada trabajador tiene a lo sumo una tarea en curso; las demás
+    esperan en su cola del lado del servicio, donde se pueden cancelar
+    """
+
+    def __init__(self, workers: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context()
+        self.results = context.Queue()
+        self.task_queues = [context.Queue() for _ in range(self.workers)]
+        # Id de la tarea en curso a cortar en cada trabajador y el aviso para hacerlo
+        self.cancel_targets = [context.Value("q", -1) for _ in range(self.workers)]
+        self.cancel_events = [context.Event() for _ in range(self.workers)]
+        self.processes = [
+            context.Process(
+                target=_worker_main, args=(tasks, self.results, target, event), daemon=True
+            )
+            for tasks, target, event in zip(
+                self.task_queues, self.cancel_targets, self.cancel_events
+            )
+        ]
+        self.pending = [deque() for _ in range(self.workers)]  # (id de tarea, tarea) en espera
+        self.running = [None] * self.workers  # Id de la tarea en curso de cada trabajador
+        self.futures = {}  # Id de tarea -> futuro con su respuesta
+        self.requests = {}  # Id de petición -> id de tarea, para cancelar
+        self.games = {}  # Partida -> (trabajador, tamaño)
+        self.load = [0] * self.workers  # Partidas asignadas a cada trabajador
+        self.task_ids = itertools.count()
+        self.reader = None
+
+    async def start(self):
+        for process in self.processes:
+            process.start()
+        self.reader = asyncio.create_task(self._read_results())
+
+    async def close(self):
+        for tasks in self.task_queues:
+            tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.results.put(None)
+        if self.reader is not None:
+            await self.reader
+
+    async def _read_results(self):
+        """Recibe las respuestas de los trabajadores y despacha la siguiente tarea"""
+
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, self.results.get)
+            if message is None:
+                break
+            task_id, result = message
+            worker = self.running.index(task_id)
+            self.running[worker] = None
+            future = self.futures.pop(task_id, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+            self._dispatch(worker)
+
+    def _dispatch(self, worker: int):
+        if self.running[worker] is None and self.pending[worker]:
+            task_id, task = self.pending[worker].popleft()
+            self.running[worker] = task_id
+            self.task_queues[worker].put(task)
+
+    def _submit(self, worker: int, op: str, game_id, payload: dict, request_id=None) -> asyncio.Future:
+        task_id = next(self.task_ids)
+        future = asyncio.get_running_loop().create_future()
+        self.futures[task_id] = future
+        if request_id is not None:
+            self.requests[request_id] = (worker, task_id)
+        self.pending[worker].append((task_id, (task_id, op, game_id, payload)))
+        self._dispatch(worker)
+        return future
+
+    async def handle(self, request: dict) -> dict:
+        """Resuelve una petición y devuelve su respuesta (sin el "id")"""
+
+        op = request.get("op")
+        game_id = request.get("game")
+        if op == "new_game":
+            if game_id in self.games:
+                raise ServiceError(f"La partida ya existe: {game_id}")
+            size = int(request["size"])
+            if size < 1:
+                raise ServiceError(f"Tamaño inválido: {size}")
+            payload = {
+                "size": size, "player_id": player_number(request["player"]),
+                "ponder": bool(request.get("ponder", False)),
+                "options": request.get("options", {}),
+            }
+            # Se registra solo una vez validada, para no dejar partidas fantasma
+            worker = self.load.index(min(self.load))
+            self.games[game_id] = (worker, size)
+            self.load[worker] += 1
+            result = await self._submit(worker, op, game_id, payload)
+            if "error" in result:
+                self._forget(game_id)
+            return result
+        if op == "play":
+            worker, size = self._game(game_id)
+            budget = float(request.get("time", DEFAULT_BUDGET))
+            payload = {"cells": position_cells(size, request), "deadline": time.time() + budget}
+            request_id = request.get("id")
+            try:
+                return await self._submit(worker, op, game_id, payload, request_id)
+            finally:
+                self.requests.pop(request_id, None)
+        if op == "cancel":
+            return {"ok": self.cancel(request.get("target"))}
+        if op == "end_game":
+            worker, _ = self._game(game_id)
+            self._forget(game_id)
+            return await self._submit(worker, op, game_id, {})
+        if op == "stats":
+            return {
+                "games": len(self.games), "load": self.load,
+                "queued": [len(pending) for pending in self.pending],
+                "busy": [task_id is not None for task_id in self.running],
+            }
+        raise ServiceError(f"Operación desconocida: {op}")
+
+    def cancel(self, request_id) -> bool:
+        """
+        Cancela una petición de jugada en cola o en curso (el trabajador corta
+        la búsqueda); False si no existe
+        """
+
+        if request_id not in self.requests:
+            return False
+        worker, task_id = self.requests.pop(request_id)
+        pending = self.pending[worker]
+        for index, (queued_id, _) in enumerate(pending):
+            if queued_id == task_id:
+                del pending[index]
+                break
+        else:
+            if self.running[worker] == task_id:
+                self.cancel_targets[worker].value = task_id
+                self.cancel_events[worker].set()
+        # Si ya se está buscando, su resultado se descartará al llegar
+        future = self.futures.pop(task_id, None)
+        if future is not None and not future.done():
+            future.set_result({"error": "cancelled"})
+        return True
+
+    def _game(self, game_id) -> tuple[int, int]:
+        if game_id not in self.games:
+            raise ServiceError(f"Partida desconocida: {game_id}")
+        return self.games[game_id]
+
+    def _forget(self, game_id):
+        worker, _ = self.games.pop(game_id)
+        self.load[worker] -= 1
+
+    async def respond(self, line: bytes, write):
+        """Atiende una línea del protocolo y escribe su respuesta con `write`"""
+
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ServiceError("La petición debe ser un objeto JSON")
+            request_id = request.get("id")
+            response = await self.handle(request)
+        except (ServiceError, ValueError, KeyError, TypeError) as error:
+            response = {"error": str(error) or type(error).__name__}
+        write(json.dumps(dict(response, id=request_id)).encode() + b"\n")
+
+    async def serve_stream(self, reader: asyncio.StreamReader, write):
+        """Lee peticiones de `reader` hasta que se cierra, atendiéndolas en paralelo"""
+
+        tasks = set()
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            task = asyncio.create_task(self.respond(line, write))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+
+async def serve_stdio(service: EngineService):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    def write(data: bytes):
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    await service.serve_stream(reader, write)
+
+
+async def serve_socket(service: EngineService, host: str = None, port: int = None, path: str = None):
+    async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await service.serve_stream(reader, writer.write)
+        finally:
+            writer.close()
+
+    if path is not None:
+        server = await asyncio.start_unix_server(connection, path)
+    else:
+        server = await asyncio.start_server(connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def run(args: argparse.Namespace):
+    service = EngineService(args.workers)
+    await service.start()
+    try:
+        if args.stdio:
+            await serve_stdio(service)
+        else:
+            await serve_socket(service, args.host, args.port, args.unix)
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio de motor de Hex (líneas JSON)")
+    parser.add_argument("--stdio", action="store_true", help="Atender por la entrada/salida estándar")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Ruta de un socket Unix en lugar de TCP")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos de búsqueda (por defecto, uno por núcleo)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
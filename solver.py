@@ -0,0 +1,172 @@
+"""
+Solucionador exacto de finales con búsqueda de números de prueba en
+profundidad (DFPN). Cada nodo guarda dos números desde el jugador por mover:
+phi, cuántas hojas falta probar para demostrar que gana, y delta, cuántas
+para demostrar que pierde. En Hex no hay empates, así que todo nodo termina
+probado en un sentido o en el otro:
+
+    phi(n) = min delta(hijo)        delta(n) = suma phi(hijo)
+
+Siempre se baja por el hijo con menor delta, con umbrales que evitan volver
+a la raíz hasta que se excedan (regla 1 + epsilon). Las hojas se cierran con
+las jugadas ganadoras inmediatas y las conexiones virtuales, y se generan
+solo las jugadas de `inferior.candidate_moves`. Los nodos se guardan en una
+tabla de tamaño fijo indexada por hash, como la tabla de transposición.
+"""
+import time
+from board import HexBoard
+from transposition import SIDE_TO_MOVE_KEY
+from virtual import connecting_move, virtual_connection, winning_cells
+from inferior import candidate_moves
+
+INF = 1 << 40  # Número de prueba de un nodo ya probado en el otro sentido
+ENTRY_BYTES = 120  # Tamaño aproximado en bytes de una entrada (tupla de 5 campos)
+EPSILON = 0.25  # Margen de la regla 1 + epsilon para el umbral del mejor hijo
+
+# Resultados de `solve` para el jugador por mover
+WIN, LOSS, UNKNOWN = 1, -1, 0
+
+
+class SolverTimeout(Exception):
+    """Se lanza dentro de la búsqueda al vencer el tiempo o el límite de nodos"""
+
+
+class ProofNumberSolver:
+    """
+    DFPN con tabla acotada de `max_megabytes`. Cada casilla de la tabla guarda
+    (hash, phi, delta, trabajo, mejor jugada). Una posición puede ir en dos
+    casillas vecinas: al guardar se usa la suya si ya está o la de menos
+    trabajo, así que el último resultado de un nodo nunca se pierde (si se
+    perdiera, su padre lo volvería a expandir sin fin)
+    """
+
+    def __init__(self, max_megabytes: float = 16):
+        self.capacity = max(2, int(max_megabytes * 2 ** 20) // ENTRY_BYTES)
+        self.slots = [None] * self.capacity
+        self.nodes = 0  # Nodos expandidos en la última llamada a `solve`
+        self.deadline = None
+        self.max_nodes = None
+
+    def solve(
+        self, board: HexBoard, player_id: int, deadline: float = None,
+        max_nodes: int = None
+        ) -> tuple[int, tuple[int, int]]:
+        """
+        Resuelve la posición con `player_id` por mover. Devuelve (WIN, jugada
+        ganadora), (LOSS, ()) o (UNKNOWN, ()) si vence `deadline` o se
+        expanden `max_nodes` nodos antes de probarla
+        """
+
+        if board.check_connection(3 - player_id):
+            return LOSS, ()
+        self.nodes = 0
+        self.deadline = deadline
+        self.max_nodes = max_nodes
+        key = self._key(board.hash, player_id)
+        try:
+            phi, delta = self._mid(board, player_id, key, INF, INF)
+        except SolverTimeout:
+            return UNKNOWN, ()
+        finally:
+            self.deadline = self.max_nodes = None
+        if phi == 0:
+            # Si la raíz ya era una hoja ganada no hay hijo guardado
+            entry = self._entry(key)
+            move = entry[4] if entry is not None else ()
+            return WIN, move or connecting_move(board, player_id)
+        return LOSS, ()
+
+    @staticmethod
+    def _key(position_hash: int, player_id: int) -> int:
+        return position_hash ^ SIDE_TO_MOVE_KEY if player_id == 2 else position_hash
+
+    def _entry(self, key: int) -> tuple | None:
+        index = key % self.capacity
+        for entry in (self.slots[index], self.slots[index ^ 1]):
+            if entry is not None and entry[0] == key:
+                return entry
+        return None
+
+    def _lookup(self, key: int) -> tuple[int, int]:
+        entry = self._entry(key)
+        if entry is None:
+            return 1, 1
+        return entry[1], entry[2]
+
+    def _store(self, key: int, phi: int, delta: int, work: int, move: tuple = ()):
+        index = key % self.capacity
+        slots = self.slots
+        first, second = slots[index], slots[index ^ 1]
+        if second is not None and second[0] == key:
+            index ^= 1
+        elif not (first is None or first[0] == key) and (second is None or second[3] < first[3]):
+            index ^= 1
+        slots[index] = (key, phi, delta, work, move)
+
+    def _leaf(self, board: HexBoard, player_id: int) -> tuple[int, int] | None:
+        """Resultado inmediato de la posición (phi, delta) o None si hay que expandirla"""
+
+        if winning_cells(board, player_id):
+            return 0, INF
+        if virtual_connection(board, 3 - player_id) is not None:
+            return INF, 0
+        if virtual_connection(board, player_id) is not None:
+            return 0, INF
+        return None
+
+    def _mid(
+        self, board: HexBoard, player_id: int, key: int, phi_limit: int, delta_limit: int
+        ) -> tuple[int, int]:
+        """
+        Expande el nodo hasta que phi o delta alcancen su umbral y devuelve
+        sus números de prueba
+        """
+
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SolverTimeout()
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SolverTimeout()
+        self.nodes += 1
+        start_nodes = self.nodes
+
+        result = self._leaf(board, player_id)
+        if result is not None:
+            self._store(key, *result, 1)
+            return result
+
+        opponent = 3 - player_id
+        zobrist = board.zobrist[player_id]
+        size = board.size
+        children = [
+            (move, self._key(board.hash ^ zobrist[move[0] * size + move[1]], opponent))
+            for move in candidate_moves(board, player_id)
+        ]
+
+        while True:
+            # phi: el mejor hijo para el jugador por mover; delta: todos sus hijos
+            best = second = INF
+            best_index = 0
+            delta = 0
+            for index, (_, child_key) in enumerate(children):
+                child_phi, child_delta = self._lookup(child_key)
+                delta = min(INF, delta + child_phi)
+                if child_delta < best:
+                    best, second, best_index = child_delta, best, index
+                elif child_delta < second:
+                    second = child_delta
+            phi = best
+            if phi >= phi_limit or delta >= delta_limit:
+                break
+
+            move, child_key = children[best_index]
+            child_phi, child_delta = self._lookup(child_key)
+            child_phi_limit = min(INF, delta_limit - delta + child_phi)
+            child_delta_limit = min(phi_limit, int(second * (1 + EPSILON)) + 1)
+            board.push(move, player_id)
+            try:
+                self._mid(board, opponent, child_key, child_phi_limit, child_delta_limit)
+            finally:
+                board.pop()
+
+        self._store(key, phi, delta, self.nodes - start_nodes + 1, children[best_index][0])
+        return phi, delta
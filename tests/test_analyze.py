@@ -0,0 +1,47 @@
+import json
+from analyze import DEFAULT_ENGINE, analyze, analyze_position
+from numpy import random
+from benchmark import parse_engine
+
+
+def test_invalid_positions_report_readable_errors():
+    _, config = parse_engine(DEFAULT_ENGINE)
+    errors = [
+        analyze_position(0, line, config, 0, 0, 0).get("error")
+        for line in (
+            '{"size": 2, "cells": [0, 3, 0, 0]}',
+            '{"size": 2, "cells": [0, 1, 0, 0], "to_move": 3}',
+            '{"size": "2", "moves": []}',
+            '{"cells": []}',
+            '[1, 2]',
+        )
+    ]
+    assert all(errors)
+    assert "Casilla 1" in errors[0]
+    assert "Jugador inválido" in errors[1]
+    assert all("Tamaño inválido" in error for error in errors[2:4])
+
+
+def test_default_engine_results_do_not_depend_on_workers():
+    _, config = parse_engine(DEFAULT_ENGINE)
+    # Con el centro ocupado, para que se busque (Monte Carlo, Minimax o solucionador)
+    rng = random.default_rng(0)
+    positions = []
+    for index in range(12):
+        size = 5 if index % 2 else 7
+        moves = [[size // 2, size // 2, 1]]
+        for node in rng.permutation(size * size)[:int(rng.integers(2, size * size // 2))]:
+            if node != size // 2 * (size + 1):
+                moves.append([int(node) // size, int(node) % size, 2 - len(moves) % 2])
+        positions.append(json.dumps({"id": index, "size": size, "moves": moves}))
+
+    def run(workers):
+        return [
+            {key: value for key, value in result.items() if key != "time"}
+            for result in analyze(positions, config, workers, solver_cells=14)
+        ]
+
+    serial = run(1)
+    assert all("move" in result for result in serial)
+    assert any(result["solved"] for result in serial)
+    assert run(2) == serial
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from board import HexBoard
+from mcts import MCTS
+import batch_playouts
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 11])
+def test_winners_match_the_scalar_check(size):
+    rng = np.random.default_rng(size)
+    boards = rng.integers(1, 3, (300, size * size), dtype=np.uint8)
+    expected = [MCTS.winner(bytearray(board), size) for board in boards]
+    assert batch_playouts.winners(boards, size).tolist() == expected
+
+
+def partial_board(size: int, stones: int, seed: int) -> HexBoard:
+    board = HexBoard(size)
+    rng = np.random.default_rng(seed)
+    for turn in range(stones):
+        board.push(board.random_move(rng.integers), 1 + turn % 2)
+    return board
+
+
+@pytest.mark.parametrize("size, stones, to_move", [(3, 0, 1), (4, 5, 2), (5, 8, 1), (7, 17, 2)])
+def test_fill_boards_keeps_stones_and_splits_empty_cells(size, stones, to_move):
+    cells = batch_playouts.board_cells(partial_board(size, stones, size))
+    empty = np.flatnonzero(cells == 0)
+    boards = batch_playouts.fill_boards(np.tile(cells, (50, 1)), to_move, np.random.default_rng(0))
+    assert (boards != 0).all()
+    assert (boards[:, cells != 0] == cells[cells != 0]).all()
+    # El jugador por mover recibe la mitad (redondeada hacia arriba) de las vacías
+    mover = (boards[:, empty] == to_move).sum(axis=1)
+    assert (mover == (len(empty) + 1) // 2).all()
+
+
+def test_reserved_cell_goes_to_the_other_player():
+    cells = batch_playouts.board_cells(partial_board(5, 6, 1))
+    empty = np.flatnonzero(cells == 0)
+    rng = np.random.default_rng(1)
+    reserved = rng.integers(0, len(empty), 40)
+    boards = batch_playouts.fill_boards(np.tile(cells, (40, 1)), 1, rng, reserved)
+    assert (boards[np.arange(40), empty[reserved]] == 2).all()
+    assert ((boards[:, empty] == 1).sum(axis=1) == len(empty) // 2).all()
+    assert (boards[:, cells != 0] == cells[cells != 0]).all()
@@ -0,0 +1,36 @@
+import benchmark
+from player import AI_Player
+
+
+class CornerPlayer(AI_Player):
+    """Juega siempre en la misma esquina, aunque esté ocupada"""
+
+    def play(self, board):
+        return (0, 0)
+
+
+def test_illegal_move_forfeits_the_game(monkeypatch):
+    monkeypatch.setattr(benchmark, "AI_Player", CornerPlayer)
+    wins = benchmark.head_to_head(3, {}, {}, games=2, seed=0)
+    # El jugador 2 repite la casilla del jugador 1 y pierde las dos partidas
+    assert wins == {"a": 1, "b": 1, "a_as_1": 1, "b_as_1": 1, "forfeits": 2}
+
+
+def test_minimax_rate_counts_each_node_once(monkeypatch):
+    players, calls = [], []
+
+    class TracingPlayer(AI_Player):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            players.append(self)
+
+        def minimax(self, *args, **kwargs):
+            calls.append(1)
+            return super().minimax(*args, **kwargs)
+
+    monkeypatch.setattr(benchmark, "AI_Player", TracingPlayer)
+    board = benchmark.build_corpus([4], 1, seed=0)[(4, "middle")][0]
+    assert benchmark.bench_minimax(board, {}, budget=0.05) > 0
+    # Los nodos/s salen de `AI_Player.nodes`, que cuenta cada llamada una sola
+    # vez (menos la que se corta por tiempo antes de contarse)
+    assert len(calls) - 1 <= players[0].nodes <= len(calls)
@@ -0,0 +1,104 @@
+import random
+import pytest
+from board import HexBoard, CompactHexBoard
+
+BOARDS = (HexBoard, CompactHexBoard)
+
+
+def state(board: HexBoard) -> tuple:
+    """Todo lo que push/pop deben dejar igual"""
+
+    return (
+        [list(row) for row in board.board], board.hash, sorted(board.empty),
+        {player_id: sorted(board.player_positions[player_id]) for player_id in (1, 2)},
+        {player_id: board.parent[player_id][:] for player_id in (1, 2)},
+        {player_id: board.rank[player_id][:] for player_id in (1, 2)},
+        [move[:3] for move in board.history],
+    )
+
+
+def connected(board: HexBoard, player_id: int) -> bool:
+    """Conexión calculada desde cero con una búsqueda sobre la matriz"""
+
+    size = board.size
+    stack = [
+        (row, col) for row in range(size) for col in range(size)
+        if board.board[row][col] == player_id and (col if player_id == 1 else row) == 0
+    ]
+    seen = set(stack)
+    while stack:
+        row, col = stack.pop()
+        if (col if player_id == 1 else row) == size - 1:
+            return True
+        for dx, dy in ((0, 1), (0, -1), (1, -1), (1, 0), (-1, 1), (-1, 0)):
+            cell = (row + dx, col + dy)
+            if (
+                0 <= cell[0] < size and 0 <= cell[1] < size and cell not in seen
+                and board.board[cell[0]][cell[1]] == player_id
+            ):
+                seen.add(cell)
+                stack.append(cell)
+    return False
+
+
+@pytest.mark.parametrize("cls", BOARDS)
+def test_push_pop_round_trip(cls):
+    rng = random.Random(1)
+    for size in (3, 5, 7):
+        board = cls(size)
+        snapshots = [state(board)]
+        player_id = 1
+        while board.empty:
+            board.push(board.random_move(rng.randrange), player_id)
+            player_id = 3 - player_id
+            snapshots.append(state(board))
+            for pid in (1, 2):
+                assert board.check_connection(pid) == connected(board, pid)
+        while board.history:
+            snapshots.pop()
+            board.pop()
+            assert state(board) == snapshots[-1]
+
+
+@pytest.mark.parametrize("cls", BOARDS)
+def test_push_rejects_occupied_cell(cls):
+    board = cls(3)
+    assert board.push((1, 1), 1)
+    before = state(board)
+    assert not board.push((1, 1), 2)
+    assert state(board) == before
+
+
+@pytest.mark.parametrize("cls", BOARDS)
+def test_remove_piece_keeps_move_order(cls):
+    board = cls(5)
+    moves = [(4, 4, 1), (0, 0, 2), (2, 2, 1), (1, 3, 2), (3, 1, 1)]
+    for row, col, player_id in moves:
+        board.push((row, col), player_id)
+    assert board.remove_piece(0, 0)
+
+    expected = [move for move in moves if move[:2] != (0, 0)]
+    assert [move[:3] for move in board.history] == expected
+    assert [move[:3] for move in cls.from_bytes(board.to_bytes()).history] == expected
+
+    fresh = cls(5)
+    for row, col, player_id in expected:
+        fresh.push((row, col), player_id)
+    assert state(board) == state(fresh)
+
+
+@pytest.mark.parametrize("cls", BOARDS)
+def test_remove_piece_then_pop_restores_connections(cls):
+    rng = random.Random(2)
+    board = cls(6)
+    player_id = 1
+    for _ in range(20):
+        board.push(board.random_move(rng.randrange), player_id)
+        player_id = 3 - player_id
+    row, col, _, _ = board.history[5]
+    board.remove_piece(row, col)
+    while board.history:
+        board.pop()
+        for pid in (1, 2):
+            assert board.check_connection(pid) == connected(board, pid)
+    assert state(board) == state(cls(6))
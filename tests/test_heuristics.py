@@ -0,0 +1,22 @@
+from numpy import random
+from board import HexBoard
+from heuristics import DistanceMaps, distance_map
+
+
+def test_distance_maps_match_a_full_recomputation_after_push_and_pop():
+    random.seed(0)
+    maps = DistanceMaps()
+    for size in (5, 7):
+        board = HexBoard(size)
+        player_id = 1
+        for _ in range(300):
+            if board.history and (random.random() < 0.4 or not board.empty_count()):
+                board.pop()
+                player_id = 3 - player_id
+            else:
+                board.push(board.random_move(random.randint), player_id)
+                player_id = 3 - player_id
+            maps.sync(board)
+            cells = bytearray(value for row in board.board for value in row)
+            for pid in (1, 2):
+                assert maps.maps[pid] == distance_map(cells, size, pid)
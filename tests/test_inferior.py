@@ -0,0 +1,100 @@
+import itertools
+from functools import lru_cache
+from numpy import random
+from board import HexBoard
+from mcts import MCTS
+from inferior import board_cells, candidate_moves, inferior_cells
+
+
+def solver(size: int):
+    """Ganador por fuerza bruta de una posición (celdas, jugador por mover)"""
+
+    @lru_cache(maxsize=None)
+    def winner(cells: bytes, to_move: int) -> int:
+        empty = [index for index, value in enumerate(cells) if not value]
+        if not empty:
+            return MCTS.winner(cells, size)
+        results = [
+            winner(cells[:index] + bytes((to_move,)) + cells[index + 1:], 3 - to_move)
+            for index in empty
+        ]
+        return to_move if to_move in results else 3 - to_move
+
+    return winner
+
+
+def random_positions(count: int, seed: int, max_empty: int = 8):
+    rng = random.default_rng(seed)
+    for _ in range(count):
+        size = int(rng.integers(3, 5))
+        board = HexBoard(size)
+        player_id = 1
+        while board.empty_count() > max_empty or rng.random() < 0.3:
+            board.push(board.random_move(rng.integers), player_id)
+            player_id = 3 - player_id
+            if board.check_connection(1) or board.check_connection(2):
+                break
+        if not (board.check_connection(1) or board.check_connection(2)):
+            yield board, player_id
+
+
+def test_dead_cells_never_change_the_winner():
+    checked = 0
+    for board, player_id in random_positions(60, seed=0):
+        size = board.size
+        cells = board_cells(board)
+        dead = inferior_cells(board, player_id)[0]
+        empty = [index for index, value in enumerate(cells) if not value]
+        for node in dead:
+            others = [index for index in empty if index != node]
+            for colors in itertools.product((1, 2), repeat=len(others)):
+                filled = bytearray(cells)
+                for index, color in zip(others, colors):
+                    filled[index] = color
+                filled[node] = 1
+                first = MCTS.winner(filled, size)
+                filled[node] = 2
+                assert MCTS.winner(filled, size) == first
+            checked += 1
+    assert checked > 0
+
+
+def test_captured_pairs_can_be_filled_by_their_owner():
+    checked = 0
+    for board, player_id in random_positions(150, seed=1):
+        winner = solver(board.size)
+        cells = bytes(board_cells(board))
+        captured = inferior_cells(board, player_id)[1]
+        values = {to_move: winner(cells, to_move) for to_move in (1, 2)}
+        for node in captured:
+            # Algún jugador puede quedarse con la casilla sin cambiar el resultado
+            assert any(
+                all(
+                    winner(cells[:node] + bytes((owner,)) + cells[node + 1:], to_move) == value
+                    for to_move, value in values.items()
+                )
+                for owner in (1, 2)
+            )
+            checked += 1
+    assert checked > 0
+
+
+def test_pruned_moves_keep_a_winning_move():
+    checked = 0
+    for board, player_id in random_positions(150, seed=2):
+        winner = solver(board.size)
+        size = board.size
+        cells = bytes(board_cells(board))
+        if winner(cells, player_id) != player_id:
+            continue
+        moves = candidate_moves(board, player_id)
+        assert any(
+            winner(
+                cells[:row * size + col] + bytes((player_id,)) + cells[row * size + col + 1:],
+                3 - player_id
+            ) == player_id
+            for row, col in moves
+        )
+        if len(moves) < board.empty_count():
+            checked += 1
+    assert checked > 0
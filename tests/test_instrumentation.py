@@ -0,0 +1,49 @@
+from numpy import random
+from board import HexBoard, CompactHexBoard
+from player import AI_Player
+from instrumentation import PlayStats
+
+
+def test_watched_clones_check_their_own_stones():
+    player = AI_Player(1, instrument=True)
+    instrumentation = player.instrumentation
+    instrumentation.current = PlayStats()
+    for board_class in (HexBoard, CompactHexBoard):
+        board = board_class(3)
+        instrumentation._watch_board(board)
+        cloned = board.clone()
+        for row in range(3):
+            cloned.push((row, 0), 2)
+        assert cloned.check_connection(2) and not board.check_connection(2)
+        instrumentation._unwatch_board(board)
+    assert instrumentation.current.connection_checks == 4
+
+
+def test_instrumentation_does_not_change_the_move():
+    # Con límite de tiempo la profundidad iterativa busca sobre una copia del
+    # tablero; en estos finales termina todas las profundidades antes del límite
+    rng = random.default_rng(0)
+    searched = 0
+    for _ in range(100):
+        board = CompactHexBoard(5)
+        board.push((2, 2), 1)
+        player_id = 2
+        while board.empty_count() > 14:
+            board.push(board.random_move(rng.integers), player_id)
+            player_id = 3 - player_id
+        if board.check_connection(1) or board.check_connection(2):
+            continue
+        moves = []
+        for instrument in (False, True):
+            random.seed(0)
+            player = AI_Player(
+                player_id, time_limit=30, scheduler="phase", solver_threshold=0,
+                instrument=instrument
+            )
+            moves.append(player.play(board.clone()))
+        assert moves[0] == moves[1]
+        stats = player.instrumentation.last
+        if stats.branch == "minimax":
+            assert stats.connection_checks > 0
+            searched += 1
+    assert searched > 0
@@ -0,0 +1,56 @@
+from numpy import random
+from board import HexBoard
+from mcts import MCTS
+
+
+def check_tree(node, cells: bytearray):
+    """Los hijos de cada nodo son casillas vacías distintas en su posición"""
+
+    for move, child in node.children.items():
+        assert move == child.move and not cells[move]
+        assert child.player == 3 - node.player
+        cells[move] = child.player
+        check_tree(child, cells)
+        cells[move] = 0
+
+
+def test_tree_expands_each_empty_cell_once():
+    random.seed(0)
+    board = HexBoard(4)
+    board.push((1, 1), 1)
+    board.push((2, 2), 2)
+    engine = MCTS(1)
+    engine.search(board, 3000)
+    cells = bytearray(value for row in board.board for value in row)
+    check_tree(engine.root, cells)
+    # Con 3000 simulaciones la raíz y sus hijos más visitados quedan expandidos del todo
+    assert len(engine.root.children) == 14
+    best = max(engine.root.children.values(), key=lambda child: child.visits)
+    assert len(best.children) == 13
+
+
+def test_root_moves_are_limited_and_tree_is_reused():
+    random.seed(1)
+    board = HexBoard(5)
+    engine = MCTS(1)
+    moves = [(2, 2), (1, 3), (3, 1)]
+    assert engine.search(board, 300, moves=moves) in moves
+    assert {divmod(move, 5) for move in engine.root.children} == set(moves)
+
+    move = max(engine.root.children.values(), key=lambda child: child.visits)
+    reply = max(move.children.values(), key=lambda child: child.visits)
+    board.push(divmod(move.move, 5), 1)
+    board.push(divmod(reply.move, 5), 2)
+    engine.search(board, 100)
+    assert engine.root is reply
+    check_tree(engine.root, bytearray(value for row in board.board for value in row))
+
+
+def test_search_without_time_returns_an_allowed_move():
+    board = HexBoard(5)
+    board.push((2, 2), 1)
+    moves = [(4, 4), (3, 1)]
+    engine = MCTS(2)
+    # Tiempo agotado antes de la primera simulación
+    assert engine.search(board, 100, deadline=0.0, moves=moves) == (4, 4)
+    assert engine.playouts == 0
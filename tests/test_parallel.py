@@ -0,0 +1,56 @@
+import time
+from board import HexBoard
+from player import AI_Player
+from instrumentation import PlayStats
+import parallel
+
+
+def test_worker_players_follow_the_parent_options():
+    options = tuple(sorted({"evaluator": "two_distance", "move_filter": "zone"}.items()))
+    ai = parallel._worker_player(1, 1, options)
+    assert ai.evaluator == "two_distance" and ai.move_filter == "zone"
+    assert parallel._worker_player(1, 1, options) is ai
+    # Otra tabla u otras opciones no reutilizan el jugador del proceso
+    assert parallel._worker_player(1, 2, options) is not ai
+    assert parallel._worker_player(1, 1, ()).evaluator == "distance"
+
+
+def test_parallel_search_limits_the_root_to_candidate_moves():
+    board = HexBoard(4)
+    board.push((1, 1), 1)
+    board.push((2, 2), 2)
+    with AI_Player(1, workers=2, move_filter="zone") as ai:
+        moves = ai.candidate_moves(board, 1)[:3]
+        move, _ = ai.pool.minimax(board, 1, 2, moves=moves)
+        assert move in moves
+        move, playouts = ai.pool.monte_carlo(board, 1, 50, moves=moves)
+        assert move in moves and playouts == 2 * 50
+    assert ai.pool is None
+
+
+def test_instrumented_parallel_search_accepts_candidate_moves():
+    board = HexBoard(4)
+    board.push((1, 1), 1)
+    board.push((2, 2), 2)
+    with AI_Player(1, workers=2, instrument=True) as ai:
+        stats = ai.instrumentation.current = PlayStats()
+        move, _ = ai.pool.minimax(board, 1, 2, moves=ai.candidate_moves(board, 1))
+        assert move in board.get_possible_moves()
+        assert stats.branch == "minimax" and stats.depth == 2
+
+
+def test_parallel_monte_carlo_without_time_returns_a_candidate():
+    board = HexBoard(4)
+    board.push((1, 1), 1)
+    with AI_Player(2, workers=2, move_filter="zone") as ai:
+        moves = ai.candidate_moves(board, 2)
+        # El tiempo ya se acabó: ningún proceso simula
+        assert ai.pool.monte_carlo(board, 2, 50, time.perf_counter() - 1, moves=moves) == (moves[0], 0)
+
+
+def test_parallel_monte_carlo_counts_the_playouts_of_every_worker():
+    board = HexBoard(5)
+    board.push((2, 2), 1)
+    with AI_Player(2, workers=2, mc_engine="uct") as ai:
+        ai.tree_monte_carlo(board, 2, 40)
+        assert ai.playouts == 2 * 40
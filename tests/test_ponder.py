@@ -0,0 +1,47 @@
+import time
+import pytest
+from board import HexBoard
+from player import AI_Player
+
+TIME_LIMIT = 0.2
+
+
+def pondering_player() -> tuple[AI_Player, HexBoard, tuple[int, int]]:
+    """Jugador 1 que ya jugó y pensó al menos `TIME_LIMIT` en la respuesta prevista"""
+
+    board = HexBoard(5)
+    for move, player_id in (((2, 2), 1), ((1, 3), 2), ((3, 1), 1), ((2, 3), 2)):
+        board.push(move, player_id)
+    ai = AI_Player(1, time_limit=TIME_LIMIT, ponder=True, scheduler="phase", solver_threshold=0)
+    move = ai.play(board)
+    board.push(move, 1)
+    limit = time.perf_counter() + 10
+    while ai.pondered < TIME_LIMIT and time.perf_counter() < limit:
+        time.sleep(0.01)
+    assert ai.ponder_board is not None and ai.ponder_move is not None
+    return ai, board, ai.ponder_board.history[-1][:2]
+
+
+def test_ponder_hit_answers_without_searching():
+    ai, board, reply = pondering_player()
+    with ai:
+        ai.stop_pondering()
+        pondered = ai.ponder_move
+        ai.timed_select_move = lambda *args: pytest.fail("No debía buscar")
+        board.push(reply, 2)
+        move = ai.play(board)
+        assert move == pondered and not board.board[move[0]][move[1]]
+    assert ai.ponder_thread is None
+
+
+def test_ponder_miss_searches_the_actual_position():
+    ai, board, reply = pondering_player()
+    searched = []
+    with ai:
+        select = ai.timed_select_move
+        ai.timed_select_move = lambda *args: searched.append(args) or select(*args)
+        other = next(move for move in board.get_possible_moves() if move != reply)
+        board.push(other, 2)
+        move = ai.play(board)
+        assert searched and not board.board[move[0]][move[1]]
+    assert ai.ponder_thread is None
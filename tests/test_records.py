@@ -0,0 +1,15 @@
+import numpy as np
+from records import GameReader, GameWriter
+
+
+def test_numpy_flat_moves_round_trip(tmp_path):
+    path = str(tmp_path / "partidas.hexr")
+    moves = np.array([4, 0, 8, 2], dtype=np.int64)
+    with GameWriter(path) as writer:
+        writer.write(3, moves, winner=1)
+        writer.write(3, [(1, 1, 1), (0, 0, 2)])
+    with GameReader(path) as reader:
+        first, second = list(reader)
+        assert first.moves() == [(1, 1, 1), (0, 0, 2), (2, 2, 1), (0, 2, 2)]
+        assert first.winner == 1
+        assert second.moves() == [(1, 1, 1), (0, 0, 2)]
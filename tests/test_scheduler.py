@@ -0,0 +1,36 @@
+import gc
+import time
+from board import HexBoard
+from player import AI_Player
+import scheduler
+
+
+def opening(size: int) -> HexBoard:
+    board = HexBoard(size)
+    board.push((size // 2, size // 2), 1)
+    board.push((0, 0), 2)
+    return board
+
+
+def test_pending_calibration_fits_in_the_first_timed_move():
+    for size, time_limit in ((11, 0.1), (15, 0.1)):
+        with AI_Player(1, time_limit=time_limit) as ai:
+            key = (
+                size, ai.mc_engine, ai.playout_policy, ai.evaluator,
+                ai.move_filter, ai.move_ordering
+            )
+            scheduler._calibrations.pop(key, None)
+            gc.collect()  # Sin pausas del recolector por objetos de otras pruebas
+            start = time.perf_counter()
+            ai.play(opening(size))
+            # Una calibración completa tarda unos 0.3 s por sí sola
+            assert time.perf_counter() - start < time_limit + 0.1
+            # La calibración acortada no se comparte con otros jugadores
+            assert key not in scheduler._calibrations and size in ai.cost_model.rates
+
+
+def test_no_time_to_calibrate_uses_default_rates():
+    ai = AI_Player(1)
+    rates = ai.cost_model.throughput(17, budget=scheduler.MIN_CALIBRATION / 2)
+    assert rates.nodes_per_second == scheduler.DEFAULT_NODES_PER_SECOND
+    assert rates.playouts_per_second == scheduler.DEFAULT_PLAYOUTS_PER_SECOND
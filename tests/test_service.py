@@ -0,0 +1,72 @@
+import asyncio
+import json
+import time
+import pytest
+from service import EngineService, ServiceError, position_cells
+
+
+@pytest.mark.parametrize("request_", [
+    {"cells": [0, 3, 0, 0]},
+    {"cells": [0, 1, 0, True]},
+    {"cells": [0, 1, 0]},
+    {"moves": [[0, 0, 5]]},
+    {"moves": [[0, "1"]]},
+    {"moves": [[0, 0], [0, 0]]},
+])
+def test_position_cells_rejects_bad_values(request_):
+    with pytest.raises(ServiceError):
+        position_cells(2, request_)
+
+
+def test_position_cells():
+    assert position_cells(2, {"cells": [0, 1, 2, 0]}) == bytearray([0, 1, 2, 0])
+    assert position_cells(2, {"moves": [[0, 1], [1, 0], [1, 1, 1]]}) == bytearray([0, 1, 2, 1])
+
+
+def test_cancel_interrupts_the_running_search():
+    async def scenario():
+        service = EngineService(workers=1)
+        await service.start()
+        try:
+            for request in (
+                {"op": "new_game", "game": "x", "size": 7, "player": 3},
+                {"op": "new_game", "game": "x", "size": 0, "player": 1},
+            ):
+                with pytest.raises(ServiceError):
+                    await service.handle(request)
+            # Las peticiones rechazadas no dejan partidas registradas
+            stats = await service.handle({"op": "stats"})
+            assert stats["games"] == 0 and stats["load"] == [0]
+            assert "ok" in await service.handle({"op": "new_game", "game": "x", "size": 3, "player": 1})
+            assert "ok" in await service.handle({"op": "end_game", "game": "x"})
+            assert "ok" in await service.handle({
+                "op": "new_game", "game": "g", "size": 7, "player": 1,
+                "options": {"scheduler": "phase", "mc_engine": "uct"}
+            })
+            long_play = asyncio.create_task(service.handle(
+                {"id": 1, "op": "play", "game": "g", "moves": [[3, 3], [2, 2]], "time": 30.0}
+            ))
+            await asyncio.sleep(0.5)
+            assert service.cancel(1)
+            assert await long_play == {"error": "cancelled"}
+            # El trabajador queda libre enseguida para la siguiente jugada
+            start = time.perf_counter()
+            result = await service.handle(
+                {"id": 2, "op": "play", "game": "g", "moves": [[3, 3], [2, 2], [4, 4], [1, 1]], "time": 0.2}
+            )
+            assert "move" in result
+            assert time.perf_counter() - start < 5
+        finally:
+            await service.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("line", [b"[1, 2]", b"7", b'"play"', b"{no es json"])
+def test_respond_answers_lines_that_are_not_objects(line):
+    service = EngineService(workers=1)
+    written = []
+    asyncio.run(service.respond(line, written.append))
+    response = json.loads(written[0])
+    assert "error" in response and response["id"] is None
+    assert service.games == {} and service.load == [0]
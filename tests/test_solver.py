@@ -0,0 +1,58 @@
+from functools import lru_cache
+from numpy import random
+from board import HexBoard
+from mcts import MCTS
+from solver import ProofNumberSolver, WIN, LOSS
+
+
+def brute_force(size: int):
+    """Ganador exacto de (casillas, jugador por mover) llenando el tablero"""
+
+    @lru_cache(maxsize=None)
+    def winner(cells: bytes, to_move: int) -> int:
+        empty = [index for index, value in enumerate(cells) if not value]
+        if not empty:
+            return MCTS.winner(cells, size)
+        for index in empty:
+            child = cells[:index] + bytes((to_move,)) + cells[index + 1:]
+            if winner(child, 3 - to_move) == to_move:
+                return to_move
+        return 3 - to_move
+
+    return winner
+
+
+def positions(size: int, max_empty: int, count: int, seed: int):
+    rng = random.default_rng(seed)
+    found = 0
+    while found < count:
+        board = HexBoard(size)
+        player_id = 1
+        while board.empty_count() > max_empty:
+            board.push(board.random_move(rng.integers), player_id)
+            player_id = 3 - player_id
+        if not (board.check_connection(1) or board.check_connection(2)):
+            found += 1
+            yield board, player_id
+
+
+def test_solver_matches_brute_force():
+    for size, max_empty in ((3, 9), (4, 11), (5, 10)):
+        winner = brute_force(size)
+        for board, player_id in positions(size, max_empty, 40, seed=size):
+            cells = bytes(value for row in board.board for value in row)
+            result, move = ProofNumberSolver(1).solve(board, player_id)
+            expected = winner(cells, player_id)
+            assert result == (WIN if expected == player_id else LOSS)
+            if result == WIN:
+                # La jugada devuelta también gana
+                node = move[0] * size + move[1]
+                assert not cells[node]
+                child = cells[:node] + bytes((player_id,)) + cells[node + 1:]
+                assert winner(child, 3 - player_id) == player_id
+
+
+def test_solver_on_small_empty_boards():
+    # En Hex el primer jugador gana en cualquier tamaño
+    for size in (2, 3, 4):
+        assert ProofNumberSolver(1).solve(HexBoard(size), 1)[0] == WIN
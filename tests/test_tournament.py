@@ -0,0 +1,50 @@
+import pytest
+import tournament
+
+
+def results(first: str, second: str, winners: list[int]) -> list[dict]:
+    return [{"first": first, "second": second, "winner": winner} for winner in winners]
+
+
+def test_elo_without_results_is_zero():
+    elo = tournament.elo_ratings([], ["a", "b", "c"])
+    assert all(value == pytest.approx(0, abs=1e-9) for value in elo.values())
+
+
+def test_symmetric_results_give_equal_ratings():
+    balanced = results("a", "b", [1] * 3 + [2] * 2) + results("b", "a", [1] * 3 + [2] * 2)
+    elo = tournament.elo_ratings(balanced, ["a", "b"])
+    assert elo["a"] == pytest.approx(0, abs=1e-9) and elo["b"] == pytest.approx(0, abs=1e-9)
+    # Un ciclo a > b > c > a con el mismo marcador deja a los tres iguales
+    cycle = results("a", "b", [1] * 3 + [2]) + results("b", "c", [1] * 3 + [2]) + results("c", "a", [1] * 3 + [2])
+    elo = tournament.elo_ratings(cycle, ["a", "b", "c"])
+    assert all(value == pytest.approx(0, abs=1e-6) for value in elo.values())
+
+
+def test_elo_orders_by_results():
+    elo = tournament.elo_ratings(results("a", "b", [1] * 8 + [2] * 2), ["a", "b"])
+    assert elo["a"] > 0 > elo["b"] and elo["a"] == pytest.approx(-elo["b"])
+
+
+class FixedPlayer(tournament.AI_Player):
+    """Juega siempre en `MOVE`, aunque esté ocupada o fuera del tablero"""
+
+    MOVE = (0, 0)
+
+    def play(self, board):
+        return self.MOVE
+
+
+@pytest.mark.parametrize("move, moves", [((0, 0), [0]), ((3, 0), [])])
+def test_illegal_move_forfeits_the_game(monkeypatch, move, moves):
+    monkeypatch.setattr(tournament, "AI_Player", FixedPlayer)
+    monkeypatch.setattr(FixedPlayer, "MOVE", move)
+    result = tournament.play_game(3, {}, {})
+    # Ocupada: pierde el jugador 2; fuera del tablero: el jugador 1
+    assert result["forfeit"] and result["winner"] == (1 if moves else 2)
+    assert result["moves"] == moves and len(result["times"]) == len(moves)
+    summary = tournament.summarize(
+        [{**result, "first": "a", "second": "b", "opening": ()}], ["a", "b"]
+    )
+    loser = "b" if moves else "a"
+    assert summary["engines"][loser]["forfeits"] == 1
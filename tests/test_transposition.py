@@ -0,0 +1,82 @@
+import random
+import pytest
+from board import HexBoard
+from player import AI_Player
+from transposition import TranspositionTable, EXACT, LOWER_BOUND
+
+
+def plain_minimax(player: AI_Player, board: HexBoard, depth: int, maximizing: bool) -> float:
+    """Minimax sin poda ni tabla, con las mismas hojas y jugadas que `AI_Player.minimax`"""
+
+    me = player.player_id
+    if board.check_connection(3 - me):
+        return -1000
+    if board.check_connection(me):
+        return 1000
+    if not depth:
+        return player.heuristic(board)
+    winner = player.virtual_winner(board)
+    if winner:
+        return 1000 if winner == me else -1000
+
+    mover = me if maximizing else 3 - me
+    values = []
+    for move in player.candidate_moves(board, mover):
+        board.push(move, mover)
+        values.append(plain_minimax(player, board, depth - 1, not maximizing))
+        board.pop()
+    return max(values) if maximizing else min(values)
+
+
+def positions(count: int, seed: int) -> list[HexBoard]:
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        size = rng.choice((4, 5))
+        board = HexBoard(size)
+        for turn in range(rng.randrange(2, size * size // 2)):
+            board.push(board.random_move(rng.randrange), 1 + turn % 2)
+        if not (board.check_connection(1) or board.check_connection(2)):
+            boards.append(board)
+    return boards
+
+
+@pytest.mark.parametrize("replacement", ("depth", "always"))
+@pytest.mark.parametrize("megabytes", (16, 0.001))
+def test_root_values_match_plain_minimax(replacement, megabytes):
+    # Con 0.001 MB la tabla tiene 6 casillas: casi todo guardado choca
+    for board in positions(12, seed=3):
+        player_id = 1 if board.move_count % 2 == 0 else 2
+        player = AI_Player(player_id, tt_megabytes=megabytes, tt_replacement=replacement)
+        reference = AI_Player(player_id)
+        # Profundidades crecientes sobre la misma tabla, como la profundidad iterativa
+        for depth in (1, 2, 3):
+            player.new_search()
+            move, score = player.minimax(board.clone(), depth)
+            expected = plain_minimax(reference, board, depth, True)
+            assert score == expected
+            if move:
+                board.push(move, player_id)
+                assert plain_minimax(reference, board, depth - 1, False) == expected
+                board.pop()
+
+
+def test_table_verifies_full_key():
+    table = TranspositionTable(0.001)
+    key = 12345
+    table.store(key, 3, EXACT, (1, 1), 7)
+    assert table.get(key) == (3, EXACT, (1, 1), 7)
+    assert table.get(key + table.capacity) is None
+    assert table.best_move(key + table.capacity) == ()
+
+
+def test_depth_replacement_keeps_deeper_entry_within_a_search():
+    table = TranspositionTable(0.001, "depth")
+    key = 42
+    table.store(key, 5, EXACT, (0, 0), 1)
+    table.store(key + table.capacity, 2, LOWER_BOUND, (1, 0), 2)
+    assert table.get(key) == (5, EXACT, (0, 0), 1)
+    table.new_search()
+    table.store(key + table.capacity, 2, LOWER_BOUND, (1, 0), 2)
+    assert table.get(key) is None
+    assert table.get(key + table.capacity) == (2, LOWER_BOUND, (1, 0), 2)
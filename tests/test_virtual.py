@@ -0,0 +1,75 @@
+from functools import lru_cache
+from numpy import random
+from board import HexBoard
+from mcts import MCTS
+from virtual import virtual_connection, connecting_move
+
+
+def holds(board: HexBoard, player_id: int, carrier: frozenset[int]) -> bool:
+    """
+    Fuerza bruta: con las demás casillas vacías del oponente y el oponente
+    jugando primero dentro del portador, el jugador igual gana (el tablero
+    se llena del todo; en Hex eso no cambia el ganador)
+    """
+
+    size = board.size
+    opponent = 3 - player_id
+    cells = bytearray(value or opponent for row in board.board for value in row)
+    carrier = sorted(carrier)
+    for node in carrier:
+        cells[node] = 0
+
+    @lru_cache(maxsize=None)
+    def wins(state: tuple[int, ...], to_move: int) -> bool:
+        empty = [index for index, value in enumerate(state) if not value]
+        if not empty:
+            for node, value in zip(carrier, state):
+                cells[node] = value
+            return MCTS.winner(cells, size) == player_id
+        outcomes = (
+            wins(state[:index] + (to_move,) + state[index + 1:], 3 - to_move)
+            for index in empty
+        )
+        return any(outcomes) if to_move == player_id else all(outcomes)
+
+    return wins((0,) * len(carrier), opponent)
+
+
+def random_positions(count: int, seed: int):
+    rng = random.default_rng(seed)
+    for _ in range(count):
+        size = int(rng.integers(3, 7))
+        board = HexBoard(size)
+        player_id = 1
+        for _ in range(int(rng.integers(1, size * size // 2))):
+            board.push(board.random_move(rng.integers), player_id)
+            player_id = 3 - player_id
+        yield board
+
+
+def test_virtual_connections_cannot_be_cut():
+    checked = 0
+    for board in random_positions(1000, seed=0):
+        for player_id in (1, 2):
+            carrier = virtual_connection(board, player_id)
+            if carrier is None or len(carrier) > 12:
+                continue
+            assert all(not board.board[node // board.size][node % board.size] for node in carrier)
+            assert holds(board, player_id, carrier)
+            checked += 1
+    assert checked >= 100
+
+
+def test_connecting_move_leaves_a_virtual_connection():
+    for board in random_positions(100, seed=1):
+        player_id = 1 if board.move_count % 2 == 0 else 2
+        if board.check_connection(3 - player_id):
+            continue
+        move = connecting_move(board, player_id)
+        if move is None:
+            continue
+        board.push(move, player_id)
+        carrier = virtual_connection(board, player_id)
+        assert carrier is not None
+        if len(carrier) <= 12:
+            assert holds(board, player_id, carrier)
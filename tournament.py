@@ -0,0 +1,245 @@
+"""
+Torneos de IA contra IA sin interfaz: juega partidas entre configuraciones
+de `AI_Player` en un grupo de procesos y guarda, por partida, las jugadas,
+el ganador y el tiempo de cada jugada, junto con un resumen (Elo estimado
+y proporción de victorias por color).
+
+Ejemplo:
+    python tournament.py --sizes 7 9 --games 200 --opening-moves 2 \
+        --engine base:time_limit=0.2 --engine td:time_limit=0.2,evaluator=two_distance
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random as py_random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from numpy import random
+from board import HexBoard
+from player import AI_Player
+from benchmark import parse_engine
+from records import GameWriter
+
+
+def play_game(
+    size: int, first: dict, second: dict, opening: list[tuple[int, int]] = (),
+    seed: int = 0
+    ) -> dict:
+    """
+    Juega una partida entre dos configuraciones de `AI_Player` (`first` es el
+    jugador 1) empezando por las jugadas de `opening`. Devuelve el ganador,
+    las jugadas como índices planos y el tiempo de cada jugada de la IA. Una
+    jugada ilegal (fuera del tablero u ocupada) pierde la partida y no se
+    agrega a las jugadas (`forfeit`)
+    """
+
+    random.seed(seed)
+    players = {1: AI_Player(1, **first), 2: AI_Player(2, **second)}
+    board = HexBoard(size)
+    moves, times = [], []
+    current = 1
+    for move in opening:
+        board.push(move, current)
+        moves.append(move[0] * size + move[1])
+        times.append(0.0)
+        current = 3 - current
+
+    winner = next((pid for pid in (1, 2) if board.check_connection(pid)), None)
+    forfeit = False
+    try:
+        while winner is None:
+            start = time.perf_counter()
+            row, col = players[current].play(board)
+            elapsed = time.perf_counter() - start
+            if not (0 <= row < size and 0 <= col < size and board.push((row, col), current)):
+                winner, forfeit = 3 - current, True
+                break
+            times.append(elapsed)
+            moves.append(row * size + col)
+            if board.check_connection(current):
+                winner = current
+            current = 3 - current
+    finally:
+        for player in players.values():
+            player.close()
+    return {"size": size, "winner": winner, "moves": moves, "times": times, "forfeit": forfeit}
+
+
+def random_opening(size: int, moves: int, rng: py_random.Random) -> list[tuple[int, int]]:
+    """Apertura de `moves` jugadas al azar (sin ganador posible)"""
+
+    return [divmod(node, size) for node in rng.sample(range(size * size), moves)]
+
+
+def schedule(
+    engines: list[str], sizes: list[int], games: int, opening_moves: int, seed: int
+    ) -> list[dict]:
+    """
+    Partidas del torneo: para cada tamaño y par de configuraciones se juegan
+    `games` partidas; cada apertura se juega dos veces cambiando los colores
+    """
+
+    rng = py_random.Random(seed)
+    tasks = []
+    for size in sizes:
+        for a, b in itertools.combinations(engines, 2):
+            for game in range(games):
+                if game % 2 == 0:
+                    opening = random_opening(size, opening_moves, rng)
+                first, second = (a, b) if game % 2 == 0 else (b, a)
+                tasks.append({
+                    "size": size, "first": first, "second": second,
+                    "opening": opening, "seed": rng.randrange(2 ** 31)
+                })
+    return tasks
+
+
+def elo_ratings(results: list[dict], engines: list[str], iterations: int = 200) -> dict[str, float]:
+    """
+    Estima el Elo de cada configuración (modelo de Bradley-Terry ajustado por
+    iteraciones MM), centrado en 0. Se suma contra cada rival una partida
+    ficticia con media victoria para cada uno, para que no diverja con
+    resultados perfectos
+    """
+
+    wins = {name: 0.0 for name in engines}
+    games = {pair: 1.0 for pair in itertools.permutations(engines, 2)}
+    for pair in itertools.permutations(engines, 2):
+        wins[pair[0]] += 0.5
+    for result in results:
+        winner = result["first"] if result["winner"] == 1 else result["second"]
+        wins[winner] += 1
+        games[(result["first"], result["second"])] += 1
+        games[(result["second"], result["first"])] += 1
+
+    strength = {name: 1.0 for name in engines}
+    for _ in range(iterations):
+        for name in engines:
+            total = sum(
+                games[(name, other)] / (strength[name] + strength[other])
+                for other in engines if other != name
+            )
+            if total:
+                strength[name] = wins[name] / total
+        mean = math.exp(sum(math.log(value) for value in strength.values()) / len(engines))
+        strength = {name: value / mean for name, value in strength.items()}
+    return {name: 400 * math.log10(value) for name, value in strength.items()}
+
+
+def summarize(results: list[dict], engines: list[str]) -> dict:
+    """Elo, victorias por color y tiempos por jugada de cada configuración"""
+
+    summary = {"games": len(results), "elo": elo_ratings(results, engines), "engines": {}}
+    for name in engines:
+        stats = {
+            "games": 0, "wins": 0, "wins_as_1": 0, "games_as_1": 0, "wins_as_2": 0, "games_as_2": 0,
+            "forfeits": 0  # Partidas perdidas por jugada ilegal
+        }
+        times = []
+        for result in results:
+            for player_id, key in ((1, "first"), (2, "second")):
+                if result[key] != name:
+                    continue
+                stats["games"] += 1
+                stats[f"games_as_{player_id}"] += 1
+                if result["winner"] == player_id:
+                    stats["wins"] += 1
+                    stats[f"wins_as_{player_id}"] += 1
+                elif result.get("forfeit"):
+                    stats["forfeits"] += 1
+                times.extend(
+                    value for index, value in enumerate(result["times"])
+                    if index >= len(result["opening"]) and index % 2 == player_id - 1
+                )
+        times.sort()
+        for player_id in (1, 2):
+            games = stats[f"games_as_{player_id}"]
+            stats[f"win_rate_as_{player_id}"] = stats[f"wins_as_{player_id}"] / games if games else None
+        stats["win_rate"] = stats["wins"] / stats["games"] if stats["games"] else None
+        if times:
+            stats["move_time_mean_s"] = sum(times) / len(times)
+            stats["move_time_p90_s"] = times[int(0.9 * (len(times) - 1))]
+            stats["move_time_max_s"] = times[-1]
+        summary["engines"][name] = stats
+    return summary
+
+
+def _run_task(task: dict, configs: dict[str, dict]) -> dict:
+    result = play_game(
+        task["size"], configs[task["first"]], configs[task["second"]],
+        task["opening"], task["seed"]
+    )
+    return {**task, **result}
+
+
+def run(args: argparse.Namespace) -> dict:
+    configs = dict(parse_engine(spec) for spec in args.engine)
+    engines = list(configs)
+    tasks = schedule(engines, args.sizes, args.games, args.opening_moves, args.seed)
+
+    results = []
+    writer = GameWriter(args.record) if args.record else None
+    with open(args.output, "w") as file, ProcessPoolExecutor(args.workers) as executor:
+        futures = [executor.submit(_run_task, task, configs) for task in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            if writer is not None:
+                writer.write(result["size"], result["moves"], result["winner"], result["times"])
+            result["times"] = [round(value, 4) for value in result["times"]]
+            results.append(result)
+            # Una línea JSON por partida, sin espacios, con las jugadas como índices planos
+            file.write(json.dumps({
+                "size": result["size"], "first": result["first"], "second": result["second"],
+                "opening": len(result["opening"]), "winner": result["winner"],
+                "moves": result["moves"], "times": result["times"], "forfeit": result["forfeit"]
+            }, separators=(",", ":")) + "\n")
+            if done % max(1, len(tasks) // 20) == 0 or done == len(tasks):
+                print(f"{done}/{len(tasks)} partidas")
+
+        summary = summarize(results, engines)
+        file.write(json.dumps({"summary": summary}, separators=(",", ":")) + "\n")
+    if writer is not None:
+        writer.close()
+    return summary
+
+
+def report(summary: dict):
+    print(f"\n{summary['games']} partidas")
+    for name, stats in sorted(summary["engines"].items(), key=lambda item: -summary["elo"][item[0]]):
+        line = (
+            f"{name:>12}: Elo {summary['elo'][name]:+.0f}, "
+            f"{stats['wins']}/{stats['games']} victorias "
+            f"(como 1: {stats['wins_as_1']}/{stats['games_as_1']}, "
+            f"como 2: {stats['wins_as_2']}/{stats['games_as_2']})"
+        )
+        if stats["forfeits"]:
+            line += f", {stats['forfeits']} por jugada ilegal"
+        if "move_time_mean_s" in stats:
+            line += f", {stats['move_time_mean_s']:.3f}s por jugada (máx {stats['move_time_max_s']:.3f}s)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneo de IA contra IA de Hex")
+    parser.add_argument(
+        "--engine", action="append", required=True,
+        help="Configuración 'nombre:clave=valor,...' de AI_Player (al menos dos)"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7])
+    parser.add_argument("--games", type=int, default=20, help="Partidas por tamaño y par de configuraciones")
+    parser.add_argument("--opening-moves", type=int, default=0, help="Jugadas al azar de cada apertura")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="tournament.jsonl", help="Archivo de resultados")
+    parser.add_argument("--record", help="Archivo binario (records.py) donde agregar las partidas")
+    args = parser.parse_args()
+    if len(args.engine) < 2:
+        parser.error("se necesitan al menos dos configuraciones --engine")
+
+    report(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Tipos de cota guardados en la tabla
+EXACT = 0
+LOWER_BOUND = 1  # El valor real es mayor o igual que el guardado (corte en nodo max)
+UPPER_BOUND = 2  # El valor real es menor o igual que el guardado (corte en nodo min)
+
+# Se combina con el hash del tablero en los nodos donde juega el oponente
+SIDE_TO_MOVE_KEY = 0x9E3779B97F4A7C15
+
+# Tamaño aproximado en bytes de una entrada (tupla de 6 campos más sus enteros)
+ENTRY_BYTES = 160
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo indexada por hash de Zobrist. 
+    Cada casilla de la tabla guarda una entrada 
+    (hash, profundidad, tipo de cota, mejor jugada, valor, generación)
+    """
+    
+    def __init__(self, max_megabytes: float = 16, replacement: str = "depth"):
+        if replacement not in ("depth", "always"):
+            raise ValueError(f"Política de reemplazo desconocida: {replacement}")
+        
+        self.capacity = max(1, int(max_megabytes * 2 ** 20) // ENTRY_BYTES)
+        self.replacement = replacement  # "depth": preferir mayor profundidad, "always": siempre reemplazar
+        self.slots = [None] * self.capacity
+        self.generation = 0
+        self.hits = 0
+        self.stores = 0
+    
+    def new_search(self):
+        """Marca el inicio de una búsqueda para que las entradas viejas sean reemplazables"""
+        
+        self.generation += 1
+    
+    def clear(self):
+        """Vacía la tabla"""
+        
+        self.slots = [None] * self.capacity
+        self.generation = 0
+    
+    def get(self, key: int) -> tuple | None:
+        """Devuelve (profundidad, tipo de cota, mejor jugada, valor) si la posición está guardada"""
+        
+        entry = self.slots[key % self.capacity]
+        if entry is None or entry[0] != key:
+            return None
+        self.hits += 1
+        return entry[1:5]
+    
+    def best_move(self, key: int) -> tuple[int, int] | tuple:
+        """Devuelve la mejor jugada guardada para la posición o () si no hay"""
+        
+        entry = self.slots[key % self.capacity]
+        if entry is None or entry[0] != key:
+            return ()
+        return entry[3]
+    
+    def store(
+        self, key: int, depth: float, flag: int, 
+        move: tuple[int, int] | tuple, score: float
+        ):
+        """Guarda el resultado de una búsqueda según la política de reemplazo"""
+        
+        index = key % self.capacity
+        entry = self.slots[index]
+        if (
+            entry is not None and self.replacement == "depth"
+            and entry[5] == self.generation and entry[1] > depth
+        ):
+            return
+        if entry is not None and entry[0] == key and not move:
+            move = entry[3]
+        self.slots[index] = (key, depth, flag, move, score, self.generation)
+        self.stores += 1
+    
+    def __len__(self) -> int:
+        return sum(1 for entry in self.slots if entry is not None)
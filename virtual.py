@@ -0,0 +1,241 @@
+"""
+Conexiones virtuales: conexiones que el oponente no puede cortar aunque le
+toque jugar. Se combinan dos patrones, cada uno con su portador (las
+casillas vacías que hay que responder si el oponente juega en ellas):
+
+- Dos grupos (o un grupo y un borde) con dos casillas vacías adyacentes en
+  común; incluye el puente y la plantilla de borde de la segunda fila.
+- El zigurat: plantilla de borde de una ficha en la tercera fila.
+
+Un jugador está conectado virtualmente si hay una cadena de estas
+conexiones entre sus bordes con portadores disjuntos.
+"""
+from functools import lru_cache
+from board import HexBoard, neighbor_table
+from heuristics import edge_cells
+
+# Portadores del zigurat desde la ficha, en coordenadas (distancia al borde,
+# posición a lo largo del borde); las dos variantes son simétricas
+ZIGGURATS = (
+    ((0, 1), (-1, 0), (-1, 1), (-1, 2), (-2, 0), (-2, 1), (-2, 2), (-2, 3)),
+    ((0, -1), (-1, 1), (-1, 0), (-1, -1), (-2, 2), (-2, 1), (-2, 0), (-2, -1)),
+)
+SEARCH_LIMIT = 5000  # Máximo de conexiones a probar en la búsqueda de la cadena
+
+
+def _edge_transforms(size: int, player_id: int):
+    """
+    Funciones (fila, columna) -> (distancia, posición) y su inversa para cada
+    borde del jugador (inicio y fin), que llevan el borde a la fila 0
+    """
+
+    last = size - 1
+    if player_id == 2:
+        return (
+            (lambda r, c: (r, c), lambda d, k: (d, k)),
+            (lambda r, c: (last - r, last - c), lambda d, k: (last - d, last - k)),
+        )
+    return (
+        (lambda r, c: (c, r), lambda d, k: (k, d)),
+        (lambda r, c: (last - c, last - r), lambda d, k: (last - k, last - d)),
+    )
+
+
+@lru_cache(maxsize=None)
+def ziggurat_table(size: int, player_id: int) -> tuple[tuple[tuple[int, tuple[int, ...]], ...], ...]:
+    """
+    Para cada casilla (índice plano) los zigurats que la conectan con un
+    borde del jugador: (0 inicio / 1 fin, portador como índices planos)
+    """
+
+    table = []
+    transforms = _edge_transforms(size, player_id)
+    for row in range(size):
+        for col in range(size):
+            templates = []
+            for edge, (to_edge, from_edge) in enumerate(transforms):
+                distance, position = to_edge(row, col)
+                if distance != 2:
+                    continue
+                for offsets in ZIGGURATS:
+                    cells = [from_edge(distance + dd, position + dk) for dd, dk in offsets]
+                    if all(0 <= r < size and 0 <= c < size for r, c in cells):
+                        templates.append((edge, tuple(r * size + c for r, c in cells)))
+            table.append(tuple(templates))
+    return tuple(table)
+
+
+def _links(board: HexBoard, player_id: int):
+    """
+    Grafo de conexiones entre grupos del jugador (por raíz de los conjuntos
+    disjuntos, incluidos los bordes virtuales): raíz -> [(raíz, casillas
+    comunes, portador fijo o None)], y las casillas vacías de cada grupo
+    """
+
+    size = board.size
+    rows = board.board
+    neighbors = neighbor_table(size)
+    find = board.find
+    start = find(player_id, board.start_node)
+    end = find(player_id, board.end_node)
+
+    cell_roots = {}  # Casilla vacía -> grupos adyacentes
+    for edge_root, cells in zip((start, end), edge_cells(size, player_id)):
+        for node in cells:
+            if not rows[node // size][node % size]:
+                cell_roots.setdefault(node, set()).add(edge_root)
+
+    zigzags = ziggurat_table(size, player_id)
+    templates = []
+    for row, col in board.player_positions[player_id]:
+        node = row * size + col
+        root = find(player_id, node)
+        for neighbor in neighbors[node]:
+            if not rows[neighbor // size][neighbor % size]:
+                cell_roots.setdefault(neighbor, set()).add(root)
+        for edge, carrier in zigzags[node]:
+            if all(not rows[cell // size][cell % size] for cell in carrier):
+                templates.append((root, (start, end)[edge], carrier))
+
+    common = {}  # (raíz, raíz) -> casillas vacías comunes
+    for node, roots in cell_roots.items():
+        if len(roots) < 2:
+            continue
+        roots = sorted(roots)
+        for index, first in enumerate(roots):
+            for second in roots[index + 1:]:
+                common.setdefault((first, second), []).append(node)
+
+    graph = {}
+    for (first, second), cells in common.items():
+        graph.setdefault(first, []).append((second, cells, None))
+        graph.setdefault(second, []).append((first, cells, None))
+    for root, edge_root, carrier in templates:
+        if root != edge_root:
+            graph.setdefault(root, []).append((edge_root, None, carrier))
+            graph.setdefault(edge_root, []).append((root, None, carrier))
+    return start, end, graph, cell_roots
+
+
+def virtual_connection(board: HexBoard, player_id: int) -> frozenset[int] | None:
+    """
+    Portador (índices planos de las casillas que el oponente tendría que
+    ocupar para cortarla) de una conexión virtual entre los bordes del
+    jugador, o None si no se encuentra. Conectado de verdad: portador vacío
+    """
+
+    if board.check_connection(player_id):
+        return frozenset()
+    start, end, graph, cell_roots = _links(board, player_id)
+
+    # Búsqueda en profundidad con pila explícita: cada marco guarda el grupo,
+    # las casillas ya comprometidas y el iterador de sus enlaces pendientes
+    budget = SEARCH_LIMIT
+    visited = {start}
+    stack = [(start, frozenset(), iter(graph.get(start, ())))]
+    while stack:
+        root, used, links = stack[-1]
+        for other, cells, carrier in links:
+            if other in visited:
+                continue
+            budget -= 1
+            if budget < 0:
+                return None
+            if carrier is None:
+                free = [cell for cell in cells if cell not in used]
+                if len(free) < 2:
+                    continue
+                carrier = free[:2]
+            elif not used.isdisjoint(carrier):
+                continue
+            if other == end:
+                return used.union(carrier)
+            visited.add(other)
+            stack.append((other, used.union(carrier), iter(graph.get(other, ()))))
+            break
+        else:
+            stack.pop()
+            visited.discard(root)
+    return None
+
+
+def winning_cells(board: HexBoard, player_id: int) -> list[tuple[int, int]]:
+    """Casillas vacías que conectan de inmediato los dos bordes del jugador"""
+
+    size = board.size
+    start = board.find(player_id, board.start_node)
+    end = board.find(player_id, board.end_node)
+    if start == end:
+        return []
+    cell_roots = _links(board, player_id)[3]
+    return [
+        divmod(node, size) for node, roots in cell_roots.items()
+        if start in roots and end in roots
+    ]
+
+
+def connecting_move(board: HexBoard, player_id: int) -> tuple[int, int] | None:
+    """
+    Jugada que deja al jugador conectado virtualmente (o que gana de una vez);
+    si ya lo está, una casilla de su portador. None si no hay ninguna
+    """
+
+    cells = winning_cells(board, player_id)
+    if cells:
+        return cells[0]
+
+    # Si ya está conectado se rellena el portador sin perder la conexión
+    carrier = virtual_connection(board, player_id)
+    if carrier:
+        candidates = [divmod(node, board.size) for node in sorted(carrier)]
+    else:
+        candidates = _candidate_moves(board, player_id)
+    for move in candidates:
+        board.push(move, player_id)
+        connected = virtual_connection(board, player_id) is not None
+        board.pop()
+        if connected:
+            return move
+    return candidates[0] if carrier else None
+
+
+def _candidate_moves(board: HexBoard, player_id: int) -> list[tuple[int, int]]:
+    """
+    Casillas que podrían crear una conexión virtual. La cadena pasaría por el
+    grupo de la ficha nueva, así que esta tiene que tocar (o compartir una
+    casilla vacía con) algo alcanzable desde cada borde sin exigir portadores
+    disjuntos, o formar un zigurat con ese borde
+    """
+
+    size = board.size
+    neighbors = neighbor_table(size)
+    zigzags = ziggurat_table(size, player_id)
+    start, end, graph, cell_roots = _links(board, player_id)
+    stone_roots = {
+        row * size + col: board.find(player_id, row * size + col)
+        for row, col in board.player_positions[player_id]
+    }
+
+    near = []
+    for edge, root in enumerate((start, end)):
+        reached, stack = {root}, [root]
+        while stack:
+            for other, _, _ in graph.get(stack.pop(), ()):
+                if other not in reached:
+                    reached.add(other)
+                    stack.append(other)
+        touched = {node for node, roots in cell_roots.items() if not roots.isdisjoint(reached)}
+        touched.update(node for node, root in stone_roots.items() if root in reached)
+        near.append((edge, touched))
+
+    candidates = []
+    for move in board.get_possible_moves():
+        node = move[0] * size + move[1]
+        if all(
+            node in touched
+            or any(neighbor in touched for neighbor in neighbors[node])
+            or any(template_edge == edge for template_edge, _ in zigzags[node])
+            for edge, touched in near
+        ):
+            candidates.append(move)
+    return candidates